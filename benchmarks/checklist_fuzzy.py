@@ -0,0 +1,73 @@
+"""
+Benchmark of fuzzy checklist lookups.
+
+Builds a synthetic checklist of species names and looks up an increasing
+number of unique names, half of them with a one-letter typo, measuring
+the time it takes and how many typos are matched to the right name.
+Usage:
+
+    python benchmarks/checklist_fuzzy.py --checklist-size 60000 --sizes 10000 100000
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from regi0.taxonomic.local import Checklist
+
+SYLLABLES = [
+    f"{consonant}{vowel}{coda}"
+    for consonant in ["b", "c", "d", "g", "l", "m", "n", "p", "r", "s", "t", "ch", "ph"]
+    for vowel in ["a", "e", "i", "o", "u", "ae"]
+    for coda in ["", "n", "r", "s"]
+]
+GENUS_ENDINGS = ["us", "a", "ia", "ops", "ella", "ium", "odon", "ornis"]
+EPITHET_ENDINGS = ["us", "a", "um", "ensis", "ii", "atus", "oides", "icola"]
+
+
+def get_word(rng, endings):
+    return "".join(rng.choice(SYLLABLES, rng.integers(1, 4))) + rng.choice(endings)
+
+
+def add_typo(rng, name):
+    i = rng.integers(1, len(name))
+    return f"{name[:i]}{chr(rng.integers(97, 123))}{name[i + 1:]}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--checklist-size", type=int, default=60000)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000])
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    genera = [get_word(rng, GENUS_ENDINGS).capitalize() for _ in range(10000)]
+    names = set()
+    while len(names) < args.checklist_size:
+        names.add(f"{rng.choice(genera)} {get_word(rng, EPITHET_ENDINGS)}")
+    names = np.array(sorted(names))
+    checklist = pd.DataFrame(
+        {"species": names, "cites": rng.choice(["I", "II", "III"], len(names))}
+    )
+
+    start = time.perf_counter()
+    indexed = Checklist(checklist, "species")
+    indexed.get_fields(["Foo bar"], "cites", fuzzy=True)
+    print(f"index built in {time.perf_counter() - start:.2f} seconds")
+
+    print(f"{'names':>8}{'seconds':>10}{'us/name':>10}{'recall':>10}")
+    for size in args.sizes:
+        targets = rng.choice(names, size)
+        values = pd.Series(
+            [add_typo(rng, name) if i % 2 else name for i, name in enumerate(targets)]
+        )
+        start = time.perf_counter()
+        result = indexed.get_fields(values, "cites", fuzzy=True)
+        elapsed = time.perf_counter() - start
+        recall = (result["matched_name"] == targets)[1::2].mean()
+        print(f"{size:>8}{elapsed:>10.2f}{elapsed / size * 1e6:>10.0f}{recall:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Benchmark of the scientific name parsers.
+
+Compares get_canonical_name and parse_names on an increasing number of
+names sampled from a pool of distinct names, which mimics occurrence
+tables where the same names are repeated many times. Usage:
+
+    python benchmarks/parse_names.py --sizes 10000 100000 1000000
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from regi0.taxonomic import parsing
+
+NAMES = [
+    "Caluromys lanatus (Olfers, 1818)",
+    "Didelphis marsupialis Linnaeus, 1758",
+    "Estola vulgaris Galileo & Martins, 1999",
+    "Caenolestes aff. convelatus Anthony, 1924",
+    "Lonchurus cf. lanceolatus (Bloch 1788)",
+    "Petrolisthes sp. nov. aff. rufescens",
+    "Quercus robur subsp. pedunculiflora (K.Koch) Menitsky",
+    "Poa annua var. reptans Hausskn.",
+    "Panthera leo persica (Meyer, 1826)",
+    "Unio spp.",
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[10000, 100000, 1000000]
+    )
+    parser.add_argument("--unique", type=int, default=20000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    pool = [
+        f"{name.split(' ', 1)[0]}{i} {name.split(' ', 1)[1]}"
+        for i in range(args.unique // len(NAMES))
+        for name in NAMES
+    ]
+
+    print(f"{'function':<24}{'names':>10}{'seconds':>10}{'us/name':>10}")
+    for size in args.sizes:
+        names = pd.Series(rng.choice(pool, size))
+        for func in (parsing.get_canonical_name, parsing.parse_names):
+            parsing._parse_name.cache_clear()
+            start = time.perf_counter()
+            func(names)
+            elapsed = time.perf_counter() - start
+            print(
+                f"{func.__name__:<24}{size:>10}{elapsed:>10.2f}"
+                f"{elapsed / size * 1e6:>10.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Benchmark of the IUCN and Species+ wrappers against a local stub server.
+
+Measures the time it takes to get results for an increasing number of
+names, showing that the time per name stays roughly constant. Usage:
+
+    python benchmarks/web_wrappers.py --sizes 1000 5000 10000 50000
+"""
+import argparse
+import http.server
+import json
+import threading
+import time
+from urllib.parse import parse_qs, unquote, urlparse
+
+from regi0.taxonomic.web import iucn, speciesplus
+
+
+class StubHandler(http.server.BaseHTTPRequestHandler):
+    """
+    Answers IUCN species and Species+ taxon concepts requests with a
+    fixed result for the requested name.
+    """
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path.startswith("/iucn/species/"):
+            name = unquote(url.path.rsplit("/", 1)[-1])
+            content = {
+                "name": name,
+                "result": [
+                    {
+                        "taxonid": hash(name) % 10 ** 8,
+                        "scientific_name": name,
+                        "category": "LC",
+                        "population_trend": "Stable",
+                    }
+                ],
+            }
+        else:
+            name = parse_qs(url.query).get("name", [""])[0]
+            content = {
+                "taxon_concepts": [
+                    {
+                        "id": hash(name) % 10 ** 8,
+                        "full_name": name,
+                        "author_year": "(Linnaeus, 1758)",
+                        "updated_at": "2021-01-01T00:00:00.000Z",
+                        "cites_listing": "I",
+                        "common_names": [{"name": "Jaguar", "language": "EN"}],
+                        "synonyms": [],
+                        "higher_taxa": {"kingdom": "Animalia", "family": "Felidae"},
+                    }
+                ]
+            }
+
+        body = json.dumps(content).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[1000, 5000, 10000, 50000]
+    )
+    parser.add_argument("--max-workers", type=int, default=8)
+    args = parser.parse_args()
+
+    http.server.ThreadingHTTPServer.protocol_version = "HTTP/1.1"
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_port}"
+    iucn.API_URL = f"{base_url}/iucn/"
+    speciesplus.API_URL = f"{base_url}/speciesplus/"
+
+    print(f"{'function':<32}{'names':>8}{'seconds':>10}{'us/name':>10}")
+    for size in args.sizes:
+        names = [f"Species name{i}" for i in range(size)]
+
+        start = time.perf_counter()
+        iucn.get_species_info(
+            names, "token", max_workers=args.max_workers, rate_limit=None
+        )
+        elapsed = time.perf_counter() - start
+        print(
+            f"{'iucn.get_species_info':<32}{size:>8}{elapsed:>10.2f}"
+            f"{elapsed / size * 1e6:>10.0f}"
+        )
+
+        start = time.perf_counter()
+        speciesplus.get_taxon_concept(names, "token")
+        elapsed = time.perf_counter() - start
+        print(
+            f"{'speciesplus.get_taxon_concept':<32}{size:>8}{elapsed:>10.2f}"
+            f"{elapsed / size * 1e6:>10.0f}"
+        )
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
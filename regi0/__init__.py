@@ -1,4 +1,6 @@
 import regi0.geographic
+import regi0.http
+import regi0.matching
 import regi0.taxonomic
 from regi0.readers import read_geographic_table, read_table
 from regi0.verification import match, verify
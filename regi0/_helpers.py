@@ -1,8 +1,18 @@
 """
 General helper functions.
 """
+import collections
+import threading
+
+import numpy as np
 import pandas as pd
 
+# Maximum number of standardized values to keep in memory.
+STANDARDIZE_MEMO_SIZE = 100_000
+
+_standardize_memo = collections.OrderedDict()
+_standardize_memo_lock = threading.Lock()
+
 
 def clean_text(s: pd.Series) -> pd.Series:
     """
@@ -27,10 +37,10 @@ def clean_text(s: pd.Series) -> pd.Series:
     return s
 
 
-def standardize_text(s: pd.Series) -> pd.Series:
+def _standardize_text(s: pd.Series) -> pd.Series:
     """
     Standardizes text values by cleaning, converting to lowercase and
-    removing accents.
+    removing accents, without memoization.
 
     Parameters
     ----------
@@ -48,3 +58,46 @@ def standardize_text(s: pd.Series) -> pd.Series:
     s = s.str.normalize("NFKD").str.encode("ascii", errors="ignore").str.decode("utf-8")
 
     return s
+
+
+def standardize_text(s: pd.Series) -> pd.Series:
+    """
+    Standardizes text values by cleaning, converting to lowercase and
+    removing accents. Only unique values are standardized, and the most
+    recently standardized values are memoized across calls (up to
+    STANDARDIZE_MEMO_SIZE values) so that they are not standardized
+    again.
+
+    Parameters
+    ----------
+    s : pd.Series
+        Series to standardize.
+
+    Returns
+    -------
+    pd.Series
+        Standardized Series.
+
+    """
+    codes, uniques = pd.factorize(s)
+    uniques = pd.Series(uniques, dtype=object)
+    is_str = uniques.map(type).eq(str)
+
+    with _standardize_memo_lock:
+        result = uniques.map(lambda value: _standardize_memo.get(value, np.nan))
+        for value in uniques[is_str & result.notna()]:
+            _standardize_memo.move_to_end(value)
+    missing = ~is_str | result.isna()
+    if missing.any():
+        result[missing] = _standardize_text(uniques[missing])
+
+    new = uniques[is_str & missing]
+    with _standardize_memo_lock:
+        _standardize_memo.update(zip(new, result[new.index]))
+        while len(_standardize_memo) > STANDARDIZE_MEMO_SIZE:
+            _standardize_memo.popitem(last=False)
+
+    # Missing values have code -1, which takes the NaN appended at the end.
+    values = np.append(result.to_numpy(dtype=object), np.nan).take(codes)
+
+    return pd.Series(values, index=s.index, name=s.name, dtype=object)
@@ -5,6 +5,7 @@ import warnings
 
 import click
 
+from .commands.compile import compile_layers
 from .commands.geographic import geo
 from .commands.setup import setup
 from .commands.taxonomic import tax
@@ -17,6 +18,7 @@ def main():
     pass
 
 
+main.add_command(compile_layers)
 main.add_command(geo)
 main.add_command(setup)
 main.add_command(tax)
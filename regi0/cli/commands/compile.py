@@ -0,0 +1,45 @@
+"""
+$ regi0 compile-layers
+"""
+import pathlib
+
+import click
+import regi0
+
+from ..utils.config import config
+from ..utils.logger import logger
+
+
+@click.command(name="compile-layers")
+@click.argument("paths", nargs=-1, type=click.Path(exists=True))
+@click.option(
+    "-q",
+    "--quiet",
+    default=False,
+    is_flag=True,
+    help="Silence information logging.",
+    show_default=True,
+)
+def compile_layers(paths, quiet):
+    """
+    Compiles reference layers into a columnar format that is faster to
+    read. If no PATHS are passed, the layers from the configuration file
+    are compiled.
+    """
+    if not paths:
+        if not config.sections():
+            logger.error("No configuration file found. Please run regi0 setup first.")
+            return
+        paths = [
+            config.get("paths", level)
+            for level in ("admin0", "admin1", "admin2", "urban")
+            if config.get("paths", level, fallback=None)
+        ]
+
+    for path in paths:
+        if not quiet:
+            logger.info(f"Compiling layers from {pathlib.Path(path).resolve()}.")
+        regi0.geographic.compiled.compile_layers(path)
+
+    if not quiet:
+        logger.info(f"Compiled layers saved to {regi0.geographic.compiled.CACHE_DIR}.")
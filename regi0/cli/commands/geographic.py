@@ -1,13 +1,18 @@
 """
 $ regi0 geo
 """
+import concurrent.futures
+import contextlib
+import os
 import pathlib
+import tempfile
 
 import click
 import regi0
 
 from ..utils.config import config
 from ..utils.logger import logger
+from ..utils.streaming import DuplicateTracker, get_grid_ids, get_keys, update_bounds
 
 
 @click.command()
@@ -33,6 +38,21 @@ from ..utils.logger import logger
     help="Skip the identification of duplicate records.",
     show_default=True,
 )
+@click.option(
+    "-j",
+    "--jobs",
+    default=1,
+    type=int,
+    help="Number of processes to verify historical layers with. Use -1 for all CPUs.",
+    show_default=True,
+)
+@click.option(
+    "--chunksize",
+    type=int,
+    default=None,
+    help="Number of records to read, verify and write at a time. Only supported "
+    "for csv files.",
+)
 @click.option(
     "-r",
     "--remove",
@@ -49,7 +69,17 @@ from ..utils.logger import logger
     help="Silence information logging.",
     show_default=True,
 )
-def geo(input, output, skip_admin, skip_urban, skip_duplicates, remove, quiet):
+def geo(
+    input,
+    output,
+    skip_admin,
+    skip_urban,
+    skip_duplicates,
+    jobs,
+    chunksize,
+    remove,
+    quiet,
+):
     """
     Executes a flexible geographic verification workflow on a set of
     biological records.
@@ -58,6 +88,20 @@ def geo(input, output, skip_admin, skip_urban, skip_duplicates, remove, quiet):
         logger.error("No configuration file found. Please run regi0 setup first.")
         return
 
+    if chunksize:
+        _geo_chunked(
+            input,
+            output,
+            skip_admin,
+            skip_urban,
+            skip_duplicates,
+            jobs,
+            chunksize,
+            remove,
+            quiet,
+        )
+        return
+
     if not quiet:
         logger.info(f"Reading records from {pathlib.Path(input).resolve()}.")
     records = regi0.read_geographic_table(
@@ -69,6 +113,38 @@ def geo(input, output, skip_admin, skip_urban, skip_duplicates, remove, quiet):
         reset_index=True,
     )
 
+    records = _verify_records(records, skip_admin, skip_urban, jobs, remove, quiet)
+
+    if not skip_duplicates:
+        if not quiet:
+            logger.info("Identifying duplicate records.")
+
+        bounds, keep = _get_duplicates_params()
+        flagname = config.get("flagnames", "spatialduplicate")
+        records[flagname] = regi0.geographic.find_grid_duplicates(
+            records,
+            config.get("colnames", "species"),
+            config.getfloat("duplicates", "pixelsize"),
+            bounds,
+            keep,
+        )
+        if remove:
+            records = records[~records[flagname].fillna(False).astype(bool)]
+
+    if not quiet:
+        logger.info(f"Saving results to {pathlib.Path(output).resolve()}.")
+    records = records.drop(columns="geometry")
+    regi0.write_table(records, output, index=False)
+
+
+def _verify_records(
+    records, skip_admin, skip_urban, jobs, remove, quiet, lazy=True, executor=None
+):
+    """
+    Verifies administrative divisions and urban limits of a set of
+    records. Historical layers are verified using `executor` if it is
+    passed, or a new pool of `jobs` processes otherwise.
+    """
     admin_map = {"country": "admin0", "stateProvince": "admin1", "county": "admin2"}
     for name, level in admin_map.items():
         if name not in skip_admin:
@@ -82,6 +158,9 @@ def geo(input, output, skip_admin, skip_urban, skip_duplicates, remove, quiet):
                 direction=config.get("misc", "direction"),
                 default_year=config.get("misc", "defaultyear"),
                 return_source=True,
+                lazy=lazy,
+                n_jobs=jobs,
+                executor=executor,
             )
             records = regi0.verify(
                 records,
@@ -97,6 +176,7 @@ def geo(input, output, skip_admin, skip_urban, skip_duplicates, remove, quiet):
                 preprocess=config.get("verification", "preprocess"),
                 fuzzy=config.get("verification", "fuzzy"),
                 threshold=config.getfloat("verification", "threshold"),
+                scorer=config.get("verification", "scorer", fallback="ratio"),
             )
 
     if not skip_urban:
@@ -107,35 +187,153 @@ def geo(input, output, skip_admin, skip_urban, skip_duplicates, remove, quiet):
             records, config.get("paths", "urban")
         )
         if remove:
-            records = records[~records[flagname]]
+            records = records[~records[flagname].fillna(False).astype(bool)]
+
+    return records
+
+
+def _get_duplicates_params():
+    """
+    Gets the grid bounds and the keep parameter to identify duplicates
+    from the configuration file.
+    """
+    bounds = config.get("duplicates", "bounds")
+    if bounds:
+        bounds = list(map(lambda x: float(x), bounds.split(",")))
+    else:
+        bounds = None
+
+    try:
+        keep = config.getboolean("duplicates", "keep")
+    except ValueError:
+        keep = config.get("duplicates", "keep")
+
+    return bounds, keep
+
+
+def _geo_chunked(
+    input,
+    output,
+    skip_admin,
+    skip_urban,
+    skip_duplicates,
+    jobs,
+    chunksize,
+    remove,
+    quiet,
+):
+    """
+    Executes the geographic verification workflow reading, verifying and
+    writing records in chunks. Identifying duplicates requires the whole
+    set of records, so verified chunks are written to a temporary file
+    that is then read again in chunks to identify duplicates.
+    """
+    output = pathlib.Path(output)
+    if pathlib.Path(input).suffix != ".csv" or output.suffix != ".csv":
+        logger.error("Processing records in chunks is only supported for csv files.")
+        return
+
+    lon_col = config.get("colnames", "longitude")
+    lat_col = config.get("colnames", "latitude")
+
+    if not quiet:
+        logger.info(f"Reading records from {pathlib.Path(input).resolve()}.")
+    chunks = regi0.read_geographic_table(
+        input,
+        lon_col,
+        lat_col,
+        crs=config.get("misc", "crs"),
+        drop_empty_coords=True,
+        reset_index=True,
+        chunksize=chunksize,
+    )
+
+    with contextlib.ExitStack() as stack:
+        tmp_dir = stack.enter_context(tempfile.TemporaryDirectory())
+        if skip_duplicates:
+            target = output
+        else:
+            target = pathlib.Path(tmp_dir).joinpath("records.csv")
+
+        # Whole reference layers are kept in the layer cache (lazy=False)
+        # as they are used again for every chunk. With multiple jobs, the
+        # same worker processes (and therefore their layer caches) are
+        # used for every chunk.
+        executor = None
+        n_jobs = os.cpu_count() if jobs == -1 else jobs
+        if n_jobs > 1:
+            executor = stack.enter_context(
+                concurrent.futures.ProcessPoolExecutor(max_workers=n_jobs)
+            )
+        bounds = None
+        n_records = 0
+        for i, records in enumerate(chunks):
+            if not quiet:
+                logger.info(f"Verifying chunk {i + 1} ({len(records)} records).")
+            records = _verify_records(
+                records,
+                skip_admin,
+                skip_urban,
+                jobs,
+                remove,
+                quiet=True,
+                lazy=False,
+                executor=executor,
+            )
+            bounds = update_bounds(bounds, records.geometry.total_bounds)
+            records = records.drop(columns="geometry")
+            regi0.write_table(
+                records, target, index=False, mode="a" if i else "w", header=not i
+            )
+            n_records += len(records)
+
+        if skip_duplicates or not n_records:
+            if not quiet:
+                logger.info(f"Saved results to {output.resolve()}.")
+            return
 
-    if not skip_duplicates:
         if not quiet:
             logger.info("Identifying duplicate records.")
 
-        bounds = config.get("duplicates", "bounds")
-        if bounds:
-            bounds = list(map(lambda x: float(x), bounds.split(",")))
-        else:
-            bounds = None
+        config_bounds, keep = _get_duplicates_params()
+        if config_bounds:
+            bounds = config_bounds
+        resolution = config.getfloat("duplicates", "pixelsize")
+        species_col = config.get("colnames", "species")
+        tracker = DuplicateTracker(keep)
 
-        try:
-            keep = config.getboolean("duplicates", "keep")
-        except ValueError:
-            keep = config.get("duplicates", "keep")
+        if tracker.needs_count:
+            usecols = [lon_col, lat_col, species_col]
+            for records in regi0.read_table(
+                target, usecols=usecols, chunksize=chunksize
+            ):
+                grid_ids = get_grid_ids(
+                    records[lon_col], records[lat_col], bounds, resolution
+                )
+                tracker.count(
+                    get_keys(
+                        records.assign(__grid_id=grid_ids), [species_col, "__grid_id"]
+                    )
+                )
 
         flagname = config.get("flagnames", "spatialduplicate")
-        records[flagname] = regi0.geographic.find_grid_duplicates(
-            records,
-            config.get("colnames", "species"),
-            config.getfloat("duplicates", "pixelsize"),
-            bounds,
-            keep,
-        )
-        if remove:
-            records = records[~records[flagname]]
+        for i, records in enumerate(regi0.read_table(target, chunksize=chunksize)):
+            grid_ids = get_grid_ids(
+                records[lon_col], records[lat_col], bounds, resolution
+            )
+            keys = get_keys(
+                records.assign(__grid_id=grid_ids), [species_col, "__grid_id"]
+            )
+
+            # Result for records that do not have a grid ID is left empty.
+            flags = tracker.flag(keys).astype(object).where(grid_ids.notna())
+            records[flagname] = flags
+            if remove:
+                records = records[~flags.fillna(False).astype(bool)]
+
+            regi0.write_table(
+                records, output, index=False, mode="a" if i else "w", header=not i
+            )
 
     if not quiet:
-        logger.info(f"Saving results to {pathlib.Path(output).resolve()}.")
-    records = records.drop(columns="geometry")
-    regi0.write_table(records, output, index=False)
+        logger.info(f"Saved results to {output.resolve()}.")
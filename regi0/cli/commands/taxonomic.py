@@ -2,6 +2,7 @@
 $ regi0 tax
 """
 import pathlib
+import tempfile
 
 import click
 import pandas as pd
@@ -9,6 +10,7 @@ import regi0
 
 from ..utils.config import config
 from ..utils.logger import logger
+from ..utils.streaming import DuplicateTracker, MemoizedLookup, get_keys
 
 
 @click.command()
@@ -41,6 +43,21 @@ from ..utils.logger import logger
     multiple=True,
     help="Categories from checklist to add to result.",
 )
+@click.option(
+    "--suggest-from-checklist",
+    default=False,
+    is_flag=True,
+    show_default=True,
+    help="Suggest the closest species name in the checklist for names that do "
+    "not match GNR, instead of the name retrieved from GNR.",
+)
+@click.option(
+    "--chunksize",
+    type=int,
+    default=None,
+    help="Number of records to read, verify and write at a time. Only supported "
+    "for csv files.",
+)
 @click.option(
     "-r",
     "--remove",
@@ -58,7 +75,16 @@ from ..utils.logger import logger
     show_default=True,
 )
 def tax(
-    input, output, data_source_ids, add_taxonomy, duplicates, category, remove, quiet
+    input,
+    output,
+    data_source_ids,
+    add_taxonomy,
+    duplicates,
+    category,
+    suggest_from_checklist,
+    chunksize,
+    remove,
+    quiet,
 ):
     """
     Executes a flexible taxonomic verification workflow on a set of
@@ -68,10 +94,87 @@ def tax(
         logger.error("No configuration file found. Please run regi0 setup first.")
         return
 
+    data_source_ids = data_source_ids.split(",")
+    if "all" in category:
+        category = ["alien", "endemic", "cites", "mads", "iucn"]
+
+    if chunksize:
+        _tax_chunked(
+            input,
+            output,
+            data_source_ids,
+            add_taxonomy,
+            duplicates,
+            category,
+            suggest_from_checklist,
+            chunksize,
+            remove,
+            quiet,
+        )
+        return
+
     if not quiet:
         logger.info(f"Reading records from {pathlib.Path(input).resolve()}.")
     records = regi0.read_table(input)
 
+    def classify(names):
+        return regi0.taxonomic.gnr.get_classification(
+            names,
+            add_supplied_names=False,
+            add_source=True,
+            expand=True,
+            best_match_only=True,
+            data_source_ids=data_source_ids,
+        )
+
+    vocabulary = _get_vocabulary(quiet) if suggest_from_checklist else None
+    records = _verify_names(
+        records, classify, add_taxonomy, remove, quiet, vocabulary=vocabulary
+    )
+
+    if duplicates:
+        columns, keep = _get_duplicates_params()
+        records[config.get("flagnames", "duplicate")] = records.duplicated(
+            subset=columns, keep=keep
+        )
+
+    if category:
+        checklist = regi0.taxonomic.Checklist(
+            config.get("paths", "checklist"), config.get("checklist", "species")
+        )
+
+        def get_fields(names):
+            return checklist.get_fields(
+                names,
+                [config.get("checklist", cat) for cat in category],
+                add_supplied_names=False,
+                expand=True,
+            )
+
+        records = _add_categories(records, get_fields, quiet)
+
+    if not quiet:
+        logger.info(f"Saving results to {pathlib.Path(output).resolve()}.")
+    regi0.write_table(records, output, index=False)
+
+
+def _get_vocabulary(quiet):
+    """
+    Indexes the species names of the checklist to suggest the closest
+    ones for names that do not match GNR.
+    """
+    if not quiet:
+        logger.info("Indexing checklist names.")
+    checklist = regi0.taxonomic.Checklist(
+        config.get("paths", "checklist"), config.get("checklist", "species")
+    )
+    return regi0.matching.VocabularyIndex(checklist.index)
+
+
+def _verify_names(records, classify, add_taxonomy, remove, quiet, vocabulary=None):
+    """
+    Verifies the scientific names of a set of records.
+    """
     if not quiet:
         logger.info(f"Getting canonical names.")
     canonical_label = config.get("suggestednames", "canonical")
@@ -81,15 +184,7 @@ def tax(
 
     if not quiet:
         logger.info(f"Verifying scientific names using GNR.")
-    data_source_ids = data_source_ids.split(",")
-    classification = regi0.taxonomic.gnr.get_classification(
-        records[canonical_label],
-        add_supplied_names=False,
-        add_source=True,
-        expand=True,
-        best_match_only=True,
-        data_source_ids=data_source_ids,
-    )
+    classification = classify(records[canonical_label])
     records = regi0.verify(
         records,
         config.get("suggestednames", "canonical"),
@@ -97,10 +192,12 @@ def tax(
         config.get("flagnames", "species"),
         add_suggested=True,
         suggested_name=config.get("suggestednames", "species"),
+        vocabulary=vocabulary,
         add_source=True,
         source=classification["source"],
         source_name=config.get("sourcenames", "species"),
         drop=remove,
+        scorer=config.get("verification", "scorer", fallback="ratio"),
     )
 
     if add_taxonomy:
@@ -110,43 +207,157 @@ def tax(
             [records, classification.drop(columns=["species", "source"])], axis=1
         )
 
-    if duplicates:
-        try:
-            keep = config.getboolean("duplicates", "keep")
-        except ValueError:
-            keep = config.get("duplicates", "keep")
-        records[config.get("flagnames", "duplicate")] = records.duplicated(
-            subset=config.get("duplicates", "columns").split(","),
-            keep=keep,
+    return records
+
+
+def _add_categories(records, get_fields, quiet):
+    """
+    Adds categories from the checklist to a set of records.
+    """
+    if not quiet:
+        logger.info("Retrieving categories from checklist.")
+
+    # For extracting new information based on the scientific names,
+    # it is necessary to pass accepted scientific names. Hence, a
+    # new series is created with the combination of originally correct
+    # names and the new suggested ones for those cases where the
+    # resolver found a suggestion.
+    mask = records[config.get("flagnames", "species")].astype("boolean")
+    accepted_names = records.loc[mask, config.get("suggestednames", "canonical")]
+    suggested_names = records.loc[~mask, config.get("suggestednames", "species")]
+    nans = records.loc[
+        records[config.get("flagnames", "species")].isna(),
+        config.get("suggestednames", "species"),
+    ]
+    names = pd.concat([accepted_names, suggested_names, nans]).sort_index()
+
+    values = get_fields(names)
+
+    return pd.concat([records, values], axis=1)
+
+
+def _get_duplicates_params():
+    """
+    Gets the columns and the keep parameter to identify duplicates from
+    the configuration file.
+    """
+    columns = config.get("duplicates", "columns").split(",")
+    try:
+        keep = config.getboolean("duplicates", "keep")
+    except ValueError:
+        keep = config.get("duplicates", "keep")
+
+    return columns, keep
+
+
+def _tax_chunked(
+    input,
+    output,
+    data_source_ids,
+    add_taxonomy,
+    duplicates,
+    category,
+    suggest_from_checklist,
+    chunksize,
+    remove,
+    quiet,
+):
+    """
+    Executes the taxonomic verification workflow reading, verifying and
+    writing records in chunks. Names are resolved only once per run and
+    checklist categories are looked up in a checklist indexed by name.
+    Identifying duplicates requires the whole set of records, so verified
+    chunks are written to a temporary file that is then read again in
+    chunks to identify duplicates and add checklist categories.
+    """
+    output = pathlib.Path(output)
+    if pathlib.Path(input).suffix != ".csv" or output.suffix != ".csv":
+        logger.error("Processing records in chunks is only supported for csv files.")
+        return
+
+    def classify(names):
+        return regi0.taxonomic.gnr.get_classification(
+            names,
+            add_supplied_names=False,
+            add_source=True,
+            expand=False,
+            best_match_only=True,
+            data_source_ids=data_source_ids,
         )
 
+    ranks = ["kingdom", "phylum", "class", "order", "family", "genus", "species"]
+    classifications = MemoizedLookup(classify, ranks + ["source"])
+    vocabulary = _get_vocabulary(quiet) if suggest_from_checklist else None
+
     if category:
         if not quiet:
-            logger.info("Retrieving categories from checklist.")
-
-        # For extracting new information based on the scientific names,
-        # it is necessary to pass accepted scientific names. Hence, a
-        # new series is created with the combination of originally correct
-        # names and the new suggested ones for those cases where the
-        # resolver found a suggestion.
-        mask = records[config.get("flagnames", "species")].astype("boolean")
-        accepted_names = records.loc[mask, config.get("suggestednames", "canonical")]
-        suggested_names = records.loc[~mask, config.get("suggestednames", "species")]
-        nans = records.loc[records[config.get("flagnames", "species")].isna(), config.get("suggestednames", "species")]
-        names = pd.concat([accepted_names, suggested_names, nans]).sort_index()
-
-        if "all" in category:
-            category = ["alien", "endemic", "cites", "mads", "iucn"]
-        values = regi0.taxonomic.get_checklist_fields(
-            names,
-            config.get("paths", "checklist"),
-            name_field=config.get("checklist", "species"),
-            fields=[config.get("checklist", cat) for cat in category],
-            add_supplied_names=False,
-            expand=True,
+            logger.info("Reading checklist.")
+        fields = [config.get("checklist", cat) for cat in category]
+        checklist = regi0.taxonomic.Checklist(
+            config.get("paths", "checklist"), config.get("checklist", "species")
         )
-        records = pd.concat([records, values], axis=1)
+
+        def get_fields(names):
+            return checklist.get_fields(names, fields).set_axis(names.index)
 
     if not quiet:
-        logger.info(f"Saving results to {pathlib.Path(output).resolve()}.")
-    regi0.write_table(records, output, index=False)
+        logger.info(f"Reading records from {pathlib.Path(input).resolve()}.")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        # Columns to identify duplicates with are read as text so that
+        # their values are compared the same way in every chunk,
+        # regardless of the types inferred for each of them.
+        if duplicates:
+            target = pathlib.Path(tmp_dir).joinpath("records.csv")
+            columns, keep = _get_duplicates_params()
+            dtypes = {col: str for col in columns}
+        else:
+            target = output
+            dtypes = None
+
+        n_records = 0
+        chunks = regi0.read_table(input, dtype=dtypes, chunksize=chunksize)
+        for i, records in enumerate(chunks):
+            if not quiet:
+                logger.info(f"Verifying chunk {i + 1} ({len(records)} records).")
+            records = _verify_names(
+                records,
+                classifications.get,
+                add_taxonomy,
+                remove,
+                quiet=True,
+                vocabulary=vocabulary,
+            )
+            if category and not duplicates:
+                records = _add_categories(records, get_fields, quiet=True)
+            regi0.write_table(
+                records, target, index=False, mode="a" if i else "w", header=not i
+            )
+            n_records += len(records)
+
+        if not quiet:
+            logger.info(f"Resolved {len(classifications)} unique names.")
+
+        if duplicates and n_records:
+            if not quiet:
+                logger.info("Identifying duplicate records.")
+
+            tracker = DuplicateTracker(keep)
+            if tracker.needs_count:
+                for records in regi0.read_table(
+                    target, usecols=columns, dtype=dtypes, chunksize=chunksize
+                ):
+                    tracker.count(get_keys(records, columns))
+
+            flagname = config.get("flagnames", "duplicate")
+            chunks = regi0.read_table(target, dtype=dtypes, chunksize=chunksize)
+            for i, records in enumerate(chunks):
+                records[flagname] = tracker.flag(get_keys(records, columns))
+                if category:
+                    records = _add_categories(records, get_fields, quiet=True)
+                regi0.write_table(
+                    records, output, index=False, mode="a" if i else "w", header=not i
+                )
+
+    if not quiet:
+        logger.info(f"Saved results to {output.resolve()}.")
@@ -0,0 +1,225 @@
+"""
+Helpers to process records in chunks in CLI commands.
+"""
+import collections
+import functools
+
+import numpy as np
+import pandas as pd
+
+
+class DuplicateTracker:
+    """
+    Identifies duplicated keys across chunks of records, following the
+    same semantics as pandas.DataFrame.duplicated. Keeping the first
+    occurrence only requires a single pass over the chunks. Keeping the
+    last occurrence or marking every duplicate requires passing every
+    chunk to count first.
+
+    Parameters
+    ----------
+    keep : bool or str
+        Which duplicates to mark. Can be:
+
+        - False: mark all duplicates as True.
+        - 'first': mark duplicates as True except for the first occurrence.
+        - 'last': mark duplicates as True except for the last occurrence.
+
+    """
+
+    def __init__(self, keep="first"):
+        if keep not in (False, "first", "last"):
+            raise ValueError("`keep` must be either False, 'first' or 'last'.")
+        self.keep = keep
+        self._totals = collections.Counter()
+        self._seen = collections.Counter()
+
+    @property
+    def needs_count(self) -> bool:
+        """
+        Whether every chunk has to be counted before flagging duplicates.
+        """
+        return self.keep != "first"
+
+    def count(self, keys: pd.Series) -> None:
+        """
+        Counts the occurrences of the keys of a chunk.
+
+        Parameters
+        ----------
+        keys : Series
+            Series with the keys of each record.
+
+        Returns
+        -------
+        None
+
+        """
+        self._totals.update(keys.value_counts().to_dict())
+
+    def flag(self, keys: pd.Series) -> pd.Series:
+        """
+        Identifies duplicated records in a chunk. Chunks must be passed in
+        the same order they were counted.
+
+        Parameters
+        ----------
+        keys : Series
+            Series with the keys of each record.
+
+        Returns
+        -------
+        Series
+            Boolean Series indicating whether records are duplicates.
+
+        """
+        # Number of occurrences of each key before each record, both in
+        # previous chunks and in the current one.
+        previous = keys.map(self._seen) + keys.groupby(keys).cumcount()
+
+        if self.keep == "first":
+            result = previous > 0
+        elif self.keep == "last":
+            result = previous + 1 < keys.map(self._totals)
+        else:
+            result = keys.map(self._totals) > 1
+
+        self._seen.update(keys.value_counts().to_dict())
+
+        return result
+
+
+class MemoizedLookup:
+    """
+    Memoizes a function that looks up one row of results for each unique
+    value (e.g. scientific names), so that values already looked up in
+    previous chunks are not looked up again.
+
+    Parameters
+    ----------
+    func : callable
+        Function that receives a Series with unique non-missing values
+        and returns a DataFrame with one row for each value, in the same
+        order.
+    columns : list
+        Columns of the result of `func`. Used when no value has been
+        looked up yet.
+
+    """
+
+    def __init__(self, func, columns: list):
+        self.func = func
+        self._results = pd.DataFrame(columns=columns)
+
+    def __len__(self) -> int:
+        return len(self._results)
+
+    def get(self, values: pd.Series) -> pd.DataFrame:
+        """
+        Gets the results for some values, looking up only the values that
+        have not been looked up before.
+
+        Parameters
+        ----------
+        values : Series
+            Series with values.
+
+        Returns
+        -------
+        DataFrame
+            DataFrame with the results for each value and the same index
+            as `values`. Results for missing values are empty.
+
+        """
+        unique = pd.Series(values.dropna().unique())
+        unique = unique[~unique.isin(self._results.index)].reset_index(drop=True)
+        if len(unique):
+            result = self.func(unique).set_axis(unique.values)
+            self._results = pd.concat([self._results, result])
+
+        return self._results.reindex(values.values).set_axis(values.index)
+
+
+def get_keys(df: pd.DataFrame, columns: list) -> pd.Series:
+    """
+    Combines the values of multiple columns into a single string key.
+
+    Parameters
+    ----------
+    df : DataFrame
+        DataFrame with records.
+    columns : list
+        Columns to combine.
+
+    Returns
+    -------
+    Series
+        Series with the keys of each record.
+
+    """
+    values = [df[col].astype(str) for col in columns]
+
+    return functools.reduce(lambda left, right: left + "\x1f" + right, values)
+
+
+def get_grid_ids(x: pd.Series, y: pd.Series, bounds: tuple, resolution: float):
+    """
+    Gets the ID of the cell of a grid where each point falls. Cells are
+    numbered the same way as in regi0.geographic.duplicates._create_id_grid.
+
+    Parameters
+    ----------
+    x : Series
+        X coordinate of each point.
+    y : Series
+        Y coordinate of each point.
+    bounds : tuple
+        Grid bounds (xmin, ymin, xmax, ymax).
+    resolution : float
+        Grid resolution.
+
+    Returns
+    -------
+    Series
+        Series with the cell IDs. Missing for points outside the grid.
+
+    """
+    xmin, ymin, xmax, ymax = bounds
+    height = np.ceil((ymax - ymin) / resolution)
+    width = np.ceil((xmax - xmin) / resolution)
+
+    cols = np.floor((x - xmin) / resolution)
+    rows = np.floor((ymax - y) / resolution)
+    inside = (cols >= 0) & (cols < width) & (rows >= 0) & (rows < height)
+
+    return (rows * width + cols + 1).where(inside)
+
+
+def update_bounds(bounds: tuple, other: tuple) -> tuple:
+    """
+    Expands a bounding box to include another one.
+
+    Parameters
+    ----------
+    bounds : tuple
+        Bounding box (xmin, ymin, xmax, ymax). Can be None.
+    other : tuple
+        Bounding box (xmin, ymin, xmax, ymax) to include.
+
+    Returns
+    -------
+    tuple
+        Expanded bounding box.
+
+    """
+    if not np.isfinite(other).all():
+        return bounds
+    if bounds is None:
+        return tuple(other)
+
+    return (
+        min(bounds[0], other[0]),
+        min(bounds[1], other[1]),
+        max(bounds[2], other[2]),
+        max(bounds[3], other[3]),
+    )
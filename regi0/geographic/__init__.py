@@ -1,3 +1,5 @@
+from regi0.geographic import compiled
+from regi0.geographic.cache import layer_cache
 from regi0.geographic.duplicates import find_grid_duplicates
 from regi0.geographic.local import (
     get_layer_field,
@@ -0,0 +1,365 @@
+"""
+Process-wide cache of vector layers read from disk.
+"""
+import collections
+import pathlib
+import threading
+from typing import Union
+
+import geopandas as gpd
+import numpy as np
+import pygeos
+import rasterio
+import rasterio.features
+from scipy import ndimage
+
+from .compiled import is_compiled, read_compiled_layer
+
+
+class PreparedLayer:
+    """
+    Vector layer ready to be queried. Holds the parsed features together
+    with their prepared geometries and spatial index so that they are
+    built only once per layer.
+
+    Parameters
+    ----------
+    gdf : GeoDataFrame
+        GeoDataFrame with the layer features.
+
+    Attributes
+    ----------
+    gdf : GeoDataFrame
+        GeoDataFrame with the layer features. Must not be modified in
+        place as it is shared by every caller of the cache.
+    geometries : ndarray
+        Array with the prepared pygeos geometries of `gdf`.
+    tree : STRtree
+        Spatial index of `geometries`.
+    nbytes : int
+        Approximate memory footprint of the layer in bytes.
+
+    """
+
+    def __init__(self, gdf: gpd.GeoDataFrame):
+        self.gdf = gdf
+
+        # Prepared geometries cache the internal structures GEOS needs to
+        # evaluate spatial predicates, making repeated tests against the
+        # same geometries considerably faster.
+        self.geometries = pygeos.from_wkb(gdf.geometry.to_wkb().values)
+        pygeos.prepare(self.geometries)
+        self.tree = pygeos.STRtree(self.geometries)
+
+        attributes = gdf.drop(columns=gdf.geometry.name)
+        coords = pygeos.get_num_coordinates(self.geometries).sum()
+        self.nbytes = int(attributes.memory_usage(deep=True).sum() + coords * 16)
+
+        self._rasters = {}
+        self._lock = threading.Lock()
+
+    def rasterize(self, resolution: float = None) -> tuple:
+        """
+        Rasterizes the layer into a grid where each pixel has the position
+        of the feature it falls in (plus one, as zero is reserved for
+        pixels outside every feature). Pixels covered by more than one
+        feature get the feature that comes first in the layer. Grids are
+        cached by resolution.
+
+        Parameters
+        ----------
+        resolution : float
+            Pixel resolution in the units of the layer coordinate
+            reference system. If None, the resolution is chosen so that
+            the longest side of the grid has 2048 pixels (or 1 if the
+            layer has no extent, e.g. a single point).
+
+        Returns
+        -------
+        codes : ndarray
+            2D array with the feature position plus one for each pixel.
+        edges : ndarray
+            2D boolean array indicating whether each pixel is within one
+            pixel of a feature boundary. Values of these pixels are not
+            reliable and must be checked using the vector geometries.
+        transform : Affine
+            Affine transformation of the grid.
+
+        """
+        xmin, ymin, xmax, ymax = self.gdf.total_bounds
+        if resolution is None:
+            resolution = max(xmax - xmin, ymax - ymin) / 2048
+            if not resolution > 0:
+                resolution = 1.0
+        elif not resolution > 0:
+            raise ValueError("`resolution` must be positive.")
+
+        # Layers are shared by every caller of the cache, so grids are
+        # built under a lock to avoid building the same grid twice.
+        with self._lock:
+            if resolution not in self._rasters:
+                self._rasters[resolution] = self._rasterize(resolution)
+                codes, edges, _ = self._rasters[resolution]
+                self.nbytes += codes.nbytes + edges.nbytes
+
+            return self._rasters[resolution]
+
+    def _rasterize(self, resolution: float) -> tuple:
+        """
+        Rasterizes the layer at a specific resolution. See the rasterize
+        method.
+
+        Parameters
+        ----------
+        resolution : float
+            Pixel resolution in the units of the layer coordinate
+            reference system.
+
+        Returns
+        -------
+        codes : ndarray
+            2D array with the feature position plus one for each pixel.
+        edges : ndarray
+            2D boolean array indicating whether each pixel is within one
+            pixel of a feature boundary.
+        transform : Affine
+            Affine transformation of the grid.
+
+        """
+        xmin, ymin, xmax, ymax = self.gdf.total_bounds
+        height = max(int(np.ceil((ymax - ymin) / resolution)), 1)
+        width = max(int(np.ceil((xmax - xmin) / resolution)), 1)
+        transform = rasterio.transform.from_origin(xmin, ymax, resolution, resolution)
+
+        # Features are burned in reverse order so that features that
+        # come first in the layer overwrite the others.
+        shapes = [
+            (geometry, position + 1)
+            for position, geometry in reversed(list(enumerate(self.gdf.geometry)))
+            if geometry is not None and not geometry.is_empty
+        ]
+        codes = rasterio.features.rasterize(
+            shapes,
+            out_shape=(height, width),
+            transform=transform,
+            fill=0,
+            dtype=np.int32,
+        )
+        # Geometries without area (e.g. points or lines) have no interior,
+        # so every pixel they touch is an edge pixel.
+        edges = rasterio.features.rasterize(
+            [
+                (geometry.boundary if geometry.area > 0 else geometry, 1)
+                for geometry, _ in shapes
+            ],
+            out_shape=(height, width),
+            transform=transform,
+            fill=0,
+            all_touched=True,
+            dtype=np.uint8,
+        ).astype(bool)
+        edges = ndimage.binary_dilation(edges, structure=np.ones((3, 3)))
+
+        return codes, edges, transform
+
+
+def _read_layer(path: pathlib.Path, layer: str = None) -> gpd.GeoDataFrame:
+    """
+    Reads a vector layer from disk. If the layer has an up-to-date
+    compiled version (see regi0.geographic.compiled), it is read instead.
+
+    Parameters
+    ----------
+    path : Path
+        Path of the vector file.
+    layer : str
+        Layer name. Only has effect when path is a geopackage file.
+
+    Returns
+    -------
+    GeoDataFrame
+        GeoDataFrame with the layer features.
+
+    """
+    if is_compiled(path, layer):
+        return read_compiled_layer(path, layer)
+
+    return gpd.read_file(path, layer=layer)
+
+
+class LayerCache:
+    """
+    Least recently used cache of prepared vector layers. Layers are keyed
+    by their resolved path, layer name, modification time and size, so a
+    layer is read again whenever the underlying file changes.
+
+    Parameters
+    ----------
+    max_entries : int
+        Maximum number of layers to keep.
+    max_bytes : int
+        Approximate maximum number of bytes the cached layers can take.
+        The most recently used layer is always kept, even if it exceeds
+        this budget on its own.
+
+    """
+
+    def __init__(self, max_entries: int = 32, max_bytes: int = 2 * 1024 ** 3):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @staticmethod
+    def _make_key(path: Union[str, pathlib.Path], layer: str = None) -> tuple:
+        """
+        Creates the cache key of a layer.
+
+        Parameters
+        ----------
+        path : str or Path
+            Path of the vector file.
+        layer : str
+            Layer name.
+
+        Returns
+        -------
+        tuple
+            Resolved path, layer name, modification time and size.
+
+        """
+        path = pathlib.Path(path).resolve()
+        stat = path.stat()
+
+        return str(path), layer, stat.st_mtime_ns, stat.st_size
+
+    def __contains__(
+        self, item: Union[str, pathlib.Path, tuple, PreparedLayer]
+    ) -> bool:
+        if isinstance(item, PreparedLayer):
+            with self._lock:
+                return any(entry is item for entry in self._entries.values())
+        if isinstance(item, tuple):
+            key = self._make_key(*item)
+        else:
+            key = self._make_key(item)
+
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, path: Union[str, pathlib.Path], layer: str = None) -> PreparedLayer:
+        """
+        Gets a prepared layer, reading it from disk if it is not cached
+        or if the file changed since it was cached.
+
+        Parameters
+        ----------
+        path : str or Path
+            Path of the vector file.
+        layer : str
+            Layer name. Only has effect when path is a geopackage file.
+
+        Returns
+        -------
+        PreparedLayer
+            Prepared layer.
+
+        """
+        key = self._make_key(path, layer)
+
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return self._entries[key]
+            self._misses += 1
+
+        # Reading happens outside the lock so that other threads can keep
+        # using already cached layers in the meantime.
+        prepared = PreparedLayer(_read_layer(pathlib.Path(path), layer))
+
+        with self._lock:
+            # Stale entries for the same path and layer are dropped.
+            for other in [k for k in self._entries if k[:2] == key[:2]]:
+                del self._entries[other]
+            self._entries[key] = prepared
+            self._evict()
+
+        return prepared
+
+    def _evict(self) -> None:
+        """
+        Removes the least recently used layers until the cache is within
+        its entries and bytes budget.
+
+        Returns
+        -------
+        None
+
+        """
+        nbytes = sum(entry.nbytes for entry in self._entries.values())
+        while len(self._entries) > 1 and (
+            len(self._entries) > self.max_entries or nbytes > self.max_bytes
+        ):
+            _, entry = self._entries.popitem(last=False)
+            nbytes -= entry.nbytes
+            self._evictions += 1
+
+    def trim(self) -> None:
+        """
+        Removes the least recently used layers until the cache is within
+        its entries and bytes budget. Layers are only checked against the
+        budget when they are read, so this must be called after a cached
+        layer grows (e.g. after PreparedLayer.rasterize).
+
+        Returns
+        -------
+        None
+
+        """
+        with self._lock:
+            self._evict()
+
+    def clear(self) -> None:
+        """
+        Removes every layer from the cache and resets its statistics.
+
+        Returns
+        -------
+        None
+
+        """
+        with self._lock:
+            self._entries.clear()
+            self._hits = 0
+            self._misses = 0
+            self._evictions = 0
+
+    def stats(self) -> dict:
+        """
+        Gets the cache statistics.
+
+        Returns
+        -------
+        dict
+            Number of hits, misses, evictions, cached layers and cached
+            bytes.
+
+        """
+        with self._lock:
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "entries": len(self._entries),
+                "nbytes": sum(entry.nbytes for entry in self._entries.values()),
+            }
+
+
+layer_cache = LayerCache()
@@ -0,0 +1,306 @@
+"""
+Functions to compile vector layers into a columnar on-disk format.
+
+Parsing shapefiles and GeoPackages is considerably slower than reading
+columnar data. Compiled layers store the geometries as WKB and the
+attributes in an uncompressed Feather (Arrow IPC) file that can be memory
+mapped, along with an array with the bounding box of each feature that
+allows filtering features before decoding any geometry. Compiled layers
+are invalidated whenever the modification time or size of their source
+file changes.
+"""
+import hashlib
+import json
+import pathlib
+from typing import Union
+
+import appdirs
+import fiona
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+from pyarrow import feather
+
+CACHE_DIR = pathlib.Path(appdirs.user_cache_dir("regi0")).joinpath("layers")
+
+_FORMAT_VERSION = 1
+_WKB_COLUMN = "__wkb"
+
+
+def _get_layer_name(path: Union[str, pathlib.Path], layer: str = None) -> str:
+    """
+    Gets the name of the layer read from a vector file, which for
+    geopackage files is the first one when no layer name is passed.
+
+    Parameters
+    ----------
+    path : str or Path
+        Path of the source vector file.
+    layer : str
+        Layer name. Only has effect when path is a geopackage file.
+
+    Returns
+    -------
+    str
+        Layer name.
+
+    """
+    if layer is None and pathlib.Path(path).suffix == ".gpkg":
+        layer = fiona.listlayers(path)[0]
+
+    return layer
+
+
+def _get_compiled_path(
+    path: Union[str, pathlib.Path],
+    layer: str = None,
+    cache_dir: Union[str, pathlib.Path] = None,
+) -> pathlib.Path:
+    """
+    Gets the base path (without suffix) of the compiled files of a layer.
+
+    Parameters
+    ----------
+    path : str or Path
+        Path of the source vector file.
+    layer : str
+        Layer name. Only has effect when path is a geopackage file.
+    cache_dir : str or Path
+        Folder with compiled layers. If None, CACHE_DIR is used.
+
+    Returns
+    -------
+    Path
+        Base path of the compiled layer files.
+
+    """
+    if cache_dir is None:
+        cache_dir = CACHE_DIR
+    # Compiled layers are keyed by layer name, so that a geopackage layer
+    # is found whether its name is passed or not.
+    layer = _get_layer_name(path, layer)
+    source = str(pathlib.Path(path).resolve())
+    digest = hashlib.sha1(f"{source}|{layer}".encode("utf-8")).hexdigest()
+
+    return pathlib.Path(cache_dir).joinpath(digest)
+
+
+def _read_metadata(
+    path: Union[str, pathlib.Path],
+    layer: str = None,
+    cache_dir: Union[str, pathlib.Path] = None,
+) -> dict:
+    """
+    Reads the metadata of a compiled layer.
+
+    Parameters
+    ----------
+    path : str or Path
+        Path of the source vector file.
+    layer : str
+        Layer name. Only has effect when path is a geopackage file.
+    cache_dir : str or Path
+        Folder with compiled layers. If None, CACHE_DIR is used.
+
+    Returns
+    -------
+    dict
+        Compiled layer metadata. Empty if the layer has not been compiled.
+
+    """
+    base = _get_compiled_path(path, layer, cache_dir)
+    try:
+        with open(base.with_suffix(".json")) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def compile_layer(
+    path: Union[str, pathlib.Path],
+    layer: str = None,
+    cache_dir: Union[str, pathlib.Path] = None,
+) -> pathlib.Path:
+    """
+    Compiles a vector layer into a columnar on-disk format.
+
+    Parameters
+    ----------
+    path : str or Path
+        Path of the source vector file.
+    layer : str
+        Layer name. Only has effect when path is a geopackage file.
+    cache_dir : str or Path
+        Folder to save the compiled layer to. If None, CACHE_DIR is used.
+
+    Returns
+    -------
+    Path
+        Path of the compiled Feather file.
+
+    """
+    path = pathlib.Path(path).resolve()
+    stat = path.stat()
+    layer = _get_layer_name(path, layer)
+    base = _get_compiled_path(path, layer, cache_dir)
+    base.parent.mkdir(parents=True, exist_ok=True)
+
+    gdf = gpd.read_file(path, layer=layer)
+    df = pd.DataFrame(gdf.drop(columns=gdf.geometry.name))
+    df[_WKB_COLUMN] = gdf.geometry.to_wkb().values
+
+    # Compression is disabled so that the file can be memory mapped.
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    feather.write_feather(
+        table, base.with_suffix(".feather"), compression="uncompressed"
+    )
+
+    bounds = gdf.geometry.bounds.to_numpy(dtype=np.float64)
+    with open(base.with_suffix(".npy"), "wb") as f:
+        np.save(f, bounds)
+
+    metadata = {
+        "version": _FORMAT_VERSION,
+        "source": str(path),
+        "layer": layer,
+        "mtime_ns": stat.st_mtime_ns,
+        "size": stat.st_size,
+        "crs": gdf.crs.to_wkt() if gdf.crs else None,
+        "geometry": gdf.geometry.name,
+    }
+
+    # Metadata is written last so that an interrupted compilation is never
+    # considered valid.
+    with open(base.with_suffix(".json"), "w") as f:
+        json.dump(metadata, f)
+
+    return base.with_suffix(".feather")
+
+
+def compile_layers(
+    path: Union[str, pathlib.Path], cache_dir: Union[str, pathlib.Path] = None
+) -> list:
+    """
+    Compiles every layer of a vector file, every shapefile in a folder or
+    every layer of a GeoPackage.
+
+    Parameters
+    ----------
+    path : str or Path
+        Path of a vector file, a .gpkg file or a folder containing .shp
+        files.
+    cache_dir : str or Path
+        Folder to save the compiled layers to. If None, CACHE_DIR is used.
+
+    Returns
+    -------
+    list
+        Paths of the compiled Feather files.
+
+    """
+    if not isinstance(path, pathlib.Path):
+        path = pathlib.Path(path)
+
+    if path.is_dir():
+        return [compile_layer(fn, cache_dir=cache_dir) for fn in path.glob("*.shp")]
+    elif path.suffix == ".gpkg":
+        return [
+            compile_layer(path, layer, cache_dir) for layer in fiona.listlayers(path)
+        ]
+    else:
+        return [compile_layer(path, cache_dir=cache_dir)]
+
+
+def is_compiled(
+    path: Union[str, pathlib.Path],
+    layer: str = None,
+    cache_dir: Union[str, pathlib.Path] = None,
+) -> bool:
+    """
+    Checks whether a vector layer has an up-to-date compiled version.
+
+    Parameters
+    ----------
+    path : str or Path
+        Path of the source vector file.
+    layer : str
+        Layer name. Only has effect when path is a geopackage file.
+    cache_dir : str or Path
+        Folder with compiled layers. If None, CACHE_DIR is used.
+
+    Returns
+    -------
+    bool
+        Whether the layer has an up-to-date compiled version.
+
+    """
+    metadata = _read_metadata(path, layer, cache_dir)
+    if metadata.get("version") != _FORMAT_VERSION:
+        return False
+
+    stat = pathlib.Path(path).stat()
+
+    return metadata["mtime_ns"] == stat.st_mtime_ns and metadata["size"] == stat.st_size
+
+
+def read_compiled_layer(
+    path: Union[str, pathlib.Path],
+    layer: str = None,
+    bbox: Union[list, tuple] = None,
+    columns: list = None,
+    cache_dir: Union[str, pathlib.Path] = None,
+) -> gpd.GeoDataFrame:
+    """
+    Reads the compiled version of a vector layer.
+
+    Parameters
+    ----------
+    path : str or Path
+        Path of the source vector file.
+    layer : str
+        Layer name. Only has effect when path is a geopackage file.
+    bbox : list or tuple
+        Bounding box (xmin, ymin, xmax, ymax) to filter features with.
+        Only features whose bounding box intersects it are read.
+    columns : list
+        Attribute columns to read. If None, all columns are read.
+    cache_dir : str or Path
+        Folder with compiled layers. If None, CACHE_DIR is used.
+
+    Returns
+    -------
+    GeoDataFrame
+        GeoDataFrame with the layer features.
+
+    """
+    if not is_compiled(path, layer, cache_dir):
+        raise Exception(f"{path} does not have an up-to-date compiled version.")
+
+    base = _get_compiled_path(path, layer, cache_dir)
+    metadata = _read_metadata(path, layer, cache_dir)
+
+    if columns is not None:
+        columns = list(columns) + [_WKB_COLUMN]
+    table = feather.read_table(
+        base.with_suffix(".feather"), columns=columns, memory_map=True
+    )
+
+    if bbox is not None:
+        xmin, ymin, xmax, ymax = bbox
+        bounds = np.load(base.with_suffix(".npy"), mmap_mode="r")
+        mask = (
+            (bounds[:, 0] <= xmax)
+            & (bounds[:, 2] >= xmin)
+            & (bounds[:, 1] <= ymax)
+            & (bounds[:, 3] >= ymin)
+        )
+        table = table.take(pa.array(np.flatnonzero(mask)))
+
+    df = table.to_pandas()
+    geometry = gpd.GeoSeries.from_wkb(df.pop(_WKB_COLUMN), crs=metadata["crs"])
+    gdf = gpd.GeoDataFrame(df, geometry=geometry.values, crs=metadata["crs"])
+    if metadata["geometry"] != gdf.geometry.name:
+        gdf = gdf.rename_geometry(metadata["geometry"])
+
+    return gdf
@@ -1,14 +1,22 @@
 """
 Functions to extract information from local data.
 """
+import concurrent.futures
+import contextlib
+import os
 import pathlib
 import re
+import tempfile
 from typing import Union
 
 import fiona
 import geopandas as gpd
 import numpy as np
 import pandas as pd
+import pygeos
+
+from .cache import PreparedLayer, layer_cache
+from .compiled import is_compiled, read_compiled_layer
 
 
 def _extract_year(x: Union[str, pathlib.Path]) -> int:
@@ -94,7 +102,9 @@ def _get_nearest_year(
     years = years.sort_values()
 
     dummy_df = pd.DataFrame({years.name: reference_years, "__year": reference_years})
-    result = pd.merge_asof(years, dummy_df, on=years.name, direction=direction)["__year"]
+    result = pd.merge_asof(years, dummy_df, on=years.name, direction=direction)[
+        "__year"
+    ]
 
     # merge_asof result has a new index that has to be changed for the original. Also,
     # merge_asof does not work with NaN values. All dates that are NaNs are discarded in
@@ -115,6 +125,311 @@ def _get_nearest_year(
     return result
 
 
+def _prepare(
+    other: Union[str, pathlib.Path, gpd.GeoDataFrame, PreparedLayer],
+    layer: str = None,
+) -> PreparedLayer:
+    """
+    Gets a prepared layer from a path, a GeoDataFrame or an already
+    prepared layer. Layers read from disk go through the layer cache.
+
+    Parameters
+    ----------
+    other : str, Path, GeoDataFrame or PreparedLayer
+        Layer to prepare.
+    layer : str
+        Layer name. Only has effect when other is a geopackage file.
+
+    Returns
+    -------
+    PreparedLayer
+        Prepared layer.
+
+    """
+    if isinstance(other, PreparedLayer):
+        return other
+    if isinstance(other, gpd.GeoDataFrame):
+        return PreparedLayer(other)
+
+    return layer_cache.get(other, layer=layer)
+
+
+def _query_first_hit(gdf: gpd.GeoDataFrame, prepared: PreparedLayer) -> np.ndarray:
+    """
+    Finds, for each record, the first feature of a prepared layer that
+    it intersects. Candidate features are retrieved from the layer's
+    spatial index by bounding box and then tested exactly against the
+    layer's prepared geometries.
+
+    When a record intersects more than one feature (e.g. it lies on the
+    boundary between two polygons or the layer has overlapping
+    features), the feature that comes first in the layer (i.e. the one
+    with the lowest position) is taken.
+
+    Parameters
+    ----------
+    gdf : GeoDataFrame
+        GeoDataFrame with records.
+    prepared : PreparedLayer
+        Prepared layer to query.
+
+    Returns
+    -------
+    ndarray
+        Positions of the first intersected feature for each record. -1
+        for records that do not intersect any feature.
+
+    """
+    if (gdf.geom_type == "Point").all():
+        geometries = pygeos.points(gdf.geometry.x, gdf.geometry.y)
+    else:
+        geometries = pygeos.from_wkb(gdf.geometry.to_wkb().values)
+
+    input_idx, tree_idx = prepared.tree.query_bulk(geometries)
+    hits = pygeos.intersects(prepared.geometries[tree_idx], geometries[input_idx])
+    input_idx, tree_idx = input_idx[hits], tree_idx[hits]
+
+    no_hit = np.iinfo(np.intp).max
+    first = np.full(len(geometries), no_hit, dtype=np.intp)
+    np.minimum.at(first, input_idx, tree_idx)
+    first[first == no_hit] = -1
+
+    return first
+
+
+def _query_first_hit_raster(
+    gdf: gpd.GeoDataFrame, prepared: PreparedLayer, resolution: float = None
+) -> np.ndarray:
+    """
+    Finds, for each record, the first feature of a prepared layer that
+    it intersects by sampling a rasterized version of the layer. Records
+    that fall within one pixel of a feature boundary are tested using the
+    vector geometries (see _query_first_hit), so the result is the same
+    as the vector query. Only point records are sampled, other geometries
+    are always tested using the vector geometries.
+
+    Parameters
+    ----------
+    gdf : GeoDataFrame
+        GeoDataFrame with records.
+    prepared : PreparedLayer
+        Prepared layer to query.
+    resolution : float
+        Pixel resolution of the rasterized layer. See
+        PreparedLayer.rasterize for more information.
+
+    Returns
+    -------
+    ndarray
+        Positions of the first intersected feature for each record. -1
+        for records that do not intersect any feature.
+
+    """
+    if not (gdf.geom_type == "Point").all():
+        return _query_first_hit(gdf, prepared)
+
+    codes, edges, transform = prepared.rasterize(resolution)
+    # Rasterizing a cached layer grows it, which can leave the layer cache
+    # over its bytes budget.
+    if prepared in layer_cache:
+        layer_cache.trim()
+    height, width = codes.shape
+
+    x = gdf.geometry.x.to_numpy()
+    y = gdf.geometry.y.to_numpy()
+    with np.errstate(invalid="ignore"):
+        cols = np.floor((x - transform.c) / transform.a)
+        rows = np.floor((y - transform.f) / transform.e)
+    inside = (cols >= 0) & (cols < width) & (rows >= 0) & (rows < height)
+    # Points exactly on the right or bottom edge of the grid fall just
+    # outside its last pixels but can still be on a feature boundary.
+    edge = (cols >= 0) & (cols <= width) & (rows >= 0) & (rows <= height) & ~inside
+    cols = cols[inside].astype(np.intp)
+    rows = rows[inside].astype(np.intp)
+
+    # Points outside the grid are outside every feature.
+    first = np.full(len(gdf), -1, dtype=np.intp)
+    first[inside] = codes[rows, cols] - 1
+
+    boundary = edge
+    boundary[inside] = edges[rows, cols]
+    if boundary.any():
+        first[boundary] = _query_first_hit(gdf[boundary], prepared)
+
+    return first
+
+
+def _read_layer_subset(
+    path: pathlib.Path,
+    layer: str = None,
+    bbox: Union[list, tuple] = None,
+    columns: list = None,
+) -> gpd.GeoDataFrame:
+    """
+    Reads the features of a vector layer that intersect a bounding box,
+    keeping only some of its attribute columns.
+
+    Parameters
+    ----------
+    path : Path
+        Path of the vector file.
+    layer : str
+        Layer name. Only has effect when path is a geopackage file.
+    bbox : list or tuple
+        Bounding box (xmin, ymin, xmax, ymax) to filter features with.
+        Must be in the same coordinate reference system as the layer.
+    columns : list
+        Attribute columns to read. If None, all columns are read.
+
+    Returns
+    -------
+    GeoDataFrame
+        GeoDataFrame with the layer features.
+
+    """
+    if is_compiled(path, layer):
+        return read_compiled_layer(path, layer, bbox=bbox, columns=columns)
+
+    kwargs = {}
+    if columns is not None:
+        with fiona.open(path, layer=layer) as src:
+            fields = list(src.schema["properties"])
+        kwargs["ignore_fields"] = [f for f in fields if f not in columns]
+
+    return gpd.read_file(path, layer=layer, bbox=bbox, **kwargs)
+
+
+def _historical_year(
+    gdf: gpd.GeoDataFrame,
+    path: pathlib.Path,
+    layer: str = None,
+    op: str = "intersection",
+    field: str = None,
+    lazy: bool = True,
+    mode: str = "vector",
+    resolution: float = None,
+) -> pd.Series:
+    """
+    Executes an intersection or a match between records and a single
+    historical layer.
+
+    Parameters
+    ----------
+    gdf : GeoDataFrame
+        GeoDataFrame with records.
+    path : Path
+        Path of the vector file.
+    layer : str
+        Layer name. Only has effect when path is a geopackage file.
+    op : str
+        Operation to execute. Can be "intersection" or "match".
+    field : str
+        Field to get from the layer when `op` is "match".
+    lazy : bool
+        Whether to read only the features within the bounds of `gdf` and
+        the field required by `op` instead of the whole layer. Only has
+        effect if the whole layer is not in the layer cache already and
+        `mode` is "vector".
+    mode : str
+        Lookup mode when `op` is "match". See get_layer_field.
+    resolution : float
+        Pixel resolution when `mode` is "raster". See get_layer_field.
+
+    Returns
+    -------
+    pd.Series
+        Extracted values.
+
+    """
+    # Whole layers that are already cached are reused instead of reading
+    # a subset from disk. Rasterized layers are cached with their whole
+    # layer, so subsets are never read in raster mode.
+    read_subset = lazy and mode == "vector" and (path, layer) not in layer_cache
+    if read_subset:
+        with fiona.open(path, layer=layer) as src:
+            crs = src.crs_wkt or None
+    else:
+        other = layer_cache.get(path, layer=layer)
+        crs = other.gdf.crs
+
+    # Records are compared with the layer in its coordinate reference
+    # system, so that the bounding box used to read the subset is also
+    # expressed in it.
+    if gdf.crs is not None and crs is not None and gdf.crs != crs:
+        gdf = gdf.to_crs(crs)
+
+    if read_subset:
+        bounds = gdf.total_bounds
+        if np.isfinite(bounds).all():
+            columns = [field] if op == "match" else []
+            other = _prepare(_read_layer_subset(path, layer, tuple(bounds), columns))
+        else:
+            other = layer_cache.get(path, layer=layer)
+
+    if op == "intersection":
+        return intersects_layer(gdf, other)
+    else:
+        return get_layer_field(gdf, other, field, mode=mode, resolution=resolution)
+
+
+def _historical_year_shared(
+    coords_path: str,
+    positions: np.ndarray,
+    crs,
+    path: pathlib.Path,
+    layer: str = None,
+    op: str = "intersection",
+    field: str = None,
+    lazy: bool = True,
+    mode: str = "vector",
+    resolution: float = None,
+) -> np.ndarray:
+    """
+    Executes an intersection or a match between a subset of records and a
+    single historical layer in a worker. Instead of receiving the records
+    themselves, it receives the path of a .npy file with the coordinates
+    of every record, which is memory mapped so that records are not
+    copied for each task.
+
+    Parameters
+    ----------
+    coords_path : str
+        Path of a .npy file with an (n, 2) array of record coordinates.
+    positions : ndarray
+        Positions of the records to execute the operation for.
+    crs
+        Coordinate reference system of the coordinates.
+    path : Path
+        Path of the vector file.
+    layer : str
+        Layer name. Only has effect when path is a geopackage file.
+    op : str
+        Operation to execute. Can be "intersection" or "match".
+    field : str
+        Field to get from the layer when `op` is "match".
+    lazy : bool
+        Whether to read only the features within the bounds of the
+        records and the field required by `op` instead of the whole layer.
+    mode : str
+        Lookup mode when `op` is "match". See get_layer_field.
+    resolution : float
+        Pixel resolution when `mode` is "raster". See get_layer_field.
+
+    Returns
+    -------
+    ndarray
+        Extracted values for each position.
+
+    """
+    coords = np.load(coords_path, mmap_mode="r")[positions]
+    geometry = gpd.points_from_xy(coords[:, 0], coords[:, 1])
+    gdf = gpd.GeoDataFrame(geometry=geometry, crs=crs)
+
+    return _historical_year(
+        gdf, path, layer, op, field, lazy, mode, resolution
+    ).to_numpy()
+
+
 def _historical(
     gdf: gpd.GeoDataFrame,
     others_path: Union[str, pathlib.Path],
@@ -124,6 +439,11 @@ def _historical(
     op: str = "intersection",
     field: str = None,
     return_source: bool = False,
+    lazy: bool = True,
+    mode: str = "vector",
+    resolution: float = None,
+    n_jobs: int = 1,
+    executor: concurrent.futures.Executor = None,
 ) -> Union[pd.Series, tuple]:
     """
     Checks whether records in gdf intersect with features in other or if
@@ -163,6 +483,24 @@ def _historical(
         Field to get from layers when `op` is "match".
     return_source : bool
         Whether to return a column with layer source.
+    lazy : bool
+        Whether to read, for each layer, only the features within the
+        bounds of its corresponding records and the field required by
+        `op`. If False, whole layers are read and kept in the layer cache,
+        which is faster when calling this function repeatedly with the
+        same layers (e.g. processing records in chunks). Only has effect
+        when `mode` is "vector".
+    mode : str
+        Lookup mode when `op` is "match". See get_layer_field.
+    resolution : float
+        Pixel resolution when `mode` is "raster". See get_layer_field.
+    n_jobs : int
+        Number of processes to load and join the historical layers with.
+        If -1, all CPUs are used. Only has effect when all the records
+        are points, otherwise layers are processed sequentially.
+    executor : Executor
+        Executor to submit each historical layer to. Takes precedence
+        over `n_jobs`.
 
     Returns
     -------
@@ -172,6 +510,11 @@ def _historical(
         Corresponding source. Only provided if return_source is True.
 
     """
+    if op not in ("intersection", "match"):
+        raise ValueError("`op` must be either 'intersection' or 'match'.")
+    if mode not in ("vector", "raster"):
+        raise ValueError("`mode` must be either 'vector' or 'raster'.")
+
     if not isinstance(others_path, pathlib.Path):
         others_path = pathlib.Path(others_path)
 
@@ -196,27 +539,72 @@ def _historical(
     if return_source:
         source = pd.Series(index=gdf.index, dtype="object")
 
-    for year in historical_year.dropna().unique():
+    # Each task is defined by the positions of the records matched with a
+    # specific year, the path and layer name to read and the source name.
+    # Years are sorted so that results are always merged in the same order.
+    tasks = []
+    for year in sorted(historical_year.dropna().unique()):
         layer = layers[years.index(year)]
         if input_type == "shp":
-            other = gpd.read_file(layer)
-            year_source = layer.stem
+            task = (layer, None, layer.stem)
         elif input_type == "gpkg":
-            other = gpd.read_file(others_path, layer=layer)
-            year_source = layer
-
-        mask = historical_year == year
-        year_gdf = gdf[mask]
-        if op == "intersection":
-            year_result = intersects_layer(year_gdf, other)
-        elif op == "match":
-            year_result = get_layer_field(year_gdf, other, field)
-        else:
-            raise ValueError("`op` must be either 'intersection' or 'match'.")
-
-        result.loc[mask] = year_result
+            task = (others_path, layer, layer)
+        positions = np.flatnonzero((historical_year == year).to_numpy())
+        tasks.append((positions, *task))
+
+    if n_jobs == -1:
+        n_jobs = os.cpu_count()
+    parallel = (executor is not None or n_jobs > 1) and len(tasks) > 1
+    if parallel and not (gdf.geom_type == "Point").all():
+        parallel = False
+
+    if parallel:
+        with contextlib.ExitStack() as stack:
+            if executor is None:
+                executor = stack.enter_context(
+                    concurrent.futures.ProcessPoolExecutor(max_workers=n_jobs)
+                )
+
+            # Record coordinates are written once to a temporary file that
+            # every worker memory maps, instead of pickling the records for
+            # each task.
+            tmp_dir = stack.enter_context(tempfile.TemporaryDirectory())
+            coords_path = os.path.join(tmp_dir, "coords.npy")
+            np.save(coords_path, np.column_stack([gdf.geometry.x, gdf.geometry.y]))
+
+            futures = [
+                executor.submit(
+                    _historical_year_shared,
+                    coords_path,
+                    positions,
+                    gdf.crs,
+                    path,
+                    layer,
+                    op,
+                    field,
+                    lazy,
+                    mode,
+                    resolution,
+                )
+                for positions, path, layer, _ in tasks
+            ]
+            year_results = [
+                pd.Series(future.result(), index=gdf.index[positions])
+                for future, (positions, *_) in zip(futures, tasks)
+            ]
+    else:
+        year_results = [
+            _historical_year(
+                gdf.iloc[positions], path, layer, op, field, lazy, mode, resolution
+            )
+            for positions, path, layer, _ in tasks
+        ]
+
+    for (positions, _, _, year_source), year_result in zip(tasks, year_results):
+        index = gdf.index[positions]
+        result.loc[index] = year_result
         if return_source:
-            source.loc[mask] = year_source
+            source.loc[index] = year_source
 
     if return_source:
         return result, source
@@ -229,11 +617,15 @@ def get_layer_field(
     other: Union[str, pathlib.Path, gpd.GeoDataFrame],
     field: str,
     layer: str = None,
+    mode: str = "vector",
+    resolution: float = None,
 ) -> pd.Series:
     """
     Gets the corresponding values of a specific field by performing a
     spatial join between a GeoDataFrame with records and a GeoDataFrame
-    representing a vector layer.
+    representing a vector layer. If a record intersects more than one
+    feature, the value of the feature that comes first in the layer is
+    taken.
 
     Parameters
     ----------
@@ -245,6 +637,20 @@ def get_layer_field(
         Name of the field to extract values from.
     layer : str
         Layer name. Only has effect when other is a geopackage file.
+    mode : str
+        Lookup mode. Can be:
+
+        - 'vector': tests records against the layer geometries.
+        - 'raster': samples a rasterized version of the layer, which is
+        cached with the layer and is considerably faster for repeated
+        lookups. Records within one pixel of a feature boundary are
+        tested against the layer geometries, so the result is the same
+        as with 'vector'.
+    resolution : float
+        Pixel resolution of the rasterized layer, in the units of its
+        coordinate reference system. Only has effect when `mode` is
+        "raster". If None, the resolution is chosen so that the longest
+        side of the grid has 2048 pixels.
 
     Returns
     -------
@@ -255,12 +661,20 @@ def get_layer_field(
     if isinstance(other, str):
         other = pathlib.Path(other)
 
-    if not isinstance(other, gpd.GeoDataFrame):
-        other = gpd.read_file(other, layer=layer)
+    prepared = _prepare(other, layer)
+    if mode == "vector":
+        first = _query_first_hit(gdf, prepared)
+    elif mode == "raster":
+        first = _query_first_hit_raster(gdf, prepared, resolution)
+    else:
+        raise ValueError("`mode` must be either 'vector' or 'raster'.")
 
-    join = gpd.sjoin(gdf, other, how="left", predicate="intersects")
+    # Reindexing with the position of the first hit leaves missing values
+    # for records without a hit (-1), just like a left spatial join would.
+    result = prepared.gdf[field].reset_index(drop=True).reindex(first)
+    result.index = gdf.index
 
-    return join[field]
+    return result
 
 
 def get_layer_field_historical(
@@ -323,23 +737,17 @@ def intersects_layer(
     if isinstance(other, str):
         other = pathlib.Path(other)
 
-    if not isinstance(other, gpd.GeoDataFrame):
-        other = gpd.read_file(other, layer=layer)
-
     # Ideally, one could check if the elements of `gdf` intersect any of
     # the features of `other` with the following line:
     # gdf.intersects(other.geometry.unary_union)
     # While this works, depending on the complexity of the geometries of
     # `other` and the number of elements of `gdf`, the execution can be
-    # considerably slow. A workaround is to create a new column with a
-    # constant value (e.g. 1) in `other` and do a spatial join. Elements
-    # of `gdf` that have a value for that column intersect any of the
-    # features in `other`.
-    other = other.copy()
-    other["__dummy"] = 1
-    join = gpd.sjoin(gdf, other, how="left", predicate="intersects")
-    intersects = join["__dummy"].notna()
-    intersects.name = None
+    # considerably slow. Instead, the spatial index and the prepared
+    # geometries of `other` are queried to find whether each element of
+    # `gdf` intersects any feature.
+    prepared = _prepare(other, layer)
+    first = _query_first_hit(gdf, prepared)
+    intersects = pd.Series(first >= 0, index=gdf.index)
 
     intersects.loc[~gdf.is_valid] = pd.NA
 
@@ -4,15 +4,22 @@ Wrappers for ArcGIS REST API calls.
 API documentation can be found at: https://developers.arcgis.com/rest
 """
 import json
+import threading
+import time
 from typing import Union
 
 import geopandas as gpd
+import numpy as np
 import pandas as pd
 import requests
 
+from ... import http
 from ..local import get_layer_field as _get_layer_field
 from ..local import intersects_layer as _intersects_layer
 
+# Approximate length of a degree at the equator, in metres.
+DEGREE_LENGTH = 111320
+
 
 def _query(
     url: str,
@@ -24,10 +31,16 @@ def _query(
     out_fields: Union[list, str] = None,
     return_geometry: bool = True,
     out_sr: int = None,
+    result_offset: int = None,
+    result_record_count: int = None,
     f="JSON",
+    max_retries: int = 3,
+    backoff_factor: float = 1.0,
 ) -> requests.Response:
     """
-    Queries a Feature Service layer.
+    Queries a Feature Service layer. Queries are sent as POST requests,
+    which the shared session does not retry, so failed queries are
+    retried here with an exponential backoff.
 
     Parameters
     ----------
@@ -66,8 +79,21 @@ def _query(
         reference can be specified as either a well-known ID or as a
         spatial reference JSON object. If outSR is not specified, the
         geometry is returned in the spatial reference of the map.
+    result_offset : int
+        Number of records to skip before the first returned record. Used
+        to page through the results of a query.
+    result_record_count : int
+        Maximum number of records to return. If not specified, the
+        maximum number of records of the layer is used.
     f : str
         The response format.
+    max_retries : int
+        Maximum number of times to retry a failed query. Only connection
+        errors, timeouts and responses with a status code in
+        regi0.http.RETRY_STATUS_CODES are retried.
+    backoff_factor : float
+        Factor to compute the time (in seconds) to wait before each retry.
+        The n-th retry waits backoff_factor * 2 ** (n - 1) seconds.
 
     Returns
     -------
@@ -89,14 +115,31 @@ def _query(
         "outFields": ",".join(out_fields),
         "returnGeometry": return_geometry,
         "outSR": out_sr,
+        "resultOffset": result_offset,
+        "resultRecordCount": result_record_count,
         "f": f,
     }
 
-    try:
-        response = requests.post(url, data=params)
-        response.raise_for_status()
-    except requests.exceptions.HTTPError as err:
-        raise Exception(f"Error calling {url}. {err}")
+    for attempt in range(max_retries + 1):
+        try:
+            response = http.get_session().post(url, data=params)
+            response.raise_for_status()
+            break
+        except (
+            requests.exceptions.ConnectionError,
+            requests.exceptions.Timeout,
+            requests.exceptions.HTTPError,
+        ) as err:
+            is_http_error = isinstance(err, requests.exceptions.HTTPError)
+            retry = attempt < max_retries
+            if is_http_error:
+                status_code = err.response.status_code
+                retry = retry and status_code in http.RETRY_STATUS_CODES
+            if not retry:
+                if is_http_error:
+                    raise Exception(f"Error calling {url}. {err}")
+                raise
+            time.sleep(backoff_factor * 2 ** attempt)
     if "error" in response.json():
         msg = response.json()["error"].get("message")
         raise Exception(f"Error calling {url}. {msg}")
@@ -104,8 +147,357 @@ def _query(
     return response
 
 
+class FeatureCache:
+    """
+    In-memory cache of the features of Feature Service layers. Features
+    are requested for whole grid cells (i.e. envelopes) and stored along
+    with the cells already covered, so that later queries for the same
+    layer, WHERE clause and fields only request the cells that were not
+    covered before and reuse the cached geometries otherwise.
+
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return sum(len(entry["features"]) for entry in self._entries.values())
+
+    def get_missing_cells(self, key: tuple, cells: list) -> list:
+        """
+        Gets the cells that have not been covered yet.
+
+        Parameters
+        ----------
+        key : tuple
+            Cache key.
+        cells : list
+            Cell indices.
+
+        Returns
+        -------
+        list
+            Indices of the cells that are not covered.
+
+        """
+        with self._lock:
+            covered = self._entries.get(key, {}).get("cells", {})
+            return [cell for cell in cells if cell not in covered]
+
+    def add(self, key: tuple, cell: tuple, features: list) -> None:
+        """
+        Stores the features of a cell and marks the cell as covered.
+
+        Parameters
+        ----------
+        key : tuple
+            Cache key.
+        cell : tuple
+            Cell indices.
+        features : list
+            GeoJSON features that intersect the cell.
+
+        Returns
+        -------
+        None
+
+        """
+        with self._lock:
+            entry = self._entries.setdefault(key, {"features": {}, "cells": {}})
+            feature_keys = []
+            for feature in features:
+                feature_key = _get_feature_key(feature)
+                entry["features"].setdefault(feature_key, feature)
+                feature_keys.append(feature_key)
+            entry["cells"][cell] = feature_keys
+
+    def get(self, key: tuple, cells: list) -> list:
+        """
+        Gets the cached features of some covered cells.
+
+        Parameters
+        ----------
+        key : tuple
+            Cache key.
+        cells : list
+            Cell indices.
+
+        Returns
+        -------
+        list
+            GeoJSON features that intersect the cells. Features that
+            intersect multiple cells are only included once.
+
+        """
+        with self._lock:
+            entry = self._entries.get(key, {"features": {}, "cells": {}})
+            feature_keys = dict.fromkeys(
+                feature_key
+                for cell in cells
+                for feature_key in entry["cells"].get(cell, [])
+            )
+            return [entry["features"][feature_key] for feature_key in feature_keys]
+
+    def clear(self) -> None:
+        """
+        Removes every cached feature.
+
+        Returns
+        -------
+        None
+
+        """
+        with self._lock:
+            self._entries.clear()
+
+
+def _get_feature_key(feature: dict) -> str:
+    """
+    Gets a key that identifies a GeoJSON feature.
+
+    Parameters
+    ----------
+    feature : dict
+        GeoJSON feature.
+
+    Returns
+    -------
+    str
+        Feature ID (i.e. the object ID), or the serialized feature if it
+        does not have one.
+
+    """
+    key = feature.get("id")
+    if key is None:
+        return json.dumps(feature, sort_keys=True)
+
+    return str(key)
+
+
+def _query_features(
+    url: str,
+    geometry: dict,
+    geometry_type: str,
+    epsg: int,
+    where: str = "1=1",
+    out_fields: list = None,
+    page_size: int = None,
+) -> list:
+    """
+    Gets every feature of a Feature Service layer that intersects a
+    geometry, paging through the results until the layer stops reporting
+    that its transfer limit was exceeded.
+
+    Parameters
+    ----------
+    url : str.
+        Feature Service layer. Must end with /query.
+    geometry : dict
+        The geometry to apply as the spatial filter, without its spatial
+        reference.
+    geometry_type : str
+        The type of geometry specified by the geometry parameter.
+    epsg : int
+        EPSG code of the spatial reference of the geometry. The returned
+        features use the same spatial reference.
+    where : str
+        A WHERE clause for the query filter
+    out_fields : list
+        Field(s) to retrieve from the layer.
+    page_size : int
+        Maximum number of features to request at once. If None, the
+        maximum number of records of the layer is used.
+
+    Returns
+    -------
+    list
+        GeoJSON features.
+
+    """
+    features = []
+    while True:
+        response = _query(
+            url,
+            where=where,
+            geometry={**geometry, "spatialReference": {"wkid": epsg}},
+            geometry_type=geometry_type,
+            spatial_rel="esriSpatialRelIntersects",
+            out_fields=out_fields,
+            return_geometry=True,
+            out_sr=epsg,
+            result_offset=len(features) or None,
+            result_record_count=page_size,
+            f="GeoJSON",
+        )
+        content = response.json()
+        page = content.get("features", [])
+        features.extend(page)
+        # GeoJSON responses report the transfer limit as a property of
+        # the feature collection, but some servers add it at the top
+        # level as in JSON responses.
+        exceeded = content.get("exceededTransferLimit") or content.get(
+            "properties", {}
+        ).get("exceededTransferLimit")
+        if not exceeded or not page:
+            break
+
+    return features
+
+
+def _get_cell_size(crs) -> float:
+    """
+    Gets the default size of the grid cells used to group records, which
+    is one degree or its approximate equivalent in the units of a
+    projected coordinate reference system.
+
+    Parameters
+    ----------
+    crs : CRS
+        Coordinate reference system of the records.
+
+    Returns
+    -------
+    float
+        Cell size in the units of `crs`.
+
+    """
+    if crs is None or crs.is_geographic:
+        return 1.0
+
+    return DEGREE_LENGTH / crs.axis_info[0].unit_conversion_factor
+
+
+def _get_features(
+    gdf: gpd.GeoDataFrame,
+    url: str,
+    where: str = "1=1",
+    out_fields: Union[list, str] = None,
+    cell_size: float = None,
+    max_points: int = 1000,
+    page_size: int = None,
+    max_workers: int = 4,
+    cache: FeatureCache = None,
+) -> gpd.GeoDataFrame:
+    """
+    Gets the features of a Feature Service layer that intersect the
+    records of a GeoDataFrame. Unique record coordinates are grouped by
+    the cells of a regular grid, and each cell (split in chunks of at
+    most `max_points` points) is queried separately and concurrently.
+    Features returned by more than one query are only kept once.
+
+    If a cache is passed, the whole envelope of each cell that is not
+    covered by the cache is queried instead, and features of covered
+    cells are taken from the cache.
+
+    Parameters
+    ----------
+    gdf : GeoDataFrame
+        GeoDataFrame with records.
+    url : str.
+        Feature Service layer. Must end with /query.
+    where : str
+        A WHERE clause for the query filter
+    out_fields : list or str
+        Field(s) to retrieve from the layer.
+    cell_size : float
+        Size of the grid cells used to group records, in the units of the
+        CRS of `gdf`. If None, cells of one degree (or its approximate
+        equivalent for projected coordinate reference systems) are used.
+    max_points : int
+        Maximum number of points sent in a single query.
+    page_size : int
+        Maximum number of features to request at once. If None, the
+        maximum number of records of the layer is used.
+    max_workers : int
+        Maximum number of concurrent queries.
+    cache : FeatureCache
+        Cache of features. If None, features are not cached.
+
+    Returns
+    -------
+    GeoDataFrame
+        Features that intersect the records.
+
+    """
+    if out_fields is None:
+        out_fields = []
+    if isinstance(out_fields, str):
+        out_fields = [out_fields]
+
+    if cell_size is None:
+        cell_size = _get_cell_size(gdf.crs)
+
+    points = np.column_stack([gdf.geometry.x, gdf.geometry.y])
+    points = np.unique(points[np.isfinite(points).all(axis=1)], axis=0)
+    cells = np.floor(points / cell_size).astype(int)
+    unique_cells = [tuple(cell) for cell in np.unique(cells, axis=0).tolist()]
+    epsg = gdf.crs.to_epsg()
+
+    if cache is None:
+        chunks = []
+        for cell in unique_cells:
+            cell_points = points[(cells == cell).all(axis=1)]
+            for i in range(0, len(cell_points), max_points):
+                chunks.append({"points": cell_points[i : i + max_points].tolist()})
+        results = http.map_concurrent(
+            lambda chunk: _query_features(
+                url,
+                chunk,
+                "esriGeometryMultiPoint",
+                epsg,
+                where,
+                out_fields,
+                page_size,
+            ),
+            chunks,
+            max_workers=max_workers,
+        )
+        features = [feature for result in results for feature in result]
+    else:
+        key = (url, where, tuple(out_fields), cell_size, epsg)
+        missing_cells = cache.get_missing_cells(key, unique_cells)
+        results = http.map_concurrent(
+            lambda cell: _query_features(
+                url,
+                {
+                    "xmin": cell[0] * cell_size,
+                    "ymin": cell[1] * cell_size,
+                    "xmax": (cell[0] + 1) * cell_size,
+                    "ymax": (cell[1] + 1) * cell_size,
+                },
+                "esriGeometryEnvelope",
+                epsg,
+                where,
+                out_fields,
+                page_size,
+            ),
+            missing_cells,
+            max_workers=max_workers,
+        )
+        for cell, result in zip(missing_cells, results):
+            cache.add(key, cell, result)
+        features = cache.get(key, unique_cells)
+
+    features = {_get_feature_key(feature): feature for feature in features}
+    columns = ["geometry"] + [field for field in out_fields if field != "*"]
+
+    return gpd.GeoDataFrame.from_features(
+        list(features.values()), crs=gdf.crs, columns=columns
+    )
+
+
 def get_feature_layer_field(
-    gdf: gpd.GeoDataFrame, url: str, field: Union[list, str], where: str = "1=1"
+    gdf: gpd.GeoDataFrame,
+    url: str,
+    field: Union[list, str],
+    where: str = "1=1",
+    cell_size: float = None,
+    max_points: int = 1000,
+    page_size: int = None,
+    max_workers: int = 4,
+    cache: FeatureCache = None,
 ) -> pd.Series:
     """
     Gets the corresponding values of one or multiple fields in a Feature
@@ -121,6 +513,22 @@ def get_feature_layer_field(
         Field(s) to retrieve from the layer.
     where : str
         A WHERE clause for the query filter
+    cell_size : float
+        Size of the grid cells used to split records in multiple queries,
+        in the units of the CRS of `gdf`. If None, cells of one degree (or
+        its approximate equivalent for projected coordinate reference
+        systems) are used.
+    max_points : int
+        Maximum number of points sent in a single query.
+    page_size : int
+        Maximum number of features to request at once. If None, the
+        maximum number of records of the layer is used.
+    max_workers : int
+        Maximum number of concurrent queries.
+    cache : FeatureCache
+        Cache of features to reuse between calls. If passed, whole grid
+        cells are requested and cached, and cells already covered by
+        previous calls are not requested again.
 
     Returns
     -------
@@ -128,27 +536,30 @@ def get_feature_layer_field(
         Extracted values from the Feature Service layer.
 
     """
-    response = _query(
+    other = _get_features(
+        gdf,
         url,
         where=where,
-        geometry={
-            "points": list(zip(gdf.geometry.x, gdf.geometry.y)),
-            "spatialReference": {"wkid": gdf.crs.to_epsg()},
-        },
-        geometry_type="esriGeometryMultiPoint",
-        spatial_rel="esriSpatialRelIntersects",
         out_fields=field,
-        return_geometry=True,
-        out_sr=gdf.crs.to_epsg(),
-        f="GeoJSON",
+        cell_size=cell_size,
+        max_points=max_points,
+        page_size=page_size,
+        max_workers=max_workers,
+        cache=cache,
     )
-    other = gpd.GeoDataFrame.from_features(response.json()["features"], crs=gdf.crs)
 
     return _get_layer_field(gdf, other, field=field)
 
 
 def intersects_feature_layer(
-    gdf: gpd.GeoDataFrame, url: str, where: str = "1=1"
+    gdf: gpd.GeoDataFrame,
+    url: str,
+    where: str = "1=1",
+    cell_size: float = None,
+    max_points: int = 1000,
+    page_size: int = None,
+    max_workers: int = 4,
+    cache: FeatureCache = None,
 ) -> pd.Series:
     """
     Checks whether records from gdf intersect any feature of the Feature
@@ -162,6 +573,22 @@ def intersects_feature_layer(
         URL of the Feature Service layer. Must end with /query.
     where : str
         A WHERE clause for the query filter
+    cell_size : float
+        Size of the grid cells used to split records in multiple queries,
+        in the units of the CRS of `gdf`. If None, cells of one degree (or
+        its approximate equivalent for projected coordinate reference
+        systems) are used.
+    max_points : int
+        Maximum number of points sent in a single query.
+    page_size : int
+        Maximum number of features to request at once. If None, the
+        maximum number of records of the layer is used.
+    max_workers : int
+        Maximum number of concurrent queries.
+    cache : FeatureCache
+        Cache of features to reuse between calls. If passed, whole grid
+        cells are requested and cached, and cells already covered by
+        previous calls are not requested again.
 
     Returns
     -------
@@ -170,20 +597,16 @@ def intersects_feature_layer(
         feature of the Feature Service layer.
 
     """
-    response = _query(
+    other = _get_features(
+        gdf,
         url,
         where=where,
-        geometry={
-            "points": list(zip(gdf.geometry.x, gdf.geometry.y)),
-            "spatialReference": {"wkid": gdf.crs.to_epsg()},
-        },
-        geometry_type="esriGeometryMultiPoint",
-        spatial_rel="esriSpatialRelIntersects",
         out_fields=None,
-        return_geometry=True,
-        out_sr=gdf.crs.to_epsg(),
-        f="GeoJSON",
+        cell_size=cell_size,
+        max_points=max_points,
+        page_size=page_size,
+        max_workers=max_workers,
+        cache=cache,
     )
-    other = gpd.GeoDataFrame.from_features(response.json()["features"], crs=gdf.crs)
 
     return _intersects_layer(gdf, other)
@@ -0,0 +1,279 @@
+"""
+HTTP helpers shared by the web API wrappers.
+"""
+import collections
+import concurrent.futures
+import threading
+import time
+from typing import Callable, Iterable, Union
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+_session = None
+_session_lock = threading.Lock()
+_settings = {
+    "pool_size": 32,
+    "timeout": (10, 120),
+    "max_retries": 3,
+    "backoff_factor": 0.5,
+}
+_stats = collections.defaultdict(
+    lambda: {"requests": 0, "errors": 0, "seconds": 0.0, "bytes": 0}
+)
+_stats_lock = threading.Lock()
+
+# HTTP status codes of errors that are worth retrying.
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+
+class _Session(requests.Session):
+    """
+    Session with a default timeout for every request.
+    """
+
+    def __init__(self, timeout: Union[float, tuple] = None):
+        super().__init__()
+        self.timeout = timeout
+
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault("timeout", self.timeout)
+        return super().request(method, url, **kwargs)
+
+
+def _record(response: requests.Response, *args, **kwargs) -> None:
+    """
+    Response hook that updates the statistics of the host of a response.
+
+    Parameters
+    ----------
+    response : Response
+        Response.
+
+    Returns
+    -------
+    None
+
+    """
+    host = urlparse(response.url).netloc
+    with _stats_lock:
+        stats = _stats[host]
+        stats["requests"] += 1
+        stats["errors"] += int(response.status_code >= 400)
+        stats["seconds"] += response.elapsed.total_seconds()
+        stats["bytes"] += len(response.content)
+
+
+def configure(
+    pool_size: int = 32,
+    timeout: Union[float, tuple] = (10, 120),
+    max_retries: int = 3,
+    backoff_factor: float = 0.5,
+) -> None:
+    """
+    Configures the session shared by every web API wrapper. The current
+    session, if any, is closed and a new one is created the next time
+    it is needed.
+
+    Parameters
+    ----------
+    pool_size : int
+        Maximum number of connections to keep alive for each host.
+    timeout : float or tuple
+        Default timeout in seconds for each request. Can be a tuple with
+        the connect and read timeouts.
+    max_retries : int
+        Maximum number of times to retry a request after a connection
+        error or a response with a status code in RETRY_STATUS_CODES.
+        Only idempotent requests (e.g. GET) are retried.
+    backoff_factor : float
+        Factor to compute the time (in seconds) to wait before each retry.
+        The n-th retry waits backoff_factor * 2 ** (n - 1) seconds, unless
+        the response has a Retry-After header.
+
+    Returns
+    -------
+    None
+
+    """
+    global _session
+    with _session_lock:
+        _settings.update(
+            pool_size=pool_size,
+            timeout=timeout,
+            max_retries=max_retries,
+            backoff_factor=backoff_factor,
+        )
+        if _session is not None:
+            _session.close()
+            _session = None
+
+
+def get_session() -> requests.Session:
+    """
+    Gets the session shared by every web API wrapper. Reusing a single
+    session keeps connections alive between requests to the same host.
+    The session asks for compressed responses, retries failed idempotent
+    requests and records statistics for each host (see the stats
+    function). Use the configure function to change its settings.
+
+    Returns
+    -------
+    Session
+        Shared session.
+
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            retry = Retry(
+                total=_settings["max_retries"],
+                backoff_factor=_settings["backoff_factor"],
+                status_forcelist=RETRY_STATUS_CODES,
+                raise_on_status=False,
+            )
+            adapter = HTTPAdapter(
+                pool_connections=_settings["pool_size"],
+                pool_maxsize=_settings["pool_size"],
+                max_retries=retry,
+            )
+            _session = _Session(_settings["timeout"])
+            _session.mount("http://", adapter)
+            _session.mount("https://", adapter)
+            _session.headers["Accept-Encoding"] = "gzip, deflate"
+            _session.hooks["response"].append(_record)
+
+    return _session
+
+
+def stats() -> dict:
+    """
+    Gets the statistics of the requests sent with the shared session for
+    each host.
+
+    Returns
+    -------
+    dict
+        Number of requests, number of error responses, total and mean
+        latency in seconds, bytes received and throughput in bytes per
+        second for each host.
+
+    """
+    with _stats_lock:
+        result = {}
+        for host, values in _stats.items():
+            seconds = values["seconds"]
+            result[host] = {
+                **values,
+                "mean_seconds": seconds / values["requests"],
+                "bytes_per_second": values["bytes"] / seconds if seconds else 0.0,
+            }
+
+    return result
+
+
+def reset_stats() -> None:
+    """
+    Resets the statistics of the requests sent with the shared session.
+
+    Returns
+    -------
+    None
+
+    """
+    with _stats_lock:
+        _stats.clear()
+
+
+class RateLimiter:
+    """
+    Token bucket rate limiter. Tokens are added at a constant rate up to
+    the bucket capacity and each call to acquire takes one token, waiting
+    until one is available.
+
+    Parameters
+    ----------
+    rate : float
+        Number of tokens added per second. If None, calls are never
+        limited.
+    capacity : int
+        Maximum number of tokens in the bucket (i.e. maximum burst of
+        calls). If None, it is equal to `rate` (at least one).
+
+    """
+
+    def __init__(self, rate: float = None, capacity: int = None):
+        self.rate = rate
+        if capacity is None:
+            capacity = max(rate or 1, 1)
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """
+        Takes one token from the bucket, waiting until one is available.
+
+        Returns
+        -------
+        None
+
+        """
+        if self.rate is None:
+            return
+
+        with self._lock:
+            now = time.monotonic()
+            elapsed = now - self._updated_at
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+            self._updated_at = now
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0
+
+        # The token is taken before waiting so that concurrent callers
+        # queue up behind each other instead of all waiting for the same
+        # token.
+        if wait:
+            time.sleep(wait)
+
+
+def map_concurrent(
+    func: Callable, items: Iterable, max_workers: int = 1, rate_limit: float = None
+) -> list:
+    """
+    Applies a function to multiple items using a thread pool, preserving
+    the order of the items in the result.
+
+    Parameters
+    ----------
+    func : callable
+        Function to apply to each item.
+    items : iterable
+        Items to apply `func` to.
+    max_workers : int
+        Maximum number of concurrent calls. If 1, items are processed
+        sequentially in the calling thread.
+    rate_limit : float
+        Maximum number of calls per second. If None, calls are not
+        limited.
+
+    Returns
+    -------
+    list
+        Result of `func` for each item.
+
+    """
+    limiter = RateLimiter(rate_limit)
+
+    def call(item):
+        limiter.acquire()
+        return func(item)
+
+    if max_workers == 1:
+        return [call(item) for item in items]
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers) as executor:
+        return list(executor.map(call, items))
@@ -0,0 +1,317 @@
+"""
+Fuzzy matching of text values against each other or against a controlled
+vocabulary.
+"""
+import collections
+from typing import Union
+
+import numpy as np
+import pandas as pd
+from rapidfuzz import fuzz, process
+from rapidfuzz.distance import JaroWinkler
+
+from regi0._helpers import standardize_text
+
+# Scorers available by name and the factor to scale their scores to the
+# 0-100 range.
+SCORERS = {
+    "ratio": (fuzz.ratio, 1),
+    "token_set_ratio": (fuzz.token_set_ratio, 1),
+    "jaro_winkler": (JaroWinkler.normalized_similarity, 100),
+}
+
+
+def _get_scorer(scorer: str) -> tuple:
+    """
+    Gets a scorer by name.
+
+    Parameters
+    ----------
+    scorer : str
+        Name of the scorer. Must be one of the keys of SCORERS.
+
+    Returns
+    -------
+    tuple
+        Scorer function and the factor to scale its scores to the 0-100
+        range.
+
+    """
+    if scorer not in SCORERS:
+        options = ", ".join(f"'{name}'" for name in SCORERS)
+        raise ValueError(f"`scorer` must be one of {options}.")
+
+    return SCORERS[scorer]
+
+
+def get_pair_scores(
+    left: pd.Series, right: pd.Series, scorer: str = "ratio"
+) -> pd.Series:
+    """
+    Computes the similarity between the values of two Series. Each unique
+    pair of values is only compared once, using multiple threads if the
+    installed version of rapidfuzz supports it.
+
+    Parameters
+    ----------
+    left : Series
+        Left Series.
+    right : Series
+        Right Series.
+    scorer : str
+        Similarity measure. Can be "ratio", "token_set_ratio" or
+        "jaro_winkler".
+
+    Returns
+    -------
+    Series
+        Series with the similarity (between 0 and 100) of each pair of
+        values. Missing values are compared as empty strings.
+
+    """
+    func, scale = _get_scorer(scorer)
+
+    values = pd.DataFrame({"left": left, "right": right}).fillna("")
+    left_codes, left_uniques = pd.factorize(values["left"])
+    right_codes, right_uniques = pd.factorize(values["right"])
+    codes, pairs = pd.factorize(left_codes * len(right_uniques) + right_codes)
+    unique_left = left_uniques[pairs // max(len(right_uniques), 1)]
+    unique_right = right_uniques[pairs % max(len(right_uniques), 1)]
+
+    # process.cpdist is only available in rapidfuzz>=3.6.
+    if hasattr(process, "cpdist"):
+        scores = process.cpdist(unique_left, unique_right, scorer=func, workers=-1)
+    else:
+        scores = np.array([func(a, b) for a, b in zip(unique_left, unique_right)])
+
+    return pd.Series(scores[codes] * scale, index=values.index)
+
+
+class VocabularyIndex:
+    """
+    Index of a controlled vocabulary (e.g. every municipality name in a
+    country) to find the terms closest to arbitrary values. Terms are
+    standardized and indexed by their character n-grams once, so that
+    each search only scores the terms that share the most n-grams with
+    the searched value instead of the whole vocabulary.
+
+    Parameters
+    ----------
+    vocabulary : list, array or Series
+        Terms of the vocabulary. Missing values are ignored.
+    preprocess : bool
+        Whether to clean and standardize terms and searched values before
+        comparing them.
+    n : int
+        Length of the n-grams.
+
+    """
+
+    def __init__(
+        self,
+        vocabulary: Union[list, np.ndarray, pd.Series],
+        preprocess: bool = True,
+        n: int = 3,
+    ):
+        terms = pd.Series(vocabulary).dropna().astype(str)
+        keys = standardize_text(terms) if preprocess else terms
+        keys = keys[~keys.duplicated()]
+
+        self.preprocess = preprocess
+        self.n = n
+        self.terms = terms.loc[keys.index].to_numpy()
+        self.keys = keys.to_numpy()
+        postings = collections.defaultdict(list)
+        for i, key in enumerate(self.keys):
+            for gram in self._get_ngrams(key):
+                postings[gram].append(i)
+        self._postings = {
+            gram: np.array(positions, dtype=np.int32)
+            for gram, positions in postings.items()
+        }
+
+    def __len__(self) -> int:
+        return len(self.terms)
+
+    def _get_ngrams(self, value: str) -> set:
+        """
+        Gets the character n-grams of a value, padded with whitespace so
+        that its beginning and end are also indexed.
+
+        Parameters
+        ----------
+        value : str
+            Standardized value.
+
+        Returns
+        -------
+        set
+            Unique n-grams.
+
+        """
+        value = f" {value} "
+        return {value[i : i + self.n] for i in range(max(len(value) - self.n + 1, 1))}
+
+    def _get_candidates(
+        self, key: str, n_candidates: int, n_grams: int = None
+    ) -> np.ndarray:
+        """
+        Gets the terms that share the most n-grams with a value.
+
+        Parameters
+        ----------
+        key : str
+            Standardized value.
+        n_candidates : int
+            Maximum number of terms to return. If None, every term of the
+            vocabulary is returned.
+        n_grams : int
+            Number of the least frequent n-grams of the value to use. If
+            None, every n-gram is used.
+
+        Returns
+        -------
+        array
+            Positions of the candidate terms.
+
+        """
+        if n_candidates is None or n_candidates >= len(self):
+            return np.arange(len(self))
+
+        grams = [gram for gram in self._get_ngrams(key) if gram in self._postings]
+        if not grams:
+            return np.array([], dtype=np.int32)
+        if n_grams is not None:
+            grams = sorted(grams, key=lambda gram: len(self._postings[gram]))
+            grams = grams[:n_grams]
+
+        positions = np.concatenate([self._postings[gram] for gram in grams])
+        candidates, counts = np.unique(positions, return_counts=True)
+        if len(candidates) > n_candidates:
+            top = np.argpartition(-counts, n_candidates - 1)
+            candidates = candidates[top[:n_candidates]]
+
+        return candidates
+
+    def search(
+        self,
+        values: Union[list, np.ndarray, pd.Series, str],
+        k: int = 5,
+        scorer: str = "ratio",
+        threshold: float = 0.0,
+        n_candidates: int = 100,
+        n_grams: int = None,
+    ) -> pd.DataFrame:
+        """
+        Finds the `k` terms closest to each value.
+
+        Parameters
+        ----------
+        values : list, array, Series or str
+            Value(s) to search.
+        k : int
+            Maximum number of terms to return for each value.
+        scorer : str
+            Similarity measure. Can be "ratio", "token_set_ratio" or
+            "jaro_winkler".
+        threshold : float
+            Minimum similarity (between 0 and 1) of the returned terms.
+        n_candidates : int
+            Number of terms sharing the most n-grams with each value that
+            are scored. If None, every term is scored.
+        n_grams : int
+            Number of the least frequent n-grams of each value used to
+            find candidate terms. Frequent n-grams (e.g. common word
+            endings) are shared by many terms but say little about which
+            ones are the closest, so leaving them out makes searches on
+            large vocabularies much faster. If None, every n-gram is used.
+
+        Returns
+        -------
+        DataFrame
+            DataFrame with one row for each returned term, sorted by
+            descending score, and the columns "candidate", "score"
+            (between 0 and 1) and "rank" (starting at 1). Its index
+            repeats the index of `values`, and values without any term
+            above `threshold` are left out.
+
+        """
+        func, scale = _get_scorer(scorer)
+
+        if isinstance(values, (list, str, np.ndarray)):
+            values = pd.Series(values)
+        values = values.dropna().astype(str)
+        keys = standardize_text(values) if self.preprocess else values
+
+        matches = {}
+        for key in keys.unique():
+            candidates = self._get_candidates(key, n_candidates, n_grams)
+            choices = dict(zip(candidates, self.keys[candidates]))
+            results = process.extract(
+                key,
+                choices,
+                scorer=func,
+                limit=k,
+                score_cutoff=threshold * 100 / scale,
+            )
+            matches[key] = [
+                (self.terms[i], score * scale / 100) for _, score, i in results
+            ]
+
+        index, candidates, scores, ranks = [], [], [], []
+        for idx, key in keys.items():
+            for rank, (candidate, score) in enumerate(matches[key], start=1):
+                index.append(idx)
+                candidates.append(candidate)
+                scores.append(score)
+                ranks.append(rank)
+
+        return pd.DataFrame(
+            {"candidate": candidates, "score": scores, "rank": ranks},
+            index=pd.Index(index, dtype=values.index.dtype),
+        )
+
+    def best_match(
+        self,
+        values: Union[list, np.ndarray, pd.Series, str],
+        scorer: str = "ratio",
+        threshold: float = 0.0,
+        n_candidates: int = 100,
+        n_grams: int = None,
+    ) -> pd.DataFrame:
+        """
+        Finds the term closest to each value.
+
+        Parameters
+        ----------
+        values : list, array, Series or str
+            Value(s) to search.
+        scorer : str
+            Similarity measure. Can be "ratio", "token_set_ratio" or
+            "jaro_winkler".
+        threshold : float
+            Minimum similarity (between 0 and 1) of the returned terms.
+        n_candidates : int
+            Number of terms sharing the most n-grams with each value that
+            are scored. If None, every term is scored.
+        n_grams : int
+            Number of the least frequent n-grams of each value used to
+            find candidate terms. Frequent n-grams (e.g. common word
+            endings) are shared by many terms but say little about which
+            ones are the closest, so leaving them out makes searches on
+            large vocabularies much faster. If None, every n-gram is used.
+
+        Returns
+        -------
+        DataFrame
+            DataFrame with the same index as `values` and the columns
+            "candidate" and "score" (between 0 and 1). Both are missing
+            for values without any term above `threshold`.
+
+        """
+        if isinstance(values, (list, str, np.ndarray)):
+            values = pd.Series(values)
+
+        result = self.search(values, 1, scorer, threshold, n_candidates, n_grams)
+
+        return result[["candidate", "score"]].reindex(values.index)
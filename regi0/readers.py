@@ -2,7 +2,7 @@
 Functions to read tabular data.
 """
 import pathlib
-from typing import Union
+from typing import Iterator, Union
 
 import geopandas as gpd
 import pandas as pd
@@ -15,7 +15,8 @@ def read_geographic_table(
     crs: str = "epsg:4326",
     drop_empty_coords: bool = False,
     reset_index: bool = True,
-) -> gpd.GeoDataFrame:
+    chunksize: int = None,
+) -> Union[gpd.GeoDataFrame, Iterator[gpd.GeoDataFrame]]:
     """
     Reads tabular data (csv, txt, xls or xlsx) and converts it to a
     GeoDataFrame.
@@ -37,18 +38,73 @@ def read_geographic_table(
         Whether to reset the result's index after removing rows with
         missing or incomplete coordinates. Only has effect when
         drop_empty_coords is True.
+    chunksize : int
+        Number of rows per chunk. If passed, an iterator of GeoDataFrames
+        is returned instead of a single GeoDataFrame. When reset_index is
+        True, the index continues across chunks. Only supported for csv
+        and txt files.
 
     Returns
     -------
-    gpd.GeoDataFrame
-        GeoDataFrame with the records.
+    gpd.GeoDataFrame or Iterator
+        GeoDataFrame with the records or iterator of GeoDataFrames if
+        chunksize is passed.
 
     """
     if not isinstance(path, pathlib.Path):
         path = pathlib.Path(path)
 
     dtypes = {lon_col: float, lat_col: float}
+    if chunksize:
+        if path.suffix not in (".csv", ".txt"):
+            raise ValueError("chunksize is only supported for csv and txt files.")
+        chunks = read_table(path, dtype=dtypes, chunksize=chunksize)
+        return _to_geographic_chunks(
+            chunks, lon_col, lat_col, crs, drop_empty_coords, reset_index
+        )
+
     df = read_table(path, dtype=dtypes)
+
+    return _to_geographic(df, lon_col, lat_col, crs, drop_empty_coords, reset_index)
+
+
+def _to_geographic(
+    df: pd.DataFrame,
+    lon_col: str,
+    lat_col: str,
+    crs: str = "epsg:4326",
+    drop_empty_coords: bool = False,
+    reset_index: bool = True,
+    start: int = 0,
+) -> gpd.GeoDataFrame:
+    """
+    Converts a DataFrame with coordinates to a GeoDataFrame.
+
+    Parameters
+    ----------
+    df : DataFrame
+        DataFrame with the records.
+    lon_col : str
+        Name of the longitude column.
+    lat_col : str
+        Name of the latitude column.
+    crs : str
+        Coordinate reference system with the corresponding EPSG code.
+        Must be in the form epsg:code.
+    drop_empty_coords : bool
+        Whether to remove rows with missing or incomplete coordinates.
+    reset_index : bool
+        Whether to reset the result's index after removing rows with
+        missing or incomplete coordinates.
+    start : int
+        First value of the index when reset_index is True.
+
+    Returns
+    -------
+    gpd.GeoDataFrame
+        GeoDataFrame with the records.
+
+    """
     geometry = gpd.points_from_xy(df[lon_col], df[lat_col])
     gdf = gpd.GeoDataFrame(df, geometry=geometry, crs=crs)
 
@@ -56,10 +112,54 @@ def read_geographic_table(
         gdf = gdf.dropna(how="any", subset=[lon_col, lat_col])
     if reset_index:
         gdf = gdf.reset_index(drop=True)
+        gdf.index += start
 
     return gdf
 
 
+def _to_geographic_chunks(
+    chunks: Iterator[pd.DataFrame],
+    lon_col: str,
+    lat_col: str,
+    crs: str = "epsg:4326",
+    drop_empty_coords: bool = False,
+    reset_index: bool = True,
+) -> Iterator[gpd.GeoDataFrame]:
+    """
+    Converts chunks of a DataFrame with coordinates to GeoDataFrames.
+
+    Parameters
+    ----------
+    chunks : Iterator
+        Iterator of DataFrames with the records.
+    lon_col : str
+        Name of the longitude column.
+    lat_col : str
+        Name of the latitude column.
+    crs : str
+        Coordinate reference system with the corresponding EPSG code.
+        Must be in the form epsg:code.
+    drop_empty_coords : bool
+        Whether to remove rows with missing or incomplete coordinates.
+    reset_index : bool
+        Whether to reset the index after removing rows with missing or
+        incomplete coordinates. The index continues across chunks.
+
+    Yields
+    ------
+    gpd.GeoDataFrame
+        GeoDataFrame with the records of each chunk.
+
+    """
+    start = 0
+    for df in chunks:
+        gdf = _to_geographic(
+            df, lon_col, lat_col, crs, drop_empty_coords, reset_index, start
+        )
+        start += len(gdf)
+        yield gdf
+
+
 def read_table(path: Union[str, pathlib.Path], **kwargs) -> pd.DataFrame:
     """
     Reads tabular data (csv, txt, xls or xlsx).
@@ -1,8 +1,9 @@
 from regi0.taxonomic.local import (
+    Checklist,
     get_checklist_fields,
     get_checklist_fields_multiple,
     is_in_checklist,
     is_in_checklist_multiple,
 )
-from regi0.taxonomic.parsing import get_canonical_name
-from regi0.taxonomic.web import gnr, iucn, speciesplus
+from regi0.taxonomic.parsing import get_canonical_name, parse_names
+from regi0.taxonomic.web import aio, cache, gnr, iucn, speciesplus
@@ -32,3 +32,34 @@ def expand_result(df: pd.DataFrame, names: pd.Series) -> pd.DataFrame:
     df = df.drop(columns=[names.name, "__name"])
 
     return df
+
+
+def build_result(records: list, columns: list = None) -> pd.DataFrame:
+    """
+    Builds a DataFrame from a list of records at once. Building the result
+    once is linear on the number of records, while appending records to a
+    DataFrame one at a time copies the whole DataFrame on every append.
+
+    Parameters
+    ----------
+    records : list
+        List of dictionaries with the fields of each record. Empty
+        dictionaries result in rows with missing values.
+    columns : list
+        Columns that come first in the result. Fields of `records` that
+        are not in `columns` are added afterwards, in the order in which
+        they first appear in `records`. If None, every column keeps that
+        order.
+
+    Returns
+    -------
+    DataFrame
+        DataFrame with one row for each record.
+
+    """
+    df = pd.DataFrame(records, index=pd.RangeIndex(len(records)))
+    if columns is not None:
+        extra_columns = [column for column in df.columns if column not in columns]
+        df = df.reindex(columns=list(columns) + extra_columns)
+
+    return df
@@ -2,21 +2,467 @@
 Functions for local taxonomic verifications.
 """
 import pathlib
+import pickle
 from typing import Union
 
 import numpy as np
 import pandas as pd
 
+from .._helpers import standardize_text
+from ..matching import VocabularyIndex
 from ..readers import read_table
 
+# Number of candidate names that are scored for each name in fuzzy
+# lookups, and number of least frequent n-grams used to find them (see
+# regi0.matching.VocabularyIndex.search).
+FUZZY_N_CANDIDATES = 20
+FUZZY_N_GRAMS = 8
+
+
+class Checklist:
+    """
+    Checklist indexed by species name, to look up many names repeatedly
+    without reading the checklist or merging tables on every lookup.
+
+    Parameters
+    ----------
+    checklist : str, Path or DataFrame
+        Path to table or DataFrame wih checklist information.
+    name_field : str
+        Name of the column in `checklist` with species names. If a name
+        is repeated, only its first row is kept.
+    standardize : bool
+        Whether to also index standardized names (see
+        regi0._helpers.standardize_text), so that names that are not
+        found as they are can still be found after standardization
+        (e.g. regardless of case or accents).
+    source_name : str
+        Name of the column in `checklist` with the source of each row.
+        Set by the merge method. If None, sources cannot be added to
+        the results of lookups.
+
+    """
+
+    def __init__(
+        self,
+        checklist: Union[str, pathlib.Path, pd.DataFrame],
+        name_field: str,
+        standardize: bool = False,
+        source_name: str = None,
+    ):
+        if isinstance(checklist, str):
+            checklist = pathlib.Path(checklist)
+
+        if not isinstance(checklist, pd.DataFrame):
+            checklist = read_table(checklist)
+
+        checklist = checklist.dropna(subset=[name_field])
+        checklist = checklist.drop_duplicates(name_field, ignore_index=True)
+
+        self.data = checklist
+        self.name_field = name_field
+        self.source_name = source_name
+        self.index = pd.Index(checklist[name_field])
+        self.standardize = standardize
+        self._vocabulary_index = None
+        if standardize:
+            names = standardize_text(checklist[name_field])
+            unique = ~names.duplicated()
+            self._standardized_index = pd.Index(names[unique])
+            self._standardized_positions = np.flatnonzero(unique)
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    @classmethod
+    def merge(
+        cls,
+        checklists: list,
+        name_field: str,
+        fields: Union[list, str, tuple] = None,
+        keep_first: bool = True,
+        source_name: str = "source",
+        sources: list = None,
+        standardize: bool = False,
+    ) -> "Checklist":
+        """
+        Merges multiple checklists into a single indexed checklist. Each
+        checklist is read only once, and when a name is found on more
+        than one checklist, the checklist it is taken from is decided
+        when merging instead of on every lookup.
+
+        Parameters
+        ----------
+        checklists : list
+            Paths to tables or DataFrames with checklist information.
+        name_field : str
+            Name of the column in every checklist with species names.
+        fields : list, str or tuple
+            Fields (columns) that will be retrieved from the merged
+            checklist. If passed, rows without values for any of these
+            fields are ignored, so that names are taken from the
+            checklists that have values for them.
+        keep_first : bool
+            Whether to keep the first match from a checklist or use the
+            latest.
+        source_name : str
+            Name of the column with the source of each row.
+        sources : list
+            Source of each checklist. If None, file names without
+            extension are used for paths and positions in `checklists`
+            for DataFrames.
+        standardize : bool
+            Whether to also index standardized names.
+
+        Returns
+        -------
+        Checklist
+            Merged indexed checklist.
+
+        """
+        tables = []
+        for i, checklist in enumerate(checklists):
+            if isinstance(checklist, str):
+                checklist = pathlib.Path(checklist)
+            if sources is not None:
+                source = sources[i]
+            elif isinstance(checklist, pd.DataFrame):
+                source = str(i)
+            else:
+                source = checklist.stem
+            if not isinstance(checklist, pd.DataFrame):
+                checklist = read_table(checklist)
+            tables.append(checklist.assign(**{source_name: source}))
+
+        if not keep_first:
+            tables = tables[::-1]
+        merged = pd.concat(tables, ignore_index=True)
+
+        if fields is not None:
+            if isinstance(fields, str):
+                fields = [fields]
+            present_fields = [field for field in fields if field in merged.columns]
+            merged = merged[merged[present_fields].notna().any(axis=1)]
+
+        return cls(merged, name_field, standardize, source_name)
+
+    def get_positions(self, names: pd.Series) -> np.ndarray:
+        """
+        Finds the row of the checklist of each name.
+
+        Parameters
+        ----------
+        names : Series
+            Series with species names.
+
+        Returns
+        -------
+        array
+            Position of the row of each name in `data`. -1 for names that
+            are not in the checklist.
+
+        """
+        positions = self.index.get_indexer(names)
+        if self.standardize:
+            missing = (positions == -1) & names.notna().to_numpy()
+            if missing.any():
+                found = self._standardized_index.get_indexer(
+                    standardize_text(names[missing])
+                )
+                positions[missing] = np.where(
+                    found == -1, -1, self._standardized_positions[found]
+                )
+
+        return positions
+
+    def get_matches(
+        self,
+        names: pd.Series,
+        scorer: str = "ratio",
+        threshold: float = 0.9,
+    ) -> tuple:
+        """
+        Finds the row of the checklist of each name, falling back to the
+        closest name in the checklist for names that are not found. The
+        n-gram index used to find the closest names is built the first
+        time it is needed and kept for later lookups.
+
+        Parameters
+        ----------
+        names : Series
+            Series with species names.
+        scorer : str
+            Similarity measure. Can be "ratio", "token_set_ratio" or
+            "jaro_winkler".
+        threshold : float
+            Minimum similarity (between 0 and 1) of the closest names.
+
+        Returns
+        -------
+        tuple
+            Position of the row of each name in `data` (-1 for names
+            without any name in the checklist above `threshold`) and the
+            similarity of each name with the name in that row (1 for
+            names that are found as they are).
+
+        """
+        positions = self.get_positions(names)
+        scores = np.where(positions == -1, np.nan, 1.0)
+
+        missing = (positions == -1) & names.notna().to_numpy()
+        if missing.any():
+            if self._vocabulary_index is None:
+                self._vocabulary_index = VocabularyIndex(self.index)
+            matches = self._vocabulary_index.best_match(
+                names[missing],
+                scorer=scorer,
+                threshold=threshold,
+                n_candidates=FUZZY_N_CANDIDATES,
+                n_grams=FUZZY_N_GRAMS,
+            )
+            positions[missing] = self.index.get_indexer(matches["candidate"])
+            scores[missing] = matches["score"]
+
+        return positions, scores
+
+    def get_fields(
+        self,
+        names: Union[list, np.ndarray, pd.Series, str],
+        fields: Union[list, str, tuple],
+        add_supplied_names: bool = False,
+        expand: bool = True,
+        add_source: bool = False,
+        fuzzy: bool = False,
+        scorer: str = "ratio",
+        threshold: float = 0.9,
+    ) -> pd.DataFrame:
+        """
+        Retrieves values for one or multiple fields given some species
+        names.
+
+        Parameters
+        ----------
+        names : list, array, Series or str
+            Scientific name(s) to get results for.
+        fields : list, str or tuple
+            List of fields (columns) to retrieve from the checklist.
+        add_supplied_names : bool
+            Whether to add `names` as an extra column in the result.
+        expand : bool
+            Whether to expand result rows to match `names` size. If False,
+            the number of rows will correspond to the number of unique
+            names in `names`.
+        add_source : bool
+            Whether to add the source of the values as an extra column
+            in the result. Only available for merged checklists.
+        fuzzy : bool
+            Whether to retrieve the values of the closest name in the
+            checklist for names that are not found (e.g. because of a
+            typo). If True, the matched names and their similarity are
+            added as the "matched_name" and "match_score" columns.
+        scorer : str
+            Similarity measure for fuzzy lookups. Can be "ratio",
+            "token_set_ratio" or "jaro_winkler".
+        threshold : float
+            Minimum similarity (between 0 and 1) of the closest names in
+            fuzzy lookups.
+
+        Returns
+        -------
+        DataFrame
+            DataFrame with the values retrieved from the checklist.
+
+        """
+        if isinstance(names, (list, str, np.ndarray)):
+            names = pd.Series(names)
+        if isinstance(fields, str):
+            fields = [fields]
+        fields = list(fields)
+
+        if not expand:
+            names = names.drop_duplicates()
+        names = names.reset_index(drop=True).rename("supplied_name")
+
+        if fuzzy:
+            positions, scores = self.get_matches(names, scorer, threshold)
+        else:
+            positions = self.get_positions(names)
+
+        result = self.data.reindex(
+            index=positions,
+            columns=[field for field in fields if field in self.data.columns],
+        ).reset_index(drop=True)
+        for field in fields:
+            if field not in result.columns:
+                result[field] = pd.NA
+        result = result[fields]
+
+        if fuzzy:
+            result["matched_name"] = self._get_names(positions)
+            result["match_score"] = scores
+        if add_supplied_names:
+            result["supplied_name"] = names
+        if add_source:
+            result[self._get_source_name()] = self._get_sources(positions)
+
+        return result
+
+    def contains(
+        self,
+        names: Union[list, np.ndarray, pd.Series, str],
+        add_supplied_names: bool = False,
+        expand: bool = True,
+        add_source: bool = False,
+    ) -> pd.DataFrame:
+        """
+        Checks whether some species names are found in the checklist.
+
+        Parameters
+        ----------
+        names : list, array, Series or str
+            Scientific name(s) to get results for.
+        add_supplied_names : bool
+            Whether to add `names` as an extra column in the result.
+        expand : bool
+            Whether to expand result rows to match `names` size. If False,
+            the number of rows will correspond to the number of unique
+            names in `names`.
+        add_source : bool
+            Whether to add the source where each name was found as an
+            extra column in the result. Only available for merged
+            checklists.
+
+        Returns
+        -------
+        DataFrame
+            DataFrame with a Boolean Series indicating whether `names` are
+            present in the checklist. If add_supplied_names=True is
+            passed, the result will have an extra column.
+
+        """
+        if isinstance(names, (list, str, np.ndarray)):
+            names = pd.Series(names)
+        names = names.rename("supplied_name")
+
+        if not expand:
+            names = names.drop_duplicates().dropna().reset_index(drop=True)
+        positions = self.get_positions(names)
+        result = pd.Series(positions != -1, index=names.index, name="in_checklist")
+        result = result.astype("boolean")
+        result.loc[names.isna()] = pd.NA
+
+        result = pd.DataFrame(result)
+        if add_supplied_names:
+            result["supplied_name"] = names
+        if add_source:
+            result[self._get_source_name()] = self._get_sources(positions)
+
+        return result
+
+    def _get_source_name(self) -> str:
+        """
+        Gets the name of the column with the source of each row.
+
+        Returns
+        -------
+        str
+            Name of the column.
+
+        """
+        if self.source_name is None:
+            raise ValueError(
+                "Sources are only available for checklists created with "
+                "Checklist.merge."
+            )
+
+        return self.source_name
+
+    def _get_names(self, positions: np.ndarray) -> np.ndarray:
+        """
+        Gets the names of some rows of the checklist.
+
+        Parameters
+        ----------
+        positions : array
+            Positions of the rows in `data`, as returned by get_positions.
+
+        Returns
+        -------
+        array
+            Name of each row. Missing for positions equal to -1.
+
+        """
+        return self.data[self.name_field].reindex(positions).to_numpy()
+
+    def _get_sources(self, positions: np.ndarray) -> np.ndarray:
+        """
+        Gets the sources of some rows of the checklist.
+
+        Parameters
+        ----------
+        positions : array
+            Positions of the rows in `data`, as returned by get_positions.
+
+        Returns
+        -------
+        array
+            Source of each row. Missing for positions equal to -1.
+
+        """
+        sources = self.data[self._get_source_name()]
+
+        return sources.reindex(positions).to_numpy()
+
+    def save(self, path: Union[str, pathlib.Path]) -> None:
+        """
+        Saves the indexed checklist to disk.
+
+        Parameters
+        ----------
+        path : str or Path
+            Path of the file.
+
+        Returns
+        -------
+        None
+
+        """
+        with open(path, "wb") as f:
+            pickle.dump(self, f)
+
+    @classmethod
+    def load(cls, path: Union[str, pathlib.Path]) -> "Checklist":
+        """
+        Loads an indexed checklist saved with the save method.
+
+        Parameters
+        ----------
+        path : str or Path
+            Path of the file.
+
+        Returns
+        -------
+        Checklist
+            Indexed checklist.
+
+        """
+        with open(path, "rb") as f:
+            checklist = pickle.load(f)
+        if not isinstance(checklist, cls):
+            raise ValueError(f"{path} does not contain a {cls.__name__}.")
+
+        return checklist
+
 
 def get_checklist_fields(
     names: Union[list, pd.Series, str],
-    checklist: Union[str, pathlib.Path, pd.DataFrame],
+    checklist: Union[str, pathlib.Path, pd.DataFrame, Checklist],
     name_field: str,
     fields: Union[list, str, tuple],
     add_supplied_names: bool = False,
     expand: bool = True,
+    fuzzy: bool = False,
+    threshold: float = 0.9,
 ) -> pd.DataFrame:
     """
     Retrieves values for one or multiple fields from a checklist given
@@ -26,10 +472,12 @@ def get_checklist_fields(
     ----------
     names : list, array, Series or str
         Scientific name(s) to get results for.
-    checklist : str, Path or DataFrame
-        Path to table or DataFrame wih checklist information.
+    checklist : str, Path, DataFrame or Checklist
+        Path to table, DataFrame wih checklist information or indexed
+        checklist. Indexed checklists are faster for repeated lookups.
     name_field : str
-        Name of the column in `checklist` with species names.
+        Name of the column in `checklist` with species names. Ignored if
+        `checklist` is a Checklist.
     fields : list, str or tuple
         List of fields (columns) to retrieve from `checklist`.
     add_supplied_names : bool
@@ -38,6 +486,15 @@ def get_checklist_fields(
         Whether to expand result rows to match `names` size. If False,
         the number of rows will correspond to the number of unique names
         in `names`.
+    fuzzy : bool
+        Whether to retrieve the values of the closest name in `checklist`
+        for names that are not found (e.g. because of a typo). If True,
+        the matched names and their similarity (between 0 and 1) are
+        added as the "matched_name" and "match_score" columns. Pass a
+        Checklist to reuse its n-gram index across calls.
+    threshold : float
+        Minimum similarity (between 0 and 1) of the closest names in
+        fuzzy lookups.
 
     Returns
     -------
@@ -45,6 +502,19 @@ def get_checklist_fields(
         DataFrame with the values retrieved from `checklist`.
 
     """
+    if fuzzy and not isinstance(checklist, Checklist):
+        checklist = Checklist(checklist, name_field)
+
+    if isinstance(checklist, Checklist):
+        return checklist.get_fields(
+            names,
+            fields,
+            add_supplied_names,
+            expand,
+            fuzzy=fuzzy,
+            threshold=threshold,
+        )
+
     if isinstance(checklist, str):
         checklist = pathlib.Path(checklist)
 
@@ -120,29 +590,20 @@ def get_checklist_fields_multiple(
         DataFrame with the values retrieved from the checklists.
 
     """
-    result = None
-    for fn in filenames:
-        checklist = read_table(fn)
-        temp_result = get_checklist_fields(
-            names, checklist, name_field, fields, add_supplied_names, expand
-        )
-        mask = temp_result[fields].notna().any(axis=1)
-        if add_source:
-            stem = pathlib.Path(fn).stem
-            temp_result.loc[mask, source_name] = stem
-        if result is None:
-            result = temp_result
-        else:
-            if keep_first:
-                mask = result[fields].isna().all(axis=1) & mask
-            result[mask] = temp_result[mask]
+    checklist = Checklist.merge(
+        filenames,
+        name_field,
+        fields=fields,
+        keep_first=keep_first,
+        source_name=source_name,
+    )
 
-    return result
+    return checklist.get_fields(names, fields, add_supplied_names, expand, add_source)
 
 
 def is_in_checklist(
     names: Union[list, np.ndarray, pd.Series, str],
-    checklist: pd.DataFrame,
+    checklist: Union[pd.DataFrame, Checklist],
     name_field: str,
     add_supplied_names: bool = False,
     expand: bool = True,
@@ -155,9 +616,10 @@ def is_in_checklist(
     names : list, array, Series or str
         Scientific name(s) to get results for.
     checklist
-        DataFrame wih checklist information.
+        DataFrame wih checklist information or indexed checklist.
     name_field
-        Name of the column in `checklist` with species names.
+        Name of the column in `checklist` with species names. Ignored if
+        `checklist` is a Checklist.
     add_supplied_names
         Whether to add `names` as an extra column in the result.
     expand
@@ -172,6 +634,9 @@ def is_in_checklist(
         present in `checklist`. If add_supplied_names=True is passed, the
         result will have an extra column.
     """
+    if isinstance(checklist, Checklist):
+        return checklist.contains(names, add_supplied_names, expand)
+
     if isinstance(names, (list, str, np.ndarray)):
         names = pd.Series(names)
     names.name = "supplied_name"
@@ -231,25 +696,22 @@ def is_in_checklist_multiple(
     -------
     pd.DataFrame
         DataFrame with a Boolean Series indicating whether `names` are
-        present in the checklists. If add_supplied_names=True or
-        add_source=True, the result will have extra columns.
+        present in the checklists (of object dtype if there are missing
+        names). If add_supplied_names=True or add_source=True, the result
+        will have extra columns.
 
     """
-    result = None
-    for fn in filenames:
-        checklist = read_table(fn)
-        temp_result = is_in_checklist(
-            names, checklist, name_field, add_supplied_names, expand
-        )
-        mask = temp_result["in_checklist"].fillna(False)
-        if add_source:
-            stem = pathlib.Path(fn).stem
-            temp_result.loc[mask, source_name] = stem
-        if result is None:
-            result = temp_result
-        else:
-            if keep_first:
-                mask = ~result["in_checklist"].fillna(False) & mask
-            result[mask] = temp_result[mask]
+    checklist = Checklist.merge(
+        filenames, name_field, keep_first=keep_first, source_name=source_name
+    )
+    result = checklist.contains(names, add_supplied_names, expand, add_source)
+
+    # Keeps the dtype returned before checklists were merged: bool, or
+    # object when some names are missing.
+    in_checklist = result["in_checklist"]
+    if in_checklist.isna().any():
+        result["in_checklist"] = in_checklist.astype(object)
+    else:
+        result["in_checklist"] = in_checklist.astype(bool)
 
     return result
@@ -1,10 +1,213 @@
 """
 Scientific name parsing functions.
 """
+import functools
+import re
+
+import numpy as np
 import pandas as pd
 
 from ._constants.qualifiers import qualifiers
-from .._helpers import clean_text
+
+# Numbers and special characters removed from names before splitting
+# them in words. Same as regi0._helpers.clean_text.
+_CLEANER = re.compile(r"\d+|[^\w\s]+")
+
+# Words of the abbreviations of Open Nomenclature qualifiers, without
+# periods (e.g. "sp. nov." gives "sp" and "nov").
+_QUALIFIER_WORDS = frozenset(
+    word
+    for abbreviations in qualifiers.values()
+    for abbreviation in abbreviations
+    for word in abbreviation.replace(".", "").split(" ")
+)
+
+
+# Tokens of scientific names: words (including abbreviations ending with
+# a period), years and the punctuation marks that are relevant to tell
+# apart authorships and qualifiers.
+_TOKENIZER = re.compile(
+    r"(?P<year>(?<!\d)\d{4}(?!\d))|(?P<word>[^\W\d][\w.'-]*)|(?P<mark>[()?&,])"
+)
+
+# Abbreviations of Open Nomenclature qualifiers, keyed by their words
+# without periods (e.g. ("sp", "nov") for "sp. nov.").
+_QUALIFIER_SEQUENCES = {
+    tuple(abbreviation.replace(".", "").split(" ")): abbreviation
+    for abbreviations in qualifiers.values()
+    for abbreviation in abbreviations
+}
+_MAX_QUALIFIER_LENGTH = max(map(len, _QUALIFIER_SEQUENCES))
+
+# Infraspecific rank markers and their standard abbreviation.
+_RANKS = {
+    "subsp": "subsp.",
+    "ssp": "subsp.",
+    "var": "var.",
+    "v": "var.",
+    "subvar": "subvar.",
+    "f": "f.",
+    "fo": "f.",
+    "forma": "f.",
+}
+
+# Maximum number of parsed names to keep in memory.
+PARSE_CACHE_SIZE = 100_000
+
+PARSE_COLUMNS = [
+    "genus",
+    "specific_epithet",
+    "infraspecific_rank",
+    "infraspecific_epithet",
+    "authorship",
+    "year",
+    "qualifiers",
+    "canonical_name",
+]
+
+
+def _match_qualifier(tokens: list, i: int, min_length: int = 1) -> tuple:
+    """
+    Finds the longest qualifier abbreviation starting at a token.
+
+    Parameters
+    ----------
+    tokens : list
+        Tokens of a name as (kind, text, start) tuples.
+    i : int
+        Position of the token.
+    min_length : int
+        Minimum number of words of the qualifier.
+
+    Returns
+    -------
+    tuple
+        Qualifier abbreviation and its number of tokens. (None, 0) if
+        there is no qualifier starting at the token.
+
+    """
+    words = []
+    for kind, text, _ in tokens[i : i + _MAX_QUALIFIER_LENGTH]:
+        # Qualifiers are lowercase, which avoids taking author initials
+        # (e.g. L. for Linnaeus) as qualifiers.
+        if kind == "year" or (i and kind == "word" and not text[0].islower()):
+            break
+        words.append(text.replace(".", "").lower())
+    for length in range(len(words), min_length - 1, -1):
+        qualifier = _QUALIFIER_SEQUENCES.get(tuple(words[:length]))
+        if qualifier is not None:
+            return qualifier, length
+
+    return None, 0
+
+
+@functools.lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _parse_name(name: str) -> tuple:
+    """
+    Parses a single scientific name into its components. Tokens are
+    consumed by a state machine that goes from the genus, to the specific
+    epithet, to the infraspecific rank and epithet and finally to the
+    authorship. Qualifiers can appear anywhere before the authorship.
+
+    Parameters
+    ----------
+    name : str
+        Scientific name.
+
+    Returns
+    -------
+    tuple
+        Values of each column in PARSE_COLUMNS.
+
+    """
+    if name.isupper():
+        name = name.lower()
+    tokens = [
+        (match.lastgroup, match.group(), match.start())
+        for match in _TOKENIZER.finditer(name)
+    ]
+
+    parts = dict.fromkeys(PARSE_COLUMNS)
+    found_qualifiers = []
+    state = "genus"
+    i = 0
+    while i < len(tokens):
+        kind, text, _ = tokens[i]
+
+        if state == "infraspecies" and kind == "word":
+            # Infraspecific ranks are also qualifiers (e.g. "var."), so
+            # they are taken as ranks unless they start a longer
+            # qualifier (e.g. "ssp. nov.").
+            rank = _RANKS.get(text.replace(".", "").lower())
+            if rank is not None and _match_qualifier(tokens, i, 2)[0] is None:
+                parts["infraspecific_rank"] = rank
+                state = "infraspecific_epithet"
+                i += 1
+                continue
+        qualifier, length = _match_qualifier(tokens, i)
+        if qualifier is not None:
+            found_qualifiers.append(qualifier)
+            i += length
+            continue
+
+        # Anything other than a lowercase word after the genus starts the
+        # authorship.
+        if kind != "word" or (state != "genus" and not text[0].islower()):
+            break
+        i += 1
+        if state == "genus":
+            parts["genus"] = text.rstrip(".").capitalize()
+            state = "epithet"
+        elif state == "epithet":
+            parts["specific_epithet"] = text.rstrip(".")
+            state = "infraspecies"
+        else:
+            parts["infraspecific_epithet"] = text.rstrip(".")
+            break
+
+    if i < len(tokens):
+        start = tokens[i][2]
+        parts["authorship"] = name[start:].strip(" ,") or None
+        years = [text for kind, text, _ in tokens[i:] if kind == "year"]
+        if years:
+            parts["year"] = int(years[0])
+    if found_qualifiers:
+        parts["qualifiers"] = "|".join(found_qualifiers)
+    words = [
+        parts["genus"],
+        parts["specific_epithet"],
+        parts["infraspecific_rank"],
+        parts["infraspecific_epithet"],
+    ]
+    if parts["genus"]:
+        parts["canonical_name"] = " ".join(word for word in words if word)
+
+    return tuple(parts.values())
+
+
+def _get_canonical_name(name) -> str:
+    """
+    Extracts the canonical name (genus and specific epithet) of a single
+    scientific name.
+
+    Parameters
+    ----------
+    name : str
+        Scientific name.
+
+    Returns
+    -------
+    str
+        Canonical name. Empty if `name` is not a string.
+
+    """
+    if not isinstance(name, str):
+        return ""
+
+    words = " ".join(_CLEANER.sub("", name).split()).capitalize().split()
+    words = [word for word in words if word not in _QUALIFIER_WORDS]
+
+    return " ".join(words[:2])
 
 
 def get_canonical_name(names: pd.Series) -> pd.Series:
@@ -12,7 +215,8 @@ def get_canonical_name(names: pd.Series) -> pd.Series:
     Extracts the canonical name (genus and specific epithet) of a Series
     of scientific names. It does this by removing special characters,
     numbers and Open Nomenclature qualifiers (such as aff. or cf.) and
-    then taking the first two words.
+    then taking the first two words. Each unique name is only parsed
+    once.
 
     Parameters
     ----------
@@ -25,14 +229,51 @@ def get_canonical_name(names: pd.Series) -> pd.Series:
         Series with the extracted canonical names.
 
     """
-    names = clean_text(names)
-    names = names.str.capitalize()
+    codes, uniques = pd.factorize(names)
+    canonical_names = [_get_canonical_name(name) for name in uniques]
+    # Missing values have code -1, which takes the result for a missing
+    # name appended at the end.
+    canonical_names = np.array(canonical_names + [""], dtype=object)
+
+    return pd.Series(canonical_names.take(codes), index=names.index, dtype=object)
+
+
+def parse_names(names: pd.Series) -> pd.DataFrame:
+    """
+    Parses scientific names into their components: genus, specific
+    epithet, infraspecific rank and epithet, authorship, year and Open
+    Nomenclature qualifiers (such as aff. or cf.). Each unique name is
+    only parsed once, and the most recently parsed names (up to
+    PARSE_CACHE_SIZE names) are cached across calls.
+
+    Epithets are expected to be lowercase, so the first capitalized word
+    or parenthesis after the genus starts the authorship. Names written
+    entirely in uppercase are converted to lowercase before parsing.
+
+    Parameters
+    ----------
+    names : Series
+        Series with the scientific names.
 
-    abbreviations = pd.Series(sum(qualifiers.values(), []))
-    abbreviations = abbreviations.str.replace(".", "", regex=False)
-    abbreviations = pd.unique(abbreviations.str.split(" ", expand=True).stack())
-    names = names.str.split(" ", expand=True).replace(abbreviations, pd.NA)
-    names = names.apply(lambda x: x.str.cat(sep=" "), axis=1)
-    names = clean_text(names)
+    Returns
+    -------
+    DataFrame
+        DataFrame with the same index as `names` and the columns
+        "genus", "specific_epithet", "infraspecific_rank",
+        "infraspecific_epithet", "authorship", "year", "qualifiers"
+        (joined by "|") and "canonical_name" (the genus, the epithets and
+        the infraspecific rank).
+
+    """
+    codes, uniques = pd.factorize(names)
+    results = [
+        _parse_name(name) if isinstance(name, str) else (None,) * len(PARSE_COLUMNS)
+        for name in uniques
+    ]
+    # Missing values have code -1, which takes the empty row appended at
+    # the end.
+    results.append((None,) * len(PARSE_COLUMNS))
+    df = pd.DataFrame.from_records(results, columns=PARSE_COLUMNS).fillna(np.nan)
+    df = df.astype({"year": "Int64"})
 
-    return names.str.split(" ").str[:2].str.join(" ")
+    return df.take(codes).set_axis(names.index)
@@ -0,0 +1,608 @@
+"""
+Asynchronous counterparts of the GNR, IUCN and Species+/CITES checklist
+API wrappers, for use inside an asyncio event loop. Requires aiohttp,
+which can be installed with: pip install regi0[aio]
+
+Every function accepts an optional aiohttp.ClientSession to reuse
+connections across calls. If no session is passed, one is created and
+closed within the call. The number of requests sent at the same time is
+bounded by `max_concurrency`. Results are the same as the ones of the
+synchronous versions.
+"""
+import asyncio
+import contextlib
+import warnings
+from typing import Union
+from urllib.parse import urljoin
+
+import numpy as np
+import pandas as pd
+
+from . import cache, gnr, iucn, speciesplus
+from .._helpers import build_result, expand_result
+from ... import http
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+
+def _check_aiohttp() -> None:
+    """
+    Checks that aiohttp is installed.
+
+    Returns
+    -------
+    None
+
+    """
+    if aiohttp is None:
+        raise ImportError(
+            "aiohttp is required for regi0.taxonomic.web.aio. Install it with "
+            "pip install regi0[aio]."
+        )
+
+
+@contextlib.asynccontextmanager
+async def _get_session(session=None, max_concurrency: int = 8):
+    """
+    Yields `session` or, if it is None, a new session that is closed on
+    exit.
+
+    Parameters
+    ----------
+    session : aiohttp.ClientSession
+        Session to use.
+    max_concurrency : int
+        Maximum number of connections of the new session.
+
+    Yields
+    ------
+    aiohttp.ClientSession
+        Session.
+
+    """
+    _check_aiohttp()
+    if session is not None:
+        yield session
+    else:
+        connector = aiohttp.TCPConnector(limit=max_concurrency)
+        async with aiohttp.ClientSession(connector=connector) as session:
+            yield session
+
+
+async def _gather(func, items, max_concurrency: int = 8) -> list:
+    """
+    Awaits a coroutine function for multiple items, with at most
+    `max_concurrency` of them running at the same time.
+
+    Parameters
+    ----------
+    func : callable
+        Coroutine function to call with each item.
+    items : iterable
+        Items to call `func` with.
+    max_concurrency : int
+        Maximum number of coroutines running at the same time.
+
+    Returns
+    -------
+    list
+        Result of `func` for each item, in the same order as `items`.
+
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def call(item):
+        async with semaphore:
+            return await func(item)
+
+    return await asyncio.gather(*(call(item) for item in items))
+
+
+async def _fetch(endpoint: str, query: str, params: dict, func):
+    """
+    Asynchronous version of regi0.taxonomic.web.cache.fetch. Cache
+    lookups and writes may block (e.g. on disk), so they run in the
+    default executor instead of the event loop.
+
+    Parameters
+    ----------
+    endpoint : str
+        API endpoint.
+    query : str
+        Queried value (e.g. a scientific name or a taxon concept ID).
+    params : dict
+        Request parameters. Must not include authentication tokens.
+    func : callable
+        Coroutine function without arguments that calls the API and
+        returns a JSON serializable response.
+
+    Returns
+    -------
+    object
+        Response. None if offline mode is enabled and the response is not
+        cached.
+
+    """
+    web_cache = cache.get_cache()
+    if web_cache is None:
+        return await func()
+
+    loop = asyncio.get_running_loop()
+    key = cache.make_key(endpoint, query, params)
+    value = await loop.run_in_executor(None, web_cache.get, key)
+    if value is None:
+        if cache.is_offline():
+            warnings.warn(f"No cached response for {query} in offline mode.")
+            return None
+        value = await func()
+        await loop.run_in_executor(None, web_cache.set, key, value)
+
+    return value
+
+
+async def resolve(
+    names: Union[list, np.ndarray, pd.Series, str],
+    data_source_ids: list = None,
+    resolve_once: bool = False,
+    best_match_only: bool = False,
+    with_context: bool = False,
+    with_vernaculars: bool = False,
+    with_canonical_ranks: bool = False,
+    expand: bool = True,
+    batch_size: int = 1000,
+    max_concurrency: int = 4,
+    max_retries: int = 3,
+    backoff_factor: float = 1.0,
+    session=None,
+) -> pd.DataFrame:
+    """
+    Asynchronous version of regi0.taxonomic.gnr.resolve.
+
+    Parameters
+    ----------
+    names : list, array, Series or str
+        Scientific name(s) to get results for.
+    data_source_ids : list
+        List of specific data sources IDs to resolve against.
+    resolve_once : bool
+        Find the first available match instead of matches across all data
+        sources with all possible renderings of a name.
+    best_match_only : bool
+        Returns just one result with the highest score.
+    with_context : bool
+        Reduce the likelihood of matches to taxonomic homonyms. The
+        context is calculated for each batch of names, so results are not
+        cached (see regi0.taxonomic.web.cache) when True.
+    with_vernaculars : bool
+        Return 'vernacular' field to present common names provided by a
+        data source for a particular match.
+    with_canonical_ranks : bool
+        Returns 'canonical_form' with infraspecific ranks, if they are
+        present.
+    expand : bool
+        Whether to expand result rows to match `names` size. Only has
+        effect if best_match_only=True.
+    batch_size : int
+        Maximum number of names to send in each request.
+    max_concurrency : int
+        Maximum number of requests to send at the same time.
+    max_retries : int
+        Maximum number of times to retry a failed request. Only connection
+        errors, timeouts and responses with a status code in
+        regi0.http.RETRY_STATUS_CODES are retried.
+    backoff_factor : float
+        Factor to compute the time (in seconds) to wait before each retry.
+        The n-th retry waits backoff_factor * 2 ** (n - 1) seconds.
+    session : aiohttp.ClientSession
+        Session to send requests with. If None, a new one is used.
+
+    Returns
+    -------
+    DataFrame
+        DataFrame where rows are the result for each match.
+
+    """
+    if isinstance(names, (list, str, np.ndarray)):
+        names = pd.Series(names)
+
+    unique_names = names.dropna().unique()
+    params = gnr._get_params(
+        data_source_ids,
+        resolve_once,
+        best_match_only,
+        with_context,
+        with_vernaculars,
+        with_canonical_ranks,
+    )
+    # With context, the result for a name depends on the rest of the names
+    # in its batch, so it cannot be cached under a per-name key. Cache
+    # lookups and writes may block, so they run in the default executor.
+    cacheable = not with_context
+    loop = asyncio.get_running_loop()
+    items, missing_names = await loop.run_in_executor(
+        None, gnr._get_cached_items, unique_names, params, cacheable
+    )
+
+    batches = [
+        {"data": "\n".join(missing_names[i : i + batch_size]), **params}
+        for i in range(0, len(missing_names), batch_size)
+    ]
+    if not items and not batches:
+        batches = [{"data": "", **params}]
+
+    async with _get_session(session, max_concurrency) as session:
+
+        async def post(batch_params):
+            for attempt in range(max_retries + 1):
+                retry = attempt < max_retries
+                try:
+                    async with session.post(gnr.API_URL, json=batch_params) as response:
+                        if response.status < 400:
+                            return (await response.json(content_type=None))["data"]
+                        if not (retry and response.status in http.RETRY_STATUS_CODES):
+                            raise Exception(
+                                "Error calling Global Name Resolver API. "
+                                f"{response.status} {response.reason}"
+                            )
+                except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                    if not retry:
+                        raise
+                await asyncio.sleep(backoff_factor * 2 ** attempt)
+
+        batches = await _gather(post, batches, max_concurrency)
+
+    data = [item for batch in batches for item in batch]
+    data = await loop.run_in_executor(
+        None,
+        gnr._merge_cached_items,
+        items,
+        missing_names,
+        data,
+        unique_names,
+        params,
+        cacheable,
+    )
+
+    return gnr._parse_resolve(data, names, best_match_only, expand)
+
+
+async def get_classification(
+    names: Union[list, np.ndarray, pd.Series, str],
+    add_supplied_names: bool = False,
+    add_source: bool = False,
+    expand: bool = True,
+    **kwargs,
+) -> pd.DataFrame:
+    """
+    Asynchronous version of regi0.taxonomic.gnr.get_classification.
+
+    Parameters
+    ----------
+    names : list, array, Series or str
+        Scientific name(s) to get results for.
+    add_supplied_names : bool
+        Add supplied scientific names to the resulting DataFrame.
+    add_source : bool
+        Add source column to the resulting DataFrame.
+    expand : bool
+        Whether to expand result rows to match `names` size. Only has
+        effect if best_match_only=True.
+    **kwargs
+        Keyword arguments of the resolve function.
+
+    Returns
+    -------
+    DataFrame
+        DataFrame with the ranks for each match.
+
+    """
+    if isinstance(names, (list, str, np.ndarray)):
+        names = pd.Series(names)
+
+    result = await resolve(names, expand=expand, **kwargs)
+
+    return gnr._parse_classification(result, add_supplied_names, add_source)
+
+
+async def get_species_info(
+    names: Union[list, np.ndarray, pd.Series, str],
+    token: str,
+    add_supplied_names: bool = False,
+    expand: bool = True,
+    max_concurrency: int = 8,
+    session=None,
+) -> pd.DataFrame:
+    """
+    Asynchronous version of regi0.taxonomic.iucn.get_species_info.
+
+    Parameters
+    ----------
+    names : list, array, Series or str
+        Scientific name(s) to get results for.
+    token : str
+        IUCN API authentication token.
+    add_supplied_names : bool
+        Add supplied scientific names to the resulting DataFrame.
+    expand : bool
+        Whether to expand result rows to match `names` size.
+    max_concurrency : int
+        Maximum number of requests to send at the same time.
+    session : aiohttp.ClientSession
+        Session to send requests with. If None, a new one is used.
+
+    Returns
+    -------
+    DataFrame
+        DataFrame with IUCN species information for each name.
+
+    """
+    if isinstance(names, (list, str, np.ndarray)):
+        names = pd.Series(names)
+
+    endpoint = urljoin(iucn.API_URL, "species/")
+    unique_names = names.dropna().unique()
+
+    async with _get_session(session, max_concurrency) as session:
+
+        async def request(name):
+            url = urljoin(endpoint, name)
+            async with session.get(url, params={"token": token}) as response:
+                if response.status >= 400:
+                    raise Exception(
+                        f"Error calling IUCN API. {response.status} {response.reason}"
+                    )
+                data = await response.json(content_type=None)
+            if "message" in data:
+                raise Exception(f"Error calling IUCN API. {data['message']}")
+            return data
+
+        async def get_result(name):
+            data = await _fetch(endpoint, name, None, lambda: request(name))
+            return iucn._parse_species_info(data or {})
+
+        results = await _gather(get_result, unique_names, max_concurrency)
+
+    df = build_result(results)
+    if add_supplied_names:
+        df["supplied_name"] = unique_names
+    if expand:
+        df = expand_result(df, names)
+
+    return df
+
+
+async def _get_speciesplus(
+    session,
+    url: str,
+    query: str,
+    token: str,
+    params: dict = None,
+    missing_ok: bool = False,
+):
+    """
+    Gets the content of a response from the Species+/CITES checklist API.
+    If caching is enabled (see regi0.taxonomic.web.cache), the response
+    is looked up in the cache first.
+
+    Parameters
+    ----------
+    session : aiohttp.ClientSession
+        Session to send the request with.
+    url : str
+        Species+/CITES checklist API endpoint.
+    query : str
+        Queried value (i.e. a scientific name or a taxon concept ID).
+    token : str
+        Species+/CITES checklist API authentication token.
+    params : dict
+        Request parameters.
+    missing_ok : bool
+        Whether to return None when the API returns an internal server
+        error, which it does for unknown taxon concept IDs. If False, an
+        exception is raised as for any other error.
+
+    Returns
+    -------
+    list or dict
+        Response content. None if the taxon concept does not exist and
+        `missing_ok` is True or if offline mode is enabled and the
+        response is not cached.
+
+    """
+    headers = {"X-Authentication-Token": token}
+
+    async def request():
+        async with session.get(url, params=params, headers=headers) as response:
+            if missing_ok and response.status == 500:
+                return None
+            response.raise_for_status()
+            return await response.json(content_type=None)
+
+    return await _fetch(url, query, params, request)
+
+
+async def get_distributions(
+    ids: Union[float, int, list, pd.Series, str],
+    token: str,
+    language: str = "EN",
+    add_supplied_ids: bool = False,
+    expand: bool = True,
+    max_concurrency: int = 8,
+    session=None,
+) -> pd.DataFrame:
+    """
+    Asynchronous version of regi0.taxonomic.speciesplus.get_distributions.
+
+    Parameters
+    ----------
+    ids : float, int, list, pd.Series, str
+        Taxon concept ID(s) to get results for.
+    token : str
+        Species+/CITES checklist API authentication token.
+    language : str
+        Language for the names of distributions. Can be "EN", "ES" or "FR".
+    add_supplied_ids : bool
+        Add supplied taxon_concept_ids to the resulting DataFrame.
+    expand : bool
+        Whether to expand result rows to match `ids` size.
+    max_concurrency : int
+        Maximum number of requests to send at the same time.
+    session : aiohttp.ClientSession
+        Session to send requests with. If None, a new one is used.
+
+    Returns
+    -------
+    DataFrame
+        DataFrame with distributions information.
+
+    """
+    if isinstance(ids, (float, int, list, str)):
+        ids = pd.Series(ids)
+
+    unique_ids = ids.dropna().unique()
+
+    async with _get_session(session, max_concurrency) as session:
+
+        async def get_result(_id):
+            endpoint = urljoin(
+                speciesplus.API_URL, f"taxon_concepts/{int(_id)}/distributions"
+            )
+            data = await _get_speciesplus(
+                session, endpoint, int(_id), token, {"language": language}, True
+            )
+            return speciesplus._parse_distributions(data)
+
+        results = await _gather(get_result, unique_ids, max_concurrency)
+
+    df = build_result(results)
+    if add_supplied_ids:
+        df["supplied_id"] = unique_ids
+    if expand:
+        df = expand_result(df, ids)
+
+    return df
+
+
+async def get_references(
+    ids: Union[float, int, list, pd.Series, str],
+    token: str,
+    add_supplied_ids: bool = False,
+    expand: bool = True,
+    max_concurrency: int = 8,
+    session=None,
+) -> pd.DataFrame:
+    """
+    Asynchronous version of regi0.taxonomic.speciesplus.get_references.
+
+    Parameters
+    ----------
+    ids : float, int, list, pd.Series, str
+        Taxon concept ID(s) to get results for.
+    token : str
+        Species+/CITES checklist API authentication token.
+    add_supplied_ids : bool
+        Add supplied taxon_concept_ids to the resulting DataFrame.
+    expand : bool
+        Whether to expand result rows to match `ids` size.
+    max_concurrency : int
+        Maximum number of requests to send at the same time.
+    session : aiohttp.ClientSession
+        Session to send requests with. If None, a new one is used.
+
+    Returns
+    -------
+    DataFrame
+        DataFrame with references information.
+
+    """
+    if isinstance(ids, (float, int, list, str)):
+        ids = pd.Series(ids)
+
+    unique_ids = ids.dropna().unique()
+
+    async with _get_session(session, max_concurrency) as session:
+
+        async def get_result(_id):
+            endpoint = urljoin(
+                speciesplus.API_URL, f"taxon_concepts/{int(_id)}/references"
+            )
+            data = await _get_speciesplus(
+                session, endpoint, int(_id), token, missing_ok=True
+            )
+            return speciesplus._parse_references(data)
+
+        results = await _gather(get_result, unique_ids, max_concurrency)
+
+    df = build_result(results)
+    if add_supplied_ids:
+        df["supplied_id"] = unique_ids
+    if expand:
+        df = expand_result(df, ids)
+
+    return df
+
+
+async def get_taxon_concept(
+    names: Union[list, np.ndarray, pd.Series, str],
+    token: str,
+    language: Union[str, list] = "EN",
+    add_supplied_names: bool = False,
+    expand: bool = True,
+    max_concurrency: int = 8,
+    session=None,
+) -> pd.DataFrame:
+    """
+    Asynchronous version of regi0.taxonomic.speciesplus.get_taxon_concept.
+
+    Parameters
+    ----------
+    names : list, array, Series or str
+        Scientific name(s) to get results for.
+    token : str
+        Species+/CITES checklist API authentication token.
+    language : str or list
+        One or multiple ISO 639-1 codes used to filter languages returned
+        for common names.
+    add_supplied_names : bool
+        Add supplied scientific names to the resulting DataFrame.
+    expand : bool
+        Whether to expand result rows to match `names` size.
+    max_concurrency : int
+        Maximum number of requests to send at the same time.
+    session : aiohttp.ClientSession
+        Session to send requests with. If None, a new one is used.
+
+    Returns
+    -------
+    DataFrame
+        DataFrame with taxon concept information.
+
+    """
+    if isinstance(names, (list, str, np.ndarray)):
+        names = pd.Series(names)
+
+    if isinstance(language, str):
+        language = [language]
+
+    endpoint = urljoin(speciesplus.API_URL, "taxon_concepts")
+    unique_names = names.dropna().unique()
+
+    async with _get_session(session, max_concurrency) as session:
+
+        async def get_result(name):
+            params = {"name": name, "language": ",".join(language)}
+            data = await _get_speciesplus(session, endpoint, name, token, params)
+            return speciesplus._parse_taxon_concept(data)
+
+        results = await _gather(get_result, unique_names, max_concurrency)
+
+    df = build_result(results, speciesplus.TAXON_CONCEPT_COLUMNS)
+    if add_supplied_names:
+        df["supplied_name"] = unique_names
+    if expand:
+        df = expand_result(df, names)
+
+    return df
@@ -0,0 +1,358 @@
+"""
+Persistent cache of web API responses.
+
+The cache is disabled by default. Once enabled with the enable function,
+every wrapper in regi0.taxonomic.web looks up responses in the cache
+before calling its API and stores the responses it gets. In offline mode,
+responses are only served from the cache and APIs are never called.
+
+Any object with get(key) and set(key, value) methods can be used as a
+cache, where keys are strings and values are JSON serializable objects.
+"""
+import json
+import pathlib
+import sqlite3
+import threading
+import time
+import warnings
+from typing import Any, Callable, Union
+
+import appdirs
+
+CACHE_PATH = pathlib.Path(appdirs.user_cache_dir("regi0")).joinpath("web.sqlite")
+
+_cache = None
+_offline = False
+
+
+class SQLiteCache:
+    """
+    On-disk cache of web API responses backed by a SQLite database.
+    Entries are evicted in least recently used order once the cache
+    exceeds its size budget.
+
+    Parameters
+    ----------
+    path : str or Path
+        Path of the SQLite database. If None, CACHE_PATH is used.
+    ttl : float
+        Time to live of the entries in seconds. Expired entries are
+        treated as missing. If None, entries never expire.
+    max_bytes : int
+        Approximate maximum number of bytes the cached responses can take.
+
+    """
+
+    def __init__(
+        self,
+        path: Union[str, pathlib.Path] = None,
+        ttl: float = None,
+        max_bytes: int = 256 * 1024 ** 2,
+    ):
+        if path is None:
+            path = CACHE_PATH
+        path = pathlib.Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, "
+                "value TEXT NOT NULL, "
+                "size INTEGER NOT NULL, "
+                "created_at REAL NOT NULL, "
+                "accessed_at REAL NOT NULL)"
+            )
+        # Running total of the cached bytes, so that writes do not have to
+        # sum the sizes of every entry to check the budget.
+        self._nbytes = self._get_nbytes()
+
+    def _get_nbytes(self) -> int:
+        """
+        Gets the number of bytes taken by every cached response.
+
+        Returns
+        -------
+        int
+            Number of bytes.
+
+        """
+        query = "SELECT COALESCE(SUM(size), 0) FROM responses"
+        return self._connection.execute(query).fetchone()[0]
+
+    def __len__(self) -> int:
+        with self._lock:
+            query = "SELECT COUNT(*) FROM responses"
+            return self._connection.execute(query).fetchone()[0]
+
+    def get(self, key: str) -> Any:
+        """
+        Gets a cached response.
+
+        Parameters
+        ----------
+        key : str
+            Cache key.
+
+        Returns
+        -------
+        object
+            Cached response. None if the key is not cached or if its entry
+            expired.
+
+        """
+        now = time.time()
+        with self._lock, self._connection:
+            row = self._connection.execute(
+                "SELECT value, created_at, size FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None and self.ttl is not None and now - row[1] > self.ttl:
+                self._connection.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._nbytes -= row[2]
+                row = None
+            if row is None:
+                self._misses += 1
+                return None
+            self._connection.execute(
+                "UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key)
+            )
+            self._hits += 1
+
+        return json.loads(row[0])
+
+    def set(self, key: str, value: Any) -> None:
+        """
+        Caches a response.
+
+        Parameters
+        ----------
+        key : str
+            Cache key.
+        value : object
+            JSON serializable response.
+
+        Returns
+        -------
+        None
+
+        """
+        now = time.time()
+        value = json.dumps(value)
+        with self._lock, self._connection:
+            row = self._connection.execute(
+                "SELECT size FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            self._connection.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?)",
+                (key, value, len(value), now, now),
+            )
+            self._nbytes += len(value) - (row[0] if row is not None else 0)
+            if self._nbytes > self.max_bytes:
+                self._evict()
+
+    def _evict(self) -> None:
+        """
+        Removes the least recently used entries until the cache is within
+        its bytes budget. The running total of cached bytes is computed
+        again first, as other processes may share the same database.
+
+        Returns
+        -------
+        None
+
+        """
+        nbytes = self._get_nbytes()
+        if nbytes <= self.max_bytes:
+            self._nbytes = nbytes
+            return
+
+        rows = self._connection.execute(
+            "SELECT key, size FROM responses ORDER BY accessed_at"
+        ).fetchall()
+        keys = []
+        for key, size in rows[:-1]:
+            if nbytes <= self.max_bytes:
+                break
+            keys.append((key,))
+            nbytes -= size
+        self._connection.executemany("DELETE FROM responses WHERE key = ?", keys)
+        self._evictions += len(keys)
+        self._nbytes = nbytes
+
+    def clear(self) -> None:
+        """
+        Removes every entry from the cache and resets its statistics.
+
+        Returns
+        -------
+        None
+
+        """
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM responses")
+            self._nbytes = 0
+            self._hits = 0
+            self._misses = 0
+            self._evictions = 0
+
+    def stats(self) -> dict:
+        """
+        Gets the cache statistics.
+
+        Returns
+        -------
+        dict
+            Number of hits, misses, evictions, cached responses and cached
+            bytes.
+
+        """
+        with self._lock:
+            entries, nbytes = self._connection.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "entries": entries,
+                "nbytes": nbytes,
+            }
+
+
+def enable(cache=None, offline: bool = False) -> None:
+    """
+    Enables caching of web API responses.
+
+    Parameters
+    ----------
+    cache : object
+        Cache to use. Must have get(key) and set(key, value) methods. If
+        None, a SQLiteCache saved in CACHE_PATH is used.
+    offline : bool
+        Whether to serve responses only from the cache. Names that are not
+        cached get an empty result and a warning is issued.
+
+    Returns
+    -------
+    None
+
+    """
+    global _cache, _offline
+    if cache is None:
+        cache = SQLiteCache()
+    _cache = cache
+    _offline = offline
+
+
+def disable() -> None:
+    """
+    Disables caching of web API responses.
+
+    Returns
+    -------
+    None
+
+    """
+    global _cache, _offline
+    _cache = None
+    _offline = False
+
+
+def get_cache():
+    """
+    Gets the cache in use.
+
+    Returns
+    -------
+    object
+        Cache in use. None if caching is disabled.
+
+    """
+    return _cache
+
+
+def is_offline() -> bool:
+    """
+    Checks whether offline mode is enabled.
+
+    Returns
+    -------
+    bool
+        Whether offline mode is enabled.
+
+    """
+    return _offline
+
+
+def make_key(endpoint: str, query: str, params: dict = None) -> str:
+    """
+    Creates the cache key of a request. Whitespace in the query is
+    normalized so that equivalent names share the same entry.
+
+    Parameters
+    ----------
+    endpoint : str
+        API endpoint.
+    query : str
+        Queried value (e.g. a scientific name or a taxon concept ID).
+    params : dict
+        Request parameters. Must not include authentication tokens.
+
+    Returns
+    -------
+    str
+        Cache key.
+
+    """
+    query = " ".join(str(query).split())
+    params = json.dumps(params or {}, sort_keys=True)
+
+    return f"{endpoint}|{query}|{params}"
+
+
+def fetch(endpoint: str, query: str, params: dict, func: Callable[[], Any]) -> Any:
+    """
+    Gets a response from the cache or by calling `func` if it is not
+    cached. When caching is disabled, `func` is always called.
+
+    Parameters
+    ----------
+    endpoint : str
+        API endpoint.
+    query : str
+        Queried value (e.g. a scientific name or a taxon concept ID).
+    params : dict
+        Request parameters. Must not include authentication tokens.
+    func : callable
+        Function without arguments that calls the API and returns a JSON
+        serializable response.
+
+    Returns
+    -------
+    object
+        Response. None if offline mode is enabled and the response is not
+        cached.
+
+    """
+    if _cache is None:
+        return func()
+
+    key = make_key(endpoint, query, params)
+    value = _cache.get(key)
+    if value is None:
+        if _offline:
+            warnings.warn(f"No cached response for {query} in offline mode.")
+            return None
+        value = func()
+        _cache.set(key, value)
+
+    return value
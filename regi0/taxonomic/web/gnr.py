@@ -3,6 +3,8 @@ Wrappers for GNR API calls and derived functions.
 
 API documentation can be found at: http://resolver.globalnames.org/api
 """
+import concurrent.futures
+import time
 import warnings
 from typing import Union
 
@@ -10,11 +12,289 @@ import numpy as np
 import pandas as pd
 import requests
 
+from . import cache
 from .._helpers import expand_result
+from ... import http
 
 API_URL = "http://resolver.globalnames.org/name_resolvers.json"
 
 
+def _post(params: dict, max_retries: int = 3, backoff_factor: float = 1.0) -> list:
+    """
+    Sends a request to the GNR API, retrying failed requests with an
+    exponential backoff.
+
+    Parameters
+    ----------
+    params : dict
+        Request parameters.
+    max_retries : int
+        Maximum number of times to retry a failed request. Only connection
+        errors, timeouts and responses with a status code in
+        regi0.http.RETRY_STATUS_CODES are retried.
+    backoff_factor : float
+        Factor to compute the time (in seconds) to wait before each retry.
+        The n-th retry waits backoff_factor * 2 ** (n - 1) seconds.
+
+    Returns
+    -------
+    list
+        Data items of the response.
+
+    """
+    for attempt in range(max_retries + 1):
+        try:
+            response = http.get_session().post(API_URL, json=params)
+            response.raise_for_status()
+            return response.json()["data"]
+        except (
+            requests.exceptions.ConnectionError,
+            requests.exceptions.Timeout,
+            requests.exceptions.HTTPError,
+        ) as err:
+            is_http_error = isinstance(err, requests.exceptions.HTTPError)
+            retry = attempt < max_retries
+            if is_http_error:
+                retry = retry and err.response.status_code in http.RETRY_STATUS_CODES
+            if not retry:
+                if is_http_error:
+                    raise Exception(f"Error calling Global Name Resolver API. {err}")
+                raise
+            time.sleep(backoff_factor * 2 ** attempt)
+
+
+def _get_params(
+    data_source_ids: list,
+    resolve_once: bool,
+    best_match_only: bool,
+    with_context: bool,
+    with_vernaculars: bool,
+    with_canonical_ranks: bool,
+) -> dict:
+    """
+    Creates the parameters of a request to the GNR API, except for the
+    names. See the resolve function for a description of each parameter.
+
+    Returns
+    -------
+    dict
+        Request parameters.
+
+    """
+    if data_source_ids is None:
+        data_source_ids = []
+
+    # Apparently, the GNR API does not accept Booleans so they need to be
+    # converted to lowercase strings first.
+    return {
+        "data_source_ids": "|".join(data_source_ids),
+        "resolve_once": str(resolve_once).lower(),
+        "best_match_only": str(best_match_only).lower(),
+        "with_context": str(with_context).lower(),
+        "with_vernaculars": str(with_vernaculars).lower(),
+        "with_canonical_ranks": str(with_canonical_ranks).lower(),
+    }
+
+
+def _get_cached_items(
+    unique_names: np.ndarray, params: dict, cacheable: bool = True
+) -> tuple:
+    """
+    Looks up the data items of multiple names in the cache (see
+    regi0.taxonomic.web.cache), so that only names that are not cached
+    are sent to the API.
+
+    Parameters
+    ----------
+    unique_names : array
+        Unique scientific names.
+    params : dict
+        Request parameters.
+    cacheable : bool
+        Whether the data items can be cached per name. If False, nothing
+        is looked up in the cache and, in offline mode, every name is
+        reported as missing.
+
+    Returns
+    -------
+    items : dict
+        Cached data item for each name.
+    missing_names : list or array
+        Names that are not cached and have to be sent to the API. Empty if
+        offline mode is enabled.
+
+    """
+    items = {}
+    if cache.get_cache() is None:
+        return items, unique_names
+
+    if cacheable:
+        for name in unique_names:
+            item = cache.get_cache().get(cache.make_key(API_URL, name, params))
+            if item is not None:
+                items[name] = item
+    missing_names = [name for name in unique_names if name not in items]
+    if cache.is_offline():
+        for name in missing_names:
+            warnings.warn(f"No cached response for {name} in offline mode.")
+            items[name] = {"supplied_name_string": name}
+        missing_names = []
+
+    return items, missing_names
+
+
+def _merge_cached_items(
+    items: dict,
+    missing_names: list,
+    data: list,
+    unique_names: np.ndarray,
+    params: dict,
+    cacheable: bool = True,
+) -> list:
+    """
+    Caches the data items retrieved from the API and merges them with the
+    cached ones.
+
+    Parameters
+    ----------
+    items : dict
+        Cached data item for each name.
+    missing_names : list or array
+        Names sent to the API.
+    data : list
+        Data items retrieved from the API, in the same order as
+        `missing_names`.
+    unique_names : array
+        Unique scientific names.
+    params : dict
+        Request parameters.
+    cacheable : bool
+        Whether the data items can be cached per name. If False, the data
+        items retrieved from the API are not cached.
+
+    Returns
+    -------
+    list
+        Data items in the same order as `unique_names`.
+
+    """
+    if cache.get_cache() is None:
+        return data
+
+    for name, item in zip(missing_names, data):
+        items[name] = item
+        if cacheable:
+            cache.get_cache().set(cache.make_key(API_URL, name, params), item)
+
+    # Names missing from the response get an item without results, as if
+    # they had not been found.
+    return [items.get(name, {"supplied_name_string": name}) for name in unique_names]
+
+
+def _parse_resolve(
+    data: list, names: pd.Series, best_match_only: bool, expand: bool
+) -> pd.DataFrame:
+    """
+    Normalizes the data items returned by the GNR API into a DataFrame.
+
+    Parameters
+    ----------
+    data : list
+        Data items, one for each unique name in `names`.
+    names : Series
+        Scientific names.
+    best_match_only : bool
+        Whether the API was asked for the best match only.
+    expand : bool
+        Whether to expand result rows to match `names` size.
+
+    Returns
+    -------
+    DataFrame
+        DataFrame where rows are the result for each match.
+
+    """
+    # The pd.json_normalize() function does not work when record_path
+    # is not found in every single item inside the list of elements
+    # passed. In some cases, the GNR API returns items without this key,
+    # so it needs to be added (including an empty dictionary) before
+    # normalizing the result. Furthermore, there are some cases where
+    # the GNR API returns items with this key but the list contains just
+    # a None value, which causes pd.json_normalize to fail as well.
+    for item in data:
+        if "results" not in item:
+            item["results"] = [{}]
+        else:
+            if not all(item["results"]):
+                item["results"] = [{}]
+
+    df = pd.json_normalize(data, record_path="results", meta="supplied_name_string")
+
+    if expand:
+        if best_match_only:
+            df = expand_result(df, names)
+        else:
+            warnings.warn(
+                "Result will not be expanded because there might be multiple results for"
+                " each species. Make sure best_match_only is True for the result to be "
+                "expanded."
+            )
+
+    return df
+
+
+def _parse_classification(
+    result: pd.DataFrame, add_supplied_names: bool, add_source: bool
+) -> pd.DataFrame:
+    """
+    Extracts the ranks of the classification path of each match.
+
+    Parameters
+    ----------
+    result : DataFrame
+        Result of the resolve function.
+    add_supplied_names : bool
+        Add supplied scientific names to the resulting DataFrame.
+    add_source : bool
+        Add source column to the resulting DataFrame.
+
+    Returns
+    -------
+    DataFrame
+        DataFrame with the ranks for each match.
+
+    """
+    ranks = ["kingdom", "phylum", "class", "order", "family", "genus", "species"]
+    df = pd.DataFrame(columns=ranks, index=result.index)
+
+    if (
+        "classification_path_ranks" in result.columns
+        and "classification_path" in result.columns
+    ):
+        rank_indices = result["classification_path_ranks"].str.split("|", expand=True)
+        path_indices = result["classification_path"].str.split("|", expand=True)
+
+        for rank in ranks:
+            # The GNR API result might have duplicated ranks for one or more
+            # items. Thus, duplicated ranks are removed and only the value for
+            # first the appearance is kept.
+            rank_idx = np.nonzero(rank_indices.values == rank)
+            unique_idx = np.unique(rank_idx[0], return_index=True)[1]
+            new_idx = np.column_stack(rank_idx)[unique_idx]
+            rank_idx = tuple(new_idx.T)
+            rank_paths = path_indices.values[rank_idx]
+            df.loc[(rank_indices == rank).any(axis=1), rank] = rank_paths
+
+    if add_supplied_names:
+        df["supplied_name"] = result.get("supplied_name_string")
+    if add_source:
+        df["source"] = result.get("data_source_title")
+
+    df = df.replace(["", None], np.nan)
+
+    return df
+
+
 def resolve(
     names: Union[list, np.ndarray, pd.Series, str],
     data_source_ids: list = None,
@@ -24,6 +304,10 @@ def resolve(
     with_vernaculars: bool = False,
     with_canonical_ranks: bool = False,
     expand: bool = True,
+    batch_size: int = 1000,
+    max_workers: int = 4,
+    max_retries: int = 3,
+    backoff_factor: float = 1.0,
 ) -> pd.DataFrame:
     """
     Receives a list of names and resolves each against the entire resolver
@@ -49,7 +333,9 @@ def resolve(
         a common taxonomic context is calculated for all supplied names
         from matches in data sources that have classification tree paths.
         Names out of determined context are penalized during score
-        calculation.
+        calculation. The context is calculated for each batch of names,
+        so results are not cached (see regi0.taxonomic.web.cache) when
+        True.
     with_vernaculars : bool
         Return 'vernacular' field to present common names provided by a
         data source for a particular match.
@@ -61,6 +347,17 @@ def resolve(
         number of rows will correspond to the number of unique names in
         `names`. Only has effect if best_match_only=True or if only one
          data source id is passed.
+    batch_size : int
+        Maximum number of names to send in each request. Large payloads
+        can time out or be rejected by the API, so names are split into
+        batches that are sent concurrently.
+    max_workers : int
+        Maximum number of requests to send at the same time.
+    max_retries : int
+        Maximum number of times to retry a failed request.
+    backoff_factor : float
+        Factor to compute the time (in seconds) to wait before each retry.
+        The n-th retry waits backoff_factor * 2 ** (n - 1) seconds.
 
     Returns
     -------
@@ -70,58 +367,44 @@ def resolve(
     """
     if isinstance(names, (list, str, np.ndarray)):
         names = pd.Series(names)
-    if data_source_ids is None:
-        data_source_ids = []
 
     unique_names = names.dropna().unique()
+    params = _get_params(
+        data_source_ids,
+        resolve_once,
+        best_match_only,
+        with_context,
+        with_vernaculars,
+        with_canonical_ranks,
+    )
+    # With context, the result for a name depends on the rest of the names
+    # in its batch, so it cannot be cached under a per-name key.
+    cacheable = not with_context
+    items, missing_names = _get_cached_items(unique_names, params, cacheable)
 
-    # Apparently, the GNR API does not accept Booleans so they need to be
-    # converted to lowercase strings first.
-    params = {
-        "data": "\n".join(unique_names),
-        "data_source_ids": "|".join(data_source_ids),
-        "resolve_once": str(resolve_once).lower(),
-        "best_match_only": str(best_match_only).lower(),
-        "with_context": str(with_context).lower(),
-        "with_vernaculars": str(with_vernaculars).lower(),
-        "with_canonical_ranks": str(with_canonical_ranks).lower(),
-    }
-
-    try:
-        response = requests.post(API_URL, json=params)
-        response.raise_for_status()
-    except requests.exceptions.HTTPError as err:
-        raise Exception(f"Error calling Global Name Resolver API. {err}")
+    batches = [
+        {"data": "\n".join(missing_names[i : i + batch_size]), **params}
+        for i in range(0, len(missing_names), batch_size)
+    ]
+    if not items and not batches:
+        batches = [{"data": "", **params}]
 
-    data = response.json()["data"]
+    def post(batch_params):
+        return _post(batch_params, max_retries, backoff_factor)
 
-    # The pd.json_normalize() function does not work when record_path
-    # is not found in every single item inside the list of elements
-    # passed. In some cases, the GNR API returns items without this key,
-    # so it needs to be added (including an empty dictionary) before
-    # normalizing the result. Furthermore, there are some cases where
-    # the GNR API returns items with this key but the list contains just
-    # a None value, which causes pd.json_normalize to fail as well.
-    for item in data:
-        if "results" not in item:
-            item["results"] = [{}]
-        else:
-            if not all(item["results"]):
-                item["results"] = [{}]
+    # Results are concatenated in the same order batches were created so
+    # that the data items keep the order of the unique names.
+    if len(batches) == 1 or max_workers == 1:
+        data = [item for batch in map(post, batches) for item in batch]
+    else:
+        with concurrent.futures.ThreadPoolExecutor(max_workers) as executor:
+            data = [item for batch in executor.map(post, batches) for item in batch]
 
-    df = pd.json_normalize(data, record_path="results", meta="supplied_name_string")
+    data = _merge_cached_items(
+        items, missing_names, data, unique_names, params, cacheable
+    )
 
-    if expand:
-        if best_match_only:
-            df = expand_result(df, names)
-        else:
-            warnings.warn(
-                "Result will not be expanded because there might be multiple results for"
-                " each species. Make sure best_match_only is True for the result to be "
-                "expanded."
-            )
-
-    return df
+    return _parse_resolve(data, names, best_match_only, expand)
 
 
 def get_classification(
@@ -161,32 +444,5 @@ def get_classification(
         names = pd.Series(names)
 
     result = resolve(names, expand=expand, **kwargs)
-    ranks = ["kingdom", "phylum", "class", "order", "family", "genus", "species"]
-    df = pd.DataFrame(columns=ranks, index=result.index)
 
-    if (
-        "classification_path_ranks" in result.columns
-        and "classification_path" in result.columns
-    ):
-        rank_indices = result["classification_path_ranks"].str.split("|", expand=True)
-        path_indices = result["classification_path"].str.split("|", expand=True)
-
-        for rank in ranks:
-            # The GNR API result might have duplicated ranks for one or more
-            # items. Thus, duplicated ranks are removed and only the value for
-            # first the appearance is kept.
-            rank_idx = np.nonzero(rank_indices.values == rank)
-            unique_idx = np.unique(rank_idx[0], return_index=True)[1]
-            new_idx = np.column_stack(rank_idx)[unique_idx]
-            rank_idx = tuple(new_idx.T)
-            rank_paths = path_indices.values[rank_idx]
-            df.loc[(rank_indices == rank).any(axis=1), rank] = rank_paths
-
-    if add_supplied_names:
-        df["supplied_name"] = result.get("supplied_name_string")
-    if add_source:
-        df["source"] = result.get("data_source_title")
-
-    df = df.replace(["", None], np.nan)
-
-    return df
+    return _parse_classification(result, add_supplied_names, add_source)
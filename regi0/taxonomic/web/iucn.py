@@ -11,10 +11,15 @@ import numpy as np
 import pandas as pd
 import requests
 
-from .._helpers import expand_result
+from . import cache
+from .._helpers import build_result, expand_result
+from ... import http
 
 API_URL = "https://apiv3.iucnredlist.org/api/v3/"
 
+# Default maximum number of requests per second.
+RATE_LIMIT = 10
+
 
 def _request(url: str, token: str) -> requests.Response:
     """
@@ -34,7 +39,7 @@ def _request(url: str, token: str) -> requests.Response:
 
     """
     try:
-        response = requests.get(url, params={"token": token})
+        response = http.get_session().get(url, params={"token": token})
         response.raise_for_status()
     except requests.exceptions.HTTPError as err:
         raise Exception(f"Error calling IUCN API. {err}")
@@ -45,11 +50,123 @@ def _request(url: str, token: str) -> requests.Response:
     return response
 
 
+def _get(
+    endpoint: str, name: str, token: str, limiter: http.RateLimiter = None
+) -> dict:
+    """
+    Gets the response of an IUCN API endpoint for a species name. If
+    caching is enabled (see regi0.taxonomic.web.cache), the response is
+    looked up in the cache first.
+
+    Parameters
+    ----------
+    endpoint : str
+        IUCN API endpoint.
+    name : str
+        Scientific name.
+    token : str
+        IUCN API authentication token.
+    limiter : RateLimiter
+        Rate limiter to acquire before calling the API. Responses served
+        from the cache are not limited. If None, calls are not limited.
+
+    Returns
+    -------
+    dict
+        Response content. Empty if offline mode is enabled and the
+        response is not cached.
+
+    """
+
+    def request():
+        if limiter is not None:
+            limiter.acquire()
+        return _request(urljoin(endpoint, name), token).json()
+
+    data = cache.fetch(endpoint, name, None, request)
+
+    return data or {}
+
+
+def _parse_common_names(data: dict) -> dict:
+    """
+    Parses the response of the common names endpoint.
+
+    Parameters
+    ----------
+    data : dict
+        Response content.
+
+    Returns
+    -------
+    dict
+        Common names joined by "|" for each language.
+
+    """
+    result = defaultdict(list)
+    for item in data.get("result") or []:
+        result[item["language"]].append(item["taxonname"])
+
+    return {language: "|".join(values) for language, values in result.items()}
+
+
+def _parse_country_occurrence(data: dict) -> dict:
+    """
+    Parses the response of the country occurrence endpoint.
+
+    Parameters
+    ----------
+    data : dict
+        Response content.
+
+    Returns
+    -------
+    dict
+        Values of each field joined by "|". Fields with non-text values
+        are missing.
+
+    """
+    result = data.get("result") or []
+    fields = dict.fromkeys(field for item in result for field in item)
+
+    parsed = {}
+    for field in fields:
+        values = [item.get(field) for item in result]
+        if all(isinstance(value, str) for value in values):
+            parsed[field] = "|".join(values)
+        else:
+            parsed[field] = np.nan
+
+    return parsed
+
+
+def _parse_species_info(data: dict) -> dict:
+    """
+    Parses the response of the species endpoint.
+
+    Parameters
+    ----------
+    data : dict
+        Response content.
+
+    Returns
+    -------
+    dict
+        Species information.
+
+    """
+    result = data.get("result")
+
+    return dict(result[0]) if result else {}
+
+
 def get_common_names(
     names: Union[list, np.ndarray, pd.Series, str],
     token: str,
     add_supplied_names: bool = False,
     expand: bool = True,
+    max_workers: int = 4,
+    rate_limit: float = RATE_LIMIT,
 ):
     """
     Gets common names for multiple species using the IUCN API.
@@ -66,6 +183,11 @@ def get_common_names(
         Whether to expand result rows to match `names` size. If False,
         the number of rows will correspond to the number of unique names
         in `names`.
+    max_workers : int
+        Maximum number of requests to send at the same time.
+    rate_limit : float
+        Maximum number of requests per second. Responses served from the
+        cache are not limited. If None, requests are not limited.
 
     Returns
     -------
@@ -77,19 +199,15 @@ def get_common_names(
         names = pd.Series(names)
 
     endpoint = urljoin(API_URL, "species/common_names/")
-    df = pd.DataFrame()
+
+    limiter = http.RateLimiter(rate_limit)
+
+    def get_result(name):
+        return _parse_common_names(_get(endpoint, name, token, limiter))
 
     unique_names = names.dropna().unique()
-    for name in unique_names:
-        response = _request(urljoin(endpoint, name), token)
-        if response.json().get("result"):
-            result = defaultdict(list)
-            for item in response.json().get("result"):
-                result[item["language"]].append(item["taxonname"])
-            result = pd.Series(result).str.join("|")
-        else:
-            result = pd.Series([], dtype="object")
-        df = df.append(result, ignore_index=True)
+    results = http.map_concurrent(get_result, unique_names, max_workers)
+    df = build_result(results)
 
     if add_supplied_names:
         df["supplied_name"] = unique_names
@@ -104,6 +222,8 @@ def get_country_occurrence(
     token: str,
     add_supplied_names: bool = False,
     expand: bool = True,
+    max_workers: int = 4,
+    rate_limit: float = RATE_LIMIT,
 ) -> pd.DataFrame:
     """
     Gets country occurrence and related information for multiple species
@@ -121,6 +241,11 @@ def get_country_occurrence(
         Whether to expand result rows to match `names` size. If False,
         the number of rows will correspond to the number of unique names
         in `names`.
+    max_workers : int
+        Maximum number of requests to send at the same time.
+    rate_limit : float
+        Maximum number of requests per second. Responses served from the
+        cache are not limited. If None, requests are not limited.
 
     Returns
     -------
@@ -132,23 +257,15 @@ def get_country_occurrence(
         names = pd.Series(names)
 
     endpoint = urljoin(API_URL, "species/countries/name/")
-    df = pd.DataFrame()
+
+    limiter = http.RateLimiter(rate_limit)
+
+    def get_result(name):
+        return _parse_country_occurrence(_get(endpoint, name, token, limiter))
 
     unique_names = names.dropna().unique()
-    for name in unique_names:
-        response = _request(urljoin(endpoint, name), token)
-        if response.json().get("result"):
-            temp_df = pd.DataFrame(response.json()["result"])
-            result = pd.Series(
-                {
-                    field: values
-                    for field, values in zip(temp_df.columns, temp_df.T.values)
-                }
-            )
-            result = result.str.join("|")
-        else:
-            result = pd.Series([], dtype="object")
-        df = df.append(pd.Series(result), ignore_index=True)
+    results = http.map_concurrent(get_result, unique_names, max_workers)
+    df = build_result(results)
 
     if add_supplied_names:
         df["supplied_name"] = unique_names
@@ -163,6 +280,8 @@ def get_species_info(
     token: str,
     add_supplied_names: bool = False,
     expand: bool = True,
+    max_workers: int = 4,
+    rate_limit: float = RATE_LIMIT,
 ) -> pd.DataFrame:
     """
     Gets IUCN category and miscellaneous information for multiple species
@@ -180,6 +299,11 @@ def get_species_info(
         Whether to expand result rows to match `names` size. If False,
         the number of rows will correspond to the number of unique names
         in `names`.
+    max_workers : int
+        Maximum number of requests to send at the same time.
+    rate_limit : float
+        Maximum number of requests per second. Responses served from the
+        cache are not limited. If None, requests are not limited.
 
     Returns
     -------
@@ -191,16 +315,15 @@ def get_species_info(
         names = pd.Series(names)
 
     endpoint = urljoin(API_URL, "species/")
-    df = pd.DataFrame()
+
+    limiter = http.RateLimiter(rate_limit)
+
+    def get_result(name):
+        return _parse_species_info(_get(endpoint, name, token, limiter))
 
     unique_names = names.dropna().unique()
-    for name in unique_names:
-        response = _request(urljoin(endpoint, name), token)
-        if response.json().get("result"):
-            result = pd.Series(response.json()["result"][0])
-        else:
-            result = pd.Series([], dtype="object")
-        df = df.append(pd.Series(result), ignore_index=True)
+    results = http.map_concurrent(get_result, unique_names, max_workers)
+    df = build_result(results)
 
     if add_supplied_names:
         df["supplied_name"] = unique_names
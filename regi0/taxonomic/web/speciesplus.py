@@ -3,6 +3,8 @@ Wrappers for Species+/CITES checklist API calls.
 
 API documentation can be found at: http://api.speciesplus.net/documentation
 """
+import concurrent.futures
+import threading
 from typing import Union
 from urllib.parse import urljoin
 
@@ -10,9 +12,18 @@ import numpy as np
 import pandas as pd
 import requests
 
-from .._helpers import expand_result
+from . import cache
+from .._helpers import build_result, expand_result
+from ... import http
 
 API_URL = "https://api.speciesplus.net/api/v1/"
+TAXON_CONCEPT_COLUMNS = [
+    "id",
+    "author_year",
+    "cites_listing",
+    "common_names",
+    "synonyms",
+]
 
 
 def _request(url: str, token: str, params: dict = None) -> requests.Response:
@@ -35,12 +46,185 @@ def _request(url: str, token: str, params: dict = None) -> requests.Response:
 
     """
     headers = {"X-Authentication-Token": token}
-    response = requests.get(url, params=params, headers=headers)
+    response = http.get_session().get(url, params=params, headers=headers)
     response.raise_for_status()
 
     return response
 
 
+def _get(
+    url: str,
+    query: str,
+    token: str,
+    params: dict = None,
+    limiter: http.RateLimiter = None,
+):
+    """
+    Gets the content of a response from the Species+/CITES checklist API.
+    If caching is enabled (see regi0.taxonomic.web.cache), the response
+    is looked up in the cache first.
+
+    Parameters
+    ----------
+    url : str
+        Species+/CITES checklist API endpoint.
+    query : str
+        Queried value (i.e. a scientific name or a taxon concept ID).
+    token : str
+        Species+/CITES checklist API authentication token.
+    params : dict
+        Request parameters.
+    limiter : RateLimiter
+        Rate limiter to acquire before calling the API. Responses served
+        from the cache are not limited. If None, calls are not limited.
+
+    Returns
+    -------
+    list or dict
+        Response content. None if offline mode is enabled and the
+        response is not cached.
+
+    """
+
+    def request():
+        if limiter is not None:
+            limiter.acquire()
+        return _request(url, token, params).json()
+
+    return cache.fetch(url, query, params, request)
+
+
+def _get_id(
+    _id: Union[float, int, str],
+    resource: str,
+    token: str,
+    params: dict = None,
+    limiter: http.RateLimiter = None,
+):
+    """
+    Gets the content of a response from one of the endpoints of a taxon
+    concept (i.e. distributions or references).
+
+    Parameters
+    ----------
+    _id : float, int or str
+        Taxon concept ID.
+    resource : str
+        Taxon concept endpoint. Can be "distributions" or "references".
+    token : str
+        Species+/CITES checklist API authentication token.
+    params : dict
+        Request parameters.
+    limiter : RateLimiter
+        Rate limiter to acquire before calling the API. If None, calls
+        are not limited.
+
+    Returns
+    -------
+    list
+        Response content. None if the taxon concept does not exist.
+
+    """
+    endpoint = urljoin(API_URL, f"taxon_concepts/{int(_id)}/{resource}")
+    try:
+        data = _get(endpoint, int(_id), token, params, limiter)
+    except requests.HTTPError as err:
+        if err.response.status_code == 500:
+            data = None
+        else:
+            raise requests.HTTPError(err)
+
+    return data
+
+
+def _parse_distributions(data: list) -> dict:
+    """
+    Parses the response of the distributions endpoint.
+
+    Parameters
+    ----------
+    data : list
+        Response content.
+
+    Returns
+    -------
+    dict
+        Values of each field joined by "|".
+
+    """
+    if not data:
+        return {}
+
+    df = pd.DataFrame(data).drop(columns=["tags", "references"]).astype(str)
+
+    return {field: "|".join(values) for field, values in df.items()}
+
+
+def _parse_references(data: list) -> dict:
+    """
+    Parses the response of the references endpoint.
+
+    Parameters
+    ----------
+    data : list
+        Response content.
+
+    Returns
+    -------
+    dict
+        Values of each field joined by "|".
+
+    """
+    if not data:
+        return {}
+
+    df = pd.DataFrame(data).astype(str)
+
+    return {field: "|".join(values) for field, values in df.items()}
+
+
+def _parse_taxon_concept(data: dict) -> dict:
+    """
+    Parses the response of the taxon concepts endpoint, keeping only the
+    most recently updated taxon concept.
+
+    Parameters
+    ----------
+    data : dict
+        Response content.
+
+    Returns
+    -------
+    dict
+        Taxon concept information.
+
+    """
+    taxon_concepts = data.get("taxon_concepts") if data else None
+    if not taxon_concepts:
+        return {}
+
+    taxon_concept = max(taxon_concepts, key=lambda x: x["updated_at"])
+    result = {
+        "id": taxon_concept.get("id"),
+        "author_year": taxon_concept.get("author_year"),
+        "cites_listing": taxon_concept.get("cites_listing"),
+        "common_names": "|".join(
+            [item.get("name") for item in taxon_concept.get("common_names")]
+        ),
+        "synonyms": "|".join(
+            [
+                item.get("full_name")
+                for item in taxon_concept.get("synonyms")
+                if item.get("rank") == "SPECIES"
+            ]
+        ),
+    }
+    if taxon_concept.get("higher_taxa"):
+        result.update(taxon_concept.get("higher_taxa"))
+
+    return result
+
+
 def get_distributions(
     ids: Union[float, int, list, pd.Series, str],
     token: str,
@@ -78,30 +262,13 @@ def get_distributions(
     if isinstance(ids, (float, int, list, str)):
         ids = pd.Series(ids)
 
-    df = pd.DataFrame()
-
+    results = []
     unique_ids = ids.dropna().unique()
     for _id in unique_ids:
-        endpoint = urljoin(API_URL, f"taxon_concepts/{int(_id)}/distributions")
-        try:
-            response = _request(endpoint, token, {"language": language})
-            temp_df = pd.DataFrame(response.json())
-            temp_df = temp_df.drop(columns=["tags", "references"])
-            temp_df = temp_df.astype(str)
-            result = pd.Series(
-                {
-                    field: values
-                    for field, values in zip(temp_df.columns, temp_df.T.values)
-                }
-            )
-            result = result.str.join("|")
-        except requests.HTTPError as err:
-            if err.response.status_code == 500:
-                result = pd.Series([], dtype="object")
-            else:
-                raise requests.HTTPError(err)
+        data = _get_id(_id, "distributions", token, {"language": language})
+        results.append(_parse_distributions(data))
 
-        df = df.append(pd.Series(result), ignore_index=True)
+    df = build_result(results)
 
     if add_supplied_ids:
         df["supplied_id"] = unique_ids
@@ -144,29 +311,13 @@ def get_references(
     if isinstance(ids, (float, int, list, str)):
         ids = pd.Series(ids)
 
-    df = pd.DataFrame()
-
+    results = []
     unique_ids = ids.dropna().unique()
     for _id in unique_ids:
-        endpoint = urljoin(API_URL, f"taxon_concepts/{int(_id)}/references")
-        try:
-            response = _request(endpoint, token)
-            temp_df = pd.DataFrame(response.json())
-            temp_df = temp_df.astype(str)
-            result = pd.Series(
-                {
-                    field: values
-                    for field, values in zip(temp_df.columns, temp_df.T.values)
-                }
-            )
-            result = result.str.join("|")
-        except requests.HTTPError as err:
-            if err.response.status_code == 500:
-                result = pd.Series([], dtype="object")
-            else:
-                raise requests.HTTPError(err)
+        data = _get_id(_id, "references", token)
+        results.append(_parse_references(data))
 
-        df = df.append(pd.Series(result), ignore_index=True)
+    df = build_result(results)
 
     if add_supplied_ids:
         df["supplied_id"] = unique_ids
@@ -218,39 +369,135 @@ def get_taxon_concept(
 
     endpoint = urljoin(API_URL, "taxon_concepts")
 
-    df = pd.DataFrame(
-        columns=["id", "author_year", "cites_listing", "common_names", "synonyms"]
-    )
-
+    results = []
     unique_names = names.dropna().unique()
     for name in unique_names:
-        result = pd.Series([], dtype="object")
-        response = _request(
-            endpoint, token, {"name": name, "language": ",".join(language)}
+        data = _get(
+            endpoint, name, token, {"name": name, "language": ",".join(language)}
+        )
+        results.append(_parse_taxon_concept(data))
+
+    df = build_result(results, TAXON_CONCEPT_COLUMNS)
+
+    if add_supplied_names:
+        df["supplied_name"] = unique_names
+    if expand:
+        df = expand_result(df, names)
+
+    return df
+
+
+def get_full_records(
+    names: Union[list, np.ndarray, pd.Series, str],
+    token: str,
+    language: str = "EN",
+    add_supplied_names: bool = False,
+    expand: bool = True,
+    max_workers: int = 4,
+    rate_limit: float = None,
+) -> pd.DataFrame:
+    """
+    Get the most recent taxon concept, the distributions and the
+    references for multiple scientific names in a single pass.
+
+    Requests are pipelined: the distributions and references of a taxon
+    concept are requested as soon as its name is resolved, while other
+    names are still being resolved. Each taxon concept ID is requested
+    only once, even if multiple names resolve to it.
+
+    Parameters
+    ----------
+    names : list, array, Series or str
+        Scientific name(s) to get results for.
+    token : str
+        Species+/CITES checklist API authentication token.
+    language : str
+        ISO 639-1 code used to filter languages returned for common names
+        and for the names of distributions. Can be "EN", "ES" or "FR".
+    add_supplied_names : bool
+        Add supplied scientific names to the resulting DataFrame.
+    expand : bool
+        Whether to expand result rows to match `names` size. If False,
+        the number of rows will correspond to the number of unique names
+        in `names`.
+    max_workers : int
+        Maximum number of concurrent requests.
+    rate_limit : float
+        Maximum number of requests per second. Responses served from the
+        cache are not limited. If None, requests are not limited.
+
+    Returns
+    -------
+    DataFrame
+        DataFrame with taxon concept information, followed by the
+        distributions and the references information in columns prefixed
+        with "distribution_" and "reference_" respectively.
+
+    """
+    if isinstance(names, (list, str, np.ndarray)):
+        names = pd.Series(names)
+
+    endpoint = urljoin(API_URL, "taxon_concepts")
+    limiter = http.RateLimiter(rate_limit)
+    lock = threading.Lock()
+    # Futures with the distributions and references of each taxon concept
+    # ID, shared by every name that resolves to it.
+    id_futures = {}
+
+    def get_distributions_data(_id):
+        return _parse_distributions(
+            _get_id(_id, "distributions", token, {"language": language}, limiter)
         )
-        taxon_concepts = response.json()["taxon_concepts"]
-        if taxon_concepts:
-            taxon_concept = sorted(
-                taxon_concepts, key=lambda x: x["updated_at"], reverse=True
-            )[0]
-            result.loc["id"] = taxon_concept.get("id")
-            result.loc["author_year"] = taxon_concept.get("author_year")
-            result.loc["cites_listing"] = taxon_concept.get("cites_listing")
-            result.loc["common_names"] = "|".join(
-                [item.get("name") for item in taxon_concept.get("common_names")]
-            )
-            result.loc["synonyms"] = "|".join(
-                [
-                    item.get("full_name")
-                    for item in taxon_concept.get("synonyms")
-                    if item.get("rank") == "SPECIES"
-                ]
-            )
-            if taxon_concept.get("higher_taxa"):
-                for rank, value in taxon_concept.get("higher_taxa").items():
-                    result.loc[rank] = value
-
-        df = df.append(result, ignore_index=True)
+
+    def get_references_data(_id):
+        return _parse_references(_get_id(_id, "references", token, None, limiter))
+
+    def get_taxon_concept_data(name):
+        params = {"name": name, "language": language}
+        data = _get(endpoint, name, token, params, limiter)
+        result = _parse_taxon_concept(data)
+        _id = result.get("id")
+        if _id is not None:
+            with lock:
+                if _id not in id_futures:
+                    id_futures[_id] = (
+                        executor.submit(get_distributions_data, _id),
+                        executor.submit(get_references_data, _id),
+                    )
+        return result
+
+    unique_names = names.dropna().unique()
+    in_flight = threading.BoundedSemaphore(max_workers)
+    with concurrent.futures.ThreadPoolExecutor(max_workers) as executor:
+        futures = []
+        for name in unique_names:
+            # Names are only submitted as workers become free, so that the
+            # distributions and references of the names that are already
+            # resolved are queued before the remaining names.
+            in_flight.acquire()
+            future = executor.submit(get_taxon_concept_data, name)
+            future.add_done_callback(lambda _: in_flight.release())
+            futures.append(future)
+        taxon_concepts = [future.result() for future in futures]
+        distributions = []
+        references = []
+        for taxon_concept in taxon_concepts:
+            _id = taxon_concept.get("id")
+            if _id is None:
+                distributions.append({})
+                references.append({})
+            else:
+                distributions.append(id_futures[_id][0].result())
+                references.append(id_futures[_id][1].result())
+
+    df = pd.concat(
+        [
+            build_result(taxon_concepts, TAXON_CONCEPT_COLUMNS),
+            build_result(distributions).add_prefix("distribution_"),
+            build_result(references).add_prefix("reference_"),
+        ],
+        axis=1,
+    )
 
     if add_supplied_names:
         df["supplied_name"] = unique_names
@@ -1,11 +1,13 @@
 """
 General verification functions.
 """
+from typing import Union
+
 import numpy as np
 import pandas as pd
-from rapidfuzz import fuzz
 
 from regi0._helpers import standardize_text
+from regi0.matching import VocabularyIndex, get_pair_scores
 
 
 def match(
@@ -14,6 +16,7 @@ def match(
     preprocess: bool = False,
     fuzzy: bool = False,
     threshold: float = 0.8,
+    scorer: str = "ratio",
 ) -> pd.Series:
     """
     Compares values between two different Series to check if they match.
@@ -30,6 +33,9 @@ def match(
         Whether to compare values using fuzzy logic.
     threshold : float
         Threshold to define equal values using fuzzy logic.
+    scorer : str
+        Similarity measure used to compare values using fuzzy logic. Can
+        be "ratio", "token_set_ratio" or "jaro_winkler".
 
     Returns
     -------
@@ -42,9 +48,7 @@ def match(
         right = standardize_text(right)
 
     if fuzzy:
-        values = pd.DataFrame({"left": left, "right": right})
-        values = values.fillna("")
-        score = values.apply(lambda row: fuzz.ratio(row["left"], row["right"]), axis=1)
+        score = get_pair_scores(left, right, scorer)
         result = (score / 100) >= threshold
     else:
         result = left == right
@@ -63,6 +67,7 @@ def verify(
     flag_name: str,
     add_suggested: bool = False,
     suggested_name: str = None,
+    vocabulary: Union[list, np.ndarray, pd.Series, VocabularyIndex] = None,
     add_source: bool = False,
     source: pd.Series = None,
     source_name: str = None,
@@ -91,6 +96,12 @@ def verify(
     suggested_name : str
         Name of the column for the suggested values. Only has effect when
         add_suggested=True is passed.
+    vocabulary : list, array, Series or VocabularyIndex
+        Known values to suggest from. If passed, the suggested value for
+        each mismatch is the most similar value in `vocabulary` (using
+        the `scorer` keyword argument, "ratio" by default) instead of the
+        expected value. Only has effect when add_suggested=True is
+        passed. Pass a VocabularyIndex to reuse it between calls.
     add_source : bool
     source : Series
     drop : bool
@@ -110,7 +121,16 @@ def verify(
     df[flag_name] = match(df[observed_col], expected, **kwargs)
 
     if add_suggested:
-        df.loc[~df[flag_name], suggested_name] = expected.loc[~df[flag_name]]
+        mismatch = ~df[flag_name]
+        if vocabulary is None:
+            suggested = expected.loc[mismatch]
+        else:
+            if not isinstance(vocabulary, VocabularyIndex):
+                vocabulary = VocabularyIndex(vocabulary)
+            suggested = vocabulary.best_match(
+                df.loc[mismatch, observed_col], scorer=kwargs.get("scorer", "ratio")
+            )["candidate"]
+        df.loc[mismatch, suggested_name] = suggested
     if add_source:
         df.loc[df[flag_name].notna(), source_name] = source.loc[df[flag_name].notna()]
     if drop:
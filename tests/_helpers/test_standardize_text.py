@@ -1,8 +1,12 @@
 """
 Test cases for the regi0._helpers.standardize function.
 """
+import collections
+
+import numpy as np
 import pandas as pd
 
+from regi0 import _helpers
 from regi0._helpers import standardize_text
 
 
@@ -40,3 +44,35 @@ def test_punctuation():
         ]
     )
     pd.testing.assert_series_equal(standardize_text(values), expected)
+
+
+def test_repeated_values():
+    values = pd.Series(
+        ["NARIÑO", np.nan, "Boyacá", "NARIÑO", "Boyacá"],
+        index=[10, 11, 12, 13, 14],
+        name="stateProvince",
+    )
+    expected = pd.Series(
+        ["narino", np.nan, "boyaca", "narino", "boyaca"],
+        index=[10, 11, 12, 13, 14],
+        name="stateProvince",
+    )
+    pd.testing.assert_series_equal(standardize_text(values), expected)
+    pd.testing.assert_series_equal(standardize_text(values), expected)
+
+
+def test_missing_values():
+    values = pd.Series([np.nan, np.nan])
+    expected = pd.Series([np.nan, np.nan], dtype=object)
+    pd.testing.assert_series_equal(standardize_text(values), expected)
+
+
+def test_memo_size(monkeypatch):
+    monkeypatch.setattr(_helpers, "STANDARDIZE_MEMO_SIZE", 2)
+    monkeypatch.setattr(_helpers, "_standardize_memo", collections.OrderedDict())
+    values = pd.Series(["Vichada", "Casanare", "Boyacá"])
+    standardize_text(values)
+    assert list(_helpers._standardize_memo.items()) == [
+        ("Casanare", "casanare"),
+        ("Boyacá", "boyaca"),
+    ]
@@ -0,0 +1,79 @@
+"""
+Test cases for the regi0.cli.commands.geographic.geo command.
+"""
+import concurrent.futures
+import configparser
+import pathlib
+
+import pandas as pd
+import pytest
+from click.testing import CliRunner
+
+import regi0
+from regi0.cli.commands import geographic
+
+SETTINGS_PATH = pathlib.Path(regi0.__file__).parent.joinpath("cli/config/settings.ini")
+
+
+@pytest.fixture()
+def config(monkeypatch, data_path):
+    config = configparser.ConfigParser()
+    config.read(SETTINGS_PATH)
+    config["paths"]["admin0"] = str(data_path.joinpath("gpkg/admin0.gpkg"))
+    config["paths"]["admin1"] = str(data_path.joinpath("gpkg/admin1.gpkg"))
+    config["paths"]["urban"] = str(data_path.joinpath("geojson/urban.geojson"))
+    config["attributes"]["admin1"] = "dptos"
+    monkeypatch.setattr(geographic, "config", config)
+    return config
+
+
+@pytest.mark.parametrize("keep", ["false", "first", "last"])
+@pytest.mark.parametrize("remove", [False, True])
+def test_chunked(config, data_path, tmp_path, keep, remove):
+    config["duplicates"]["keep"] = keep
+    args = [str(data_path.joinpath("csv/birds.csv")), "--skip-admin", "county", "-q"]
+    if remove:
+        args.append("-r")
+
+    runner = CliRunner()
+    full_path = tmp_path.joinpath("full.csv")
+    chunked_path = tmp_path.joinpath("chunked.csv")
+    result = runner.invoke(geographic.geo, args + [str(full_path)])
+    assert result.exit_code == 0
+    result = runner.invoke(
+        geographic.geo, args + [str(chunked_path), "--chunksize", "7"]
+    )
+    assert result.exit_code == 0
+
+    full = pd.read_csv(full_path)
+    chunked = pd.read_csv(chunked_path)
+    assert "spatialDuplicate" in full.columns
+    pd.testing.assert_frame_equal(chunked, full)
+
+
+def test_chunked_executor(config, data_path, tmp_path, monkeypatch):
+    executors = []
+
+    class RecordingExecutor(concurrent.futures.ThreadPoolExecutor):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            executors.append(self)
+
+    monkeypatch.setattr(concurrent.futures, "ProcessPoolExecutor", RecordingExecutor)
+    args = [str(data_path.joinpath("csv/birds.csv")), "--skip-admin", "county", "-q"]
+
+    runner = CliRunner()
+    full_path = tmp_path.joinpath("full.csv")
+    chunked_path = tmp_path.joinpath("chunked.csv")
+    result = runner.invoke(geographic.geo, args + [str(full_path)])
+    assert result.exit_code == 0
+    result = runner.invoke(
+        geographic.geo,
+        args + [str(chunked_path), "--chunksize", "7", "--jobs", "2"],
+    )
+    assert result.exit_code == 0
+    assert len(executors) == 1
+
+    full = pd.read_csv(full_path)
+    chunked = pd.read_csv(chunked_path)
+    pd.testing.assert_frame_equal(chunked, full)
@@ -0,0 +1,79 @@
+"""
+Test cases for the regi0.cli.commands.taxonomic.tax command.
+"""
+import configparser
+import pathlib
+
+import pandas as pd
+import pytest
+from click.testing import CliRunner
+
+import regi0
+from regi0.cli.commands import taxonomic
+
+SETTINGS_PATH = pathlib.Path(regi0.__file__).parent.joinpath("cli/config/settings.ini")
+
+RANKS = ["kingdom", "phylum", "class", "order", "family", "genus", "species"]
+
+SPECIES = {
+    "Amazilia castaneiventris": "Amazilia castaneiventris",
+    "Amazilia castaneventris": "Amazilia tzacatl",
+}
+
+
+def get_classification(names, **kwargs):
+    result = pd.DataFrame(index=names.index, columns=RANKS + ["source"])
+    result["species"] = names.map(SPECIES)
+    result["source"] = "Catalogue of Life"
+    if not kwargs["expand"]:
+        result = result.drop_duplicates().reset_index(drop=True)
+    return result
+
+
+@pytest.fixture()
+def config(monkeypatch, tmp_path):
+    checklist_path = tmp_path.joinpath("checklist.csv")
+    pd.DataFrame(
+        {
+            "scientificName": [
+                "Amazilia castaneiventris",
+                "Amazilia tzacatl",
+                "Tremarctos ornatus",
+            ]
+        }
+    ).to_csv(checklist_path, index=False)
+    config = configparser.ConfigParser()
+    config.read(SETTINGS_PATH)
+    config["paths"]["checklist"] = str(checklist_path)
+    monkeypatch.setattr(taxonomic, "config", config)
+    monkeypatch.setattr(regi0.taxonomic.gnr, "get_classification", get_classification)
+    return config
+
+
+@pytest.fixture()
+def records_path(tmp_path):
+    path = tmp_path.joinpath("records.csv")
+    pd.DataFrame({"scientificName": list(SPECIES)}).to_csv(path, index=False)
+    return path
+
+
+@pytest.mark.parametrize("chunksize", [None, 1])
+@pytest.mark.parametrize(
+    "suggest_from_checklist,expected",
+    [(False, "Amazilia tzacatl"), (True, "Amazilia castaneiventris")],
+)
+def test_suggest_from_checklist(
+    config, records_path, tmp_path, chunksize, suggest_from_checklist, expected
+):
+    output = tmp_path.joinpath("output.csv")
+    args = [str(records_path), str(output), "-q"]
+    if suggest_from_checklist:
+        args.append("--suggest-from-checklist")
+    if chunksize:
+        args.extend(["--chunksize", str(chunksize)])
+    result = CliRunner().invoke(taxonomic.tax, args)
+    assert result.exit_code == 0, result.output
+    records = pd.read_csv(output)
+    assert records["validName"].tolist() == [True, False]
+    assert records["suggestedName"].isna().tolist() == [True, False]
+    assert records.loc[1, "suggestedName"] == expected
@@ -0,0 +1,35 @@
+"""
+Test cases for the regi0.cli.utils.streaming.DuplicateTracker class.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from regi0.cli.utils.streaming import DuplicateTracker
+
+
+@pytest.fixture
+def keys():
+    return pd.Series(["a", "b", "a", "c", "b", "a", "d", "c", "e"])
+
+
+@pytest.mark.parametrize("keep", [False, "first", "last"])
+def test_chunks(keys, keep):
+    chunks = np.array_split(keys, 4)
+    tracker = DuplicateTracker(keep)
+    if tracker.needs_count:
+        for chunk in chunks:
+            tracker.count(chunk)
+    result = pd.concat([tracker.flag(chunk) for chunk in chunks])
+    pd.testing.assert_series_equal(result, keys.duplicated(keep=keep))
+
+
+def test_needs_count():
+    assert not DuplicateTracker("first").needs_count
+    assert DuplicateTracker("last").needs_count
+    assert DuplicateTracker(False).needs_count
+
+
+def test_invalid_keep():
+    with pytest.raises(ValueError):
+        DuplicateTracker("none")
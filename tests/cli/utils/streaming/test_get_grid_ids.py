@@ -0,0 +1,15 @@
+"""
+Test cases for the regi0.cli.utils.streaming.get_grid_ids function.
+"""
+import numpy as np
+import pandas as pd
+
+from regi0.cli.utils.streaming import get_grid_ids
+
+
+def test_grid_ids():
+    x = pd.Series([0.5, 1.5, 0.5, 1.5, 3.0, np.nan])
+    y = pd.Series([1.5, 1.5, 0.5, 0.5, 0.5, 0.5])
+    result = get_grid_ids(x, y, (0, 0, 2, 2), 1)
+    expected = pd.Series([1, 2, 3, 4, np.nan, np.nan])
+    pd.testing.assert_series_equal(result, expected)
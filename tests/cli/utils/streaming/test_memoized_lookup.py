@@ -0,0 +1,51 @@
+"""
+Test cases for the regi0.cli.utils.streaming.MemoizedLookup class.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from regi0.cli.utils.streaming import MemoizedLookup
+
+
+@pytest.fixture
+def calls():
+    return []
+
+
+@pytest.fixture
+def lookup(calls):
+    def func(values):
+        calls.append(values.tolist())
+        return pd.DataFrame({"length": values.str.len()})
+
+    return MemoizedLookup(func, ["length"])
+
+
+def test_get(lookup, calls):
+    values = pd.Series(["Ara", np.nan, "Puma concolor", "Ara"], index=[4, 5, 6, 7])
+    result = lookup.get(values)
+    expected = pd.DataFrame({"length": [3, np.nan, 13, 3]}, index=[4, 5, 6, 7])
+    pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+    assert calls == [["Ara", "Puma concolor"]]
+
+
+def test_hits(lookup, calls):
+    lookup.get(pd.Series(["Ara", "Puma concolor"]))
+    result = lookup.get(pd.Series(["Puma concolor", "Tapirus", "Ara"]))
+    assert result["length"].tolist() == [13, 7, 3]
+    assert calls == [["Ara", "Puma concolor"], ["Tapirus"]]
+    assert len(lookup) == 3
+
+
+def test_all_hits(lookup, calls):
+    lookup.get(pd.Series(["Ara"]))
+    lookup.get(pd.Series(["Ara", np.nan]))
+    assert calls == [["Ara"]]
+
+
+def test_empty(lookup, calls):
+    result = lookup.get(pd.Series([np.nan], dtype=object))
+    assert result.columns.tolist() == ["length"]
+    assert result["length"].isna().all()
+    assert calls == []
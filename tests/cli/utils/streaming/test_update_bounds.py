@@ -0,0 +1,18 @@
+"""
+Test cases for the regi0.cli.utils.streaming.update_bounds function.
+"""
+import numpy as np
+
+from regi0.cli.utils.streaming import update_bounds
+
+
+def test_first():
+    assert update_bounds(None, np.array([0, 1, 2, 3])) == (0, 1, 2, 3)
+
+
+def test_expand():
+    assert update_bounds((0, 1, 2, 3), (-1, 2, 1, 4)) == (-1, 1, 2, 4)
+
+
+def test_empty():
+    assert update_bounds((0, 1, 2, 3), np.full(4, np.nan)) == (0, 1, 2, 3)
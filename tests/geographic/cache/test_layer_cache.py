@@ -0,0 +1,94 @@
+"""
+Test cases for the regi0.geographic.cache.LayerCache class.
+"""
+import concurrent.futures
+import os
+import shutil
+
+import pytest
+
+from regi0.geographic.cache import LayerCache, PreparedLayer
+
+
+@pytest.fixture()
+def urban(data_path, tmp_path):
+    path = tmp_path.joinpath("urban.geojson")
+    shutil.copy(data_path.joinpath("geojson/urban.geojson"), path)
+    return path
+
+
+def test_hit(urban):
+    cache = LayerCache()
+    first = cache.get(urban)
+    second = cache.get(urban)
+    assert first is second
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_modified(urban):
+    cache = LayerCache()
+    first = cache.get(urban)
+    stat = urban.stat()
+    os.utime(urban, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    second = cache.get(urban)
+    assert first is not second
+    assert len(cache) == 1
+
+
+def test_max_entries(data_path, urban):
+    cache = LayerCache(max_entries=1)
+    cache.get(urban)
+    cache.get(data_path.joinpath("gpkg/admin0.gpkg"), layer="admin0_2018")
+    assert urban not in cache
+    assert cache.stats()["evictions"] == 1
+
+
+def test_max_bytes(data_path, urban):
+    cache = LayerCache(max_bytes=1)
+    cache.get(urban)
+    cache.get(data_path.joinpath("gpkg/admin0.gpkg"), layer="admin0_2018")
+    assert len(cache) == 1
+    assert (data_path.joinpath("gpkg/admin0.gpkg"), "admin0_2018") in cache
+
+
+def test_clear(urban):
+    cache = LayerCache()
+    cache.get(urban)
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.stats()["misses"] == 0
+
+
+def test_trim(data_path, urban):
+    cache = LayerCache()
+    prepared = cache.get(urban)
+    cache.get(data_path.joinpath("gpkg/admin0.gpkg"), layer="admin0_2018")
+    cache.max_bytes = cache.stats()["nbytes"]
+    prepared.rasterize()
+    cache.trim()
+    assert urban not in cache
+    assert cache.stats()["evictions"] == 1
+
+
+def test_contains_prepared(urban):
+    cache = LayerCache()
+    prepared = cache.get(urban)
+    assert prepared in cache
+    assert PreparedLayer(prepared.gdf) not in cache
+
+
+def test_rasterize_threads(urban):
+    prepared = LayerCache().get(urban)
+    nbytes = prepared.nbytes
+    with concurrent.futures.ThreadPoolExecutor(4) as executor:
+        grids = list(executor.map(lambda _: prepared.rasterize(), range(4)))
+    assert all(grid is grids[0] for grid in grids)
+    codes, edges, _ = grids[0]
+    assert prepared.nbytes == nbytes + codes.nbytes + edges.nbytes
+
+
+def test_rasterize_resolution(urban):
+    prepared = LayerCache().get(urban)
+    with pytest.raises(ValueError):
+        prepared.rasterize(0)
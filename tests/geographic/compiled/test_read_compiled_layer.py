@@ -0,0 +1,76 @@
+"""
+Test cases for the regi0.geographic.compiled.read_compiled_layer function.
+"""
+import os
+
+import geopandas as gpd
+import pandas as pd
+import pytest
+
+from regi0.geographic.compiled import compile_layer, is_compiled, read_compiled_layer
+
+
+@pytest.fixture()
+def admin1(data_path):
+    return data_path.joinpath("shp/admin1_2003.shp")
+
+
+def test_roundtrip(admin1, tmp_path):
+    compile_layer(admin1, cache_dir=tmp_path)
+    result = read_compiled_layer(admin1, cache_dir=tmp_path)
+    expected = gpd.read_file(admin1)
+    pd.testing.assert_frame_equal(
+        pd.DataFrame(result.drop(columns="geometry")),
+        pd.DataFrame(expected.drop(columns="geometry")),
+    )
+    assert result.geom_equals(expected).all()
+    assert result.crs == expected.crs
+
+
+def test_geopackage(data_path, tmp_path):
+    path = data_path.joinpath("gpkg/admin0.gpkg")
+    compile_layer(path, layer="admin0_2018", cache_dir=tmp_path)
+    result = read_compiled_layer(path, layer="admin0_2018", cache_dir=tmp_path)
+    expected = gpd.read_file(path, layer="admin0_2018")
+    assert result["ISO_A2"].tolist() == expected["ISO_A2"].tolist()
+
+
+def test_bbox_columns(admin1, tmp_path):
+    compile_layer(admin1, cache_dir=tmp_path)
+    bbox = (-73.5, 5.5, -73.0, 6.0)
+    result = read_compiled_layer(
+        admin1, bbox=bbox, columns=["dptos"], cache_dir=tmp_path
+    )
+    expected = gpd.read_file(admin1, bbox=bbox)
+    assert list(result.columns) == ["dptos", "geometry"]
+    assert sorted(result["dptos"]) == sorted(expected["dptos"])
+
+
+def test_not_compiled(admin1, tmp_path):
+    with pytest.raises(Exception):
+        read_compiled_layer(admin1, cache_dir=tmp_path)
+
+
+def test_stale(data_path, tmp_path):
+    path = tmp_path.joinpath("urban.geojson")
+    path.write_bytes(data_path.joinpath("geojson/urban.geojson").read_bytes())
+    compile_layer(path, cache_dir=tmp_path)
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    with pytest.raises(Exception):
+        read_compiled_layer(path, cache_dir=tmp_path)
+
+
+@pytest.mark.parametrize(
+    "compiled_layer,read_layer", [("admin0_2018", None), (None, "admin0_2018")]
+)
+def test_default_layer(data_path, tmp_path, compiled_layer, read_layer):
+    path = tmp_path.joinpath("admin0.gpkg")
+    expected = gpd.read_file(
+        data_path.joinpath("gpkg/admin0.gpkg"), layer="admin0_2018"
+    )
+    expected.to_file(path, layer="admin0_2018", driver="GPKG")
+    compile_layer(path, layer=compiled_layer, cache_dir=tmp_path)
+    assert is_compiled(path, layer=read_layer, cache_dir=tmp_path)
+    result = read_compiled_layer(path, layer=read_layer, cache_dir=tmp_path)
+    assert result["ISO_A2"].tolist() == expected["ISO_A2"].tolist()
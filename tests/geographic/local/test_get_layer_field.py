@@ -4,7 +4,10 @@ Test cases for the regi0.geographic.local.get_layer_field function.
 import geopandas as gpd
 import numpy as np
 import pandas as pd
+import pytest
+from shapely.geometry import Point, box
 
+from regi0.geographic import local
 from regi0.geographic.local import get_layer_field
 
 
@@ -146,3 +149,66 @@ def test_shapefile(records, data_path):
         ]
     )
     pd.testing.assert_series_equal(result, expected, check_names=False)
+
+
+def test_overlapping(records):
+    polygons = gpd.GeoDataFrame(
+        {"name": ["first", "second"]},
+        geometry=[box(-75, 4, -72, 7), box(-74, 5, -71, 8)],
+        crs="epsg:4326",
+    )
+    result = get_layer_field(records, polygons, field="name")
+    expected = gpd.sjoin(records, polygons, how="left", predicate="intersects")
+    expected = expected.sort_values("index_right")
+    expected = expected[~expected.index.duplicated()]["name"].sort_index()
+    assert len(result) == len(records)
+    pd.testing.assert_series_equal(result, expected, check_names=False)
+
+
+@pytest.mark.parametrize("resolution", [None, 0.5, 0.05])
+def test_raster(records, data_path, resolution):
+    path = data_path.joinpath("shp/admin1_2003.shp")
+    expected = get_layer_field(records, path, field="dptos")
+    result = get_layer_field(
+        records, path, field="dptos", mode="raster", resolution=resolution
+    )
+    pd.testing.assert_series_equal(result, expected)
+
+
+@pytest.mark.parametrize("resolution", [None, 1.0])
+def test_raster_edges(resolution):
+    polygons = gpd.GeoDataFrame(
+        {"name": ["box"]}, geometry=[box(0, 0, 4, 4)], crs="epsg:4326"
+    )
+    points = gpd.GeoDataFrame(
+        geometry=gpd.points_from_xy([4, 2, 4, 0, 5], [2, 0, 0, 4, 2]),
+        crs="epsg:4326",
+    )
+    expected = pd.Series(["box", "box", "box", "box", np.nan])
+    result = get_layer_field(
+        points, polygons, field="name", mode="raster", resolution=resolution
+    )
+    pd.testing.assert_series_equal(result, expected, check_names=False)
+
+
+def test_raster_point_layer():
+    layer = gpd.GeoDataFrame(
+        {"name": ["point"]}, geometry=[Point(1, 1)], crs="epsg:4326"
+    )
+    points = gpd.GeoDataFrame(
+        geometry=gpd.points_from_xy([1, 2, 1.5], [1, 2, 0.5]), crs="epsg:4326"
+    )
+    expected = get_layer_field(points, layer, field="name")
+    result = get_layer_field(points, layer, field="name", mode="raster")
+    pd.testing.assert_series_equal(result, expected)
+    assert result.tolist()[0] == "point"
+
+
+def test_raster_not_cached(records, monkeypatch):
+    polygons = gpd.GeoDataFrame(
+        {"name": ["box"]}, geometry=[box(-75, 4, -72, 7)], crs="epsg:4326"
+    )
+    trims = []
+    monkeypatch.setattr(local.layer_cache, "trim", lambda: trims.append(True))
+    get_layer_field(records, polygons, field="name", mode="raster")
+    assert not trims
@@ -1,8 +1,11 @@
 """
 Test cases for the regi0.geographic.local.get_layer_field_historical function.
 """
+import fiona
+import geopandas as gpd
 import numpy as np
 import pandas as pd
+import pytest
 
 from regi0.geographic.local import get_layer_field_historical
 
@@ -191,3 +194,65 @@ def test_folder(records, data_path):
         ]
     )
     pd.testing.assert_series_equal(result, expected, check_names=False)
+
+
+def test_n_jobs(records, data_path):
+    kwargs = dict(
+        date_col="eventDate",
+        field="dptos",
+        direction="nearest",
+        return_source=True,
+    )
+    expected, expected_source = get_layer_field_historical(
+        records, data_path.joinpath("shp/"), **kwargs
+    )
+    result, source = get_layer_field_historical(
+        records, data_path.joinpath("shp/"), n_jobs=2, **kwargs
+    )
+    pd.testing.assert_series_equal(result, expected)
+    pd.testing.assert_series_equal(source, expected_source)
+
+
+def test_lazy(records, data_path):
+    kwargs = dict(date_col="eventDate", field="dptos", direction="nearest")
+    expected = get_layer_field_historical(
+        records, data_path.joinpath("gpkg/admin1.gpkg"), lazy=False, **kwargs
+    )
+    result = get_layer_field_historical(
+        records, data_path.joinpath("gpkg/admin1.gpkg"), lazy=True, **kwargs
+    )
+    pd.testing.assert_series_equal(result, expected)
+
+
+def test_raster(records, data_path):
+    kwargs = dict(date_col="eventDate", field="dptos", direction="nearest")
+    expected = get_layer_field_historical(
+        records, data_path.joinpath("gpkg/admin1.gpkg"), **kwargs
+    )
+    result = get_layer_field_historical(
+        records, data_path.joinpath("gpkg/admin1.gpkg"), mode="raster", **kwargs
+    )
+    pd.testing.assert_series_equal(result, expected)
+
+
+@pytest.fixture
+def projected_path(data_path, tmp_path):
+    path = tmp_path.joinpath("admin1_projected.gpkg")
+    source = data_path.joinpath("gpkg/admin1.gpkg")
+    for layer in fiona.listlayers(source):
+        gdf = gpd.read_file(source, layer=layer).to_crs("epsg:3116")
+        gdf.to_file(path, layer=layer, driver="GPKG")
+    return path
+
+
+@pytest.mark.parametrize(
+    "params", [{"lazy": True}, {"lazy": False}, {"mode": "raster"}]
+)
+def test_projected(records, data_path, projected_path, params):
+    kwargs = dict(date_col="eventDate", field="dptos", direction="nearest")
+    expected = get_layer_field_historical(
+        records, data_path.joinpath("gpkg/admin1.gpkg"), **kwargs
+    )
+    result = get_layer_field_historical(records, projected_path, **params, **kwargs)
+    assert expected.notna().any()
+    pd.testing.assert_series_equal(result, expected)
@@ -3,6 +3,7 @@ Test cases for the regi0.geographic.local.intersects_layer function.
 """
 import geopandas as gpd
 import pandas as pd
+from shapely.geometry import box
 
 from regi0.geographic.local import intersects_layer
 
@@ -140,3 +141,12 @@ def test_shapefile(records, data_path):
         ]
     )
     pd.testing.assert_series_equal(result, expected, check_dtype=False)
+
+
+def test_overlapping(records):
+    polygons = gpd.GeoDataFrame(
+        geometry=[box(-75, 4, -72, 7), box(-74, 5, -71, 8)], crs="epsg:4326"
+    )
+    result = intersects_layer(records, polygons)
+    expected = records.intersects(polygons.unary_union)
+    pd.testing.assert_series_equal(result, expected, check_dtype=False)
@@ -1,6 +1,8 @@
 """
 Test cases for the regi0.geographic.local.intersects_layer_historical function.
 """
+from concurrent.futures import ThreadPoolExecutor
+
 import numpy as np
 import pandas as pd
 
@@ -186,3 +188,21 @@ def test_folder(records, data_path):
         ]
     )
     pd.testing.assert_series_equal(result, expected)
+
+
+def test_executor(records, data_path):
+    expected = intersects_layer_historical(
+        records,
+        data_path.joinpath("gpkg/admin1.gpkg"),
+        date_col="eventDate",
+        direction="nearest",
+    )
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        result = intersects_layer_historical(
+            records,
+            data_path.joinpath("gpkg/admin1.gpkg"),
+            date_col="eventDate",
+            direction="nearest",
+            executor=executor,
+        )
+    pd.testing.assert_series_equal(result, expected)
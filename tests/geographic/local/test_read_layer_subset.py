@@ -0,0 +1,26 @@
+"""
+Test cases for the regi0.geographic.local._read_layer_subset function.
+"""
+import shutil
+
+import pytest
+
+from regi0.geographic.local import _read_layer_subset
+
+
+@pytest.fixture()
+def admin1(data_path, tmp_path):
+    path = tmp_path.joinpath("admin1.gpkg")
+    shutil.copy(data_path.joinpath("gpkg/admin1.gpkg"), path)
+    return path
+
+
+def test_bbox(admin1):
+    result = _read_layer_subset(admin1, "admin1_2003", bbox=(-73.5, 5.5, -73.0, 6.0))
+    assert result["dptos"].tolist() == ["BOYACA"]
+
+
+def test_columns(admin1):
+    result = _read_layer_subset(admin1, "admin1_2003", columns=[])
+    assert result.columns.tolist() == ["geometry"]
+    assert len(result) == 2
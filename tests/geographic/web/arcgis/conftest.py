@@ -1,6 +1,9 @@
 """
 Configuration file for the regi0.geographic.web.arcgis module tests.
 """
+import json
+import time
+
 import pytest
 import requests
 
@@ -74,16 +77,82 @@ class BadRequest(requests.Response):
         self.status_code = 400
 
 
+class ServiceUnavailable(requests.Response):
+    def __init__(self):
+        super().__init__()
+        self.status_code = 503
+
+
+class PagedResponse(requests.Response):
+    def __init__(self, features, exceeded):
+        super().__init__()
+        self.status_code = 200
+        self.features = features
+        self.exceeded = exceeded
+
+    def json(self, **kwargs):
+        return {
+            "type": "FeatureCollection",
+            "features": self.features,
+            "properties": {"exceededTransferLimit": self.exceeded},
+        }
+
+
+class Recorder:
+    """
+    Records the parameters of each query and answers with the features of
+    SuccessResponse, one feature per page.
+    """
+
+    def __init__(self):
+        self.queries = []
+
+    def __call__(self, url, data=None, **kwargs):
+        self.queries.append(data)
+        features = SuccessResponse().json()["features"]
+        offset = data["resultOffset"] or 0
+        return PagedResponse(features[offset : offset + 1], offset + 1 < len(features))
+
+    @property
+    def n_points(self):
+        return [len(json.loads(query["geometry"])["points"]) for query in self.queries]
+
+
 @pytest.fixture()
 def success(monkeypatch):
-    monkeypatch.setattr(requests, "post", lambda *args, **kwargs: SuccessResponse())
+    monkeypatch.setattr(
+        requests.Session, "post", lambda *args, **kwargs: SuccessResponse()
+    )
 
 
 @pytest.fixture()
 def error(monkeypatch):
-    monkeypatch.setattr(requests, "post", lambda *args, **kwargs: ErrorResponse())
+    monkeypatch.setattr(
+        requests.Session, "post", lambda *args, **kwargs: ErrorResponse()
+    )
 
 
 @pytest.fixture()
 def bad_request(monkeypatch):
-    monkeypatch.setattr(requests, "post", lambda *args, **kwargs: BadRequest())
+    monkeypatch.setattr(requests.Session, "post", lambda *args, **kwargs: BadRequest())
+
+
+@pytest.fixture()
+def recorder(monkeypatch):
+    recorder = Recorder()
+    monkeypatch.setattr(requests.Session, "post", recorder)
+    return recorder
+
+
+@pytest.fixture()
+def flaky(monkeypatch):
+    responses = [ServiceUnavailable(), ServiceUnavailable()]
+
+    def post(*args, **kwargs):
+        if responses:
+            return responses.pop()
+        return SuccessResponse()
+
+    monkeypatch.setattr(requests.Session, "post", post)
+    monkeypatch.setattr(time, "sleep", lambda seconds: None)
+    return responses
@@ -5,7 +5,7 @@ import numpy as np
 import pandas as pd
 import pytest
 
-from regi0.geographic.web.arcgis import get_feature_layer_field
+from regi0.geographic.web.arcgis import FeatureCache, get_feature_layer_field
 
 
 def test_success(records, success):
@@ -59,3 +59,67 @@ def test_bad_request(records, error):
             "https://foobar.com/P3ePLMYs2RVChkJx/arcgis/rest/services/service/query",
             field="dptos",
         )
+
+
+def test_pagination(records, recorder):
+    result = get_feature_layer_field(
+        records,
+        "https://foobar.com/P3ePLMYs2RVChkJx/arcgis/rest/services/service/query",
+        field="dptos",
+        cell_size=100,
+        page_size=1,
+    )
+    assert [query["resultOffset"] for query in recorder.queries] == [None, 1]
+    assert [query["resultRecordCount"] for query in recorder.queries] == [1, 1]
+    assert result.value_counts().to_dict() == {"BOYACA": 10, "SANTANDER": 9}
+
+
+def test_chunks(records, recorder):
+    result = get_feature_layer_field(
+        records,
+        "https://foobar.com/P3ePLMYs2RVChkJx/arcgis/rest/services/service/query",
+        field="dptos",
+        max_points=5,
+        max_workers=2,
+    )
+    first_pages = [query["resultOffset"] is None for query in recorder.queries]
+    n_points = [n for n, first in zip(recorder.n_points, first_pages) if first]
+    assert max(n_points) <= 5
+    assert sum(n_points) == len(records.geometry.drop_duplicates())
+    assert result.value_counts().to_dict() == {"BOYACA": 10, "SANTANDER": 9}
+
+
+def test_cache(records, recorder):
+    url = "https://foobar.com/P3ePLMYs2RVChkJx/arcgis/rest/services/service/query"
+    cache = FeatureCache()
+    first = get_feature_layer_field(records, url, field="dptos", cache=cache)
+    assert {query["geometryType"] for query in recorder.queries} == {
+        "esriGeometryEnvelope"
+    }
+    assert len(cache) == 2
+
+    n_queries = len(recorder.queries)
+    second = get_feature_layer_field(records, url, field="dptos", cache=cache)
+    assert len(recorder.queries) == n_queries
+    pd.testing.assert_series_equal(first, second)
+    assert first.value_counts().to_dict() == {"BOYACA": 10, "SANTANDER": 9}
+
+    get_feature_layer_field(records, url, field="dptos", where="fid > 0", cache=cache)
+    assert len(recorder.queries) == 2 * n_queries
+
+
+def test_retry(records, flaky):
+    result = get_feature_layer_field(
+        records,
+        "https://foobar.com/P3ePLMYs2RVChkJx/arcgis/rest/services/service/query",
+        field="dptos",
+    )
+    assert not flaky
+    assert result.notna().sum() == 19
+
+
+def test_projected_cell_size(records, recorder):
+    url = "https://foobar.com/P3ePLMYs2RVChkJx/arcgis/rest/services/service/query"
+    get_feature_layer_field(records.to_crs("epsg:3116"), url, field="dptos")
+    n_chunks = sum(query["resultOffset"] is None for query in recorder.queries)
+    assert n_chunks < len(records.geometry.drop_duplicates()) / 2
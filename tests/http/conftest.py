@@ -0,0 +1,47 @@
+"""
+Configuration file for the regi0.http module tests.
+"""
+import http.server
+import threading
+
+import pytest
+
+from regi0 import http as regi0_http
+
+
+class StubHandler(http.server.BaseHTTPRequestHandler):
+    """
+    Answers with a fixed body. Paths starting with /flaky fail with a 503
+    status code every other request.
+    """
+
+    protocol_version = "HTTP/1.1"
+    calls = 0
+
+    def do_GET(self):
+        StubHandler.calls += 1
+        status = (
+            503 if self.path.startswith("/flaky") and StubHandler.calls % 2 else 200
+        )
+        body = self.headers.get("Accept-Encoding", "").encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture()
+def server():
+    StubHandler.calls = 0
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    regi0_http.configure(backoff_factor=0)
+    regi0_http.reset_stats()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+    regi0_http.configure()
+    regi0_http.reset_stats()
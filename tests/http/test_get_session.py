@@ -0,0 +1,33 @@
+"""
+Test cases for the regi0.http.get_session function.
+"""
+from regi0 import http
+
+
+def test_shared(server):
+    assert http.get_session() is http.get_session()
+
+
+def test_configure(server):
+    session = http.get_session()
+    http.configure(pool_size=4, timeout=5)
+    new_session = http.get_session()
+    assert new_session is not session
+    assert new_session.timeout == 5
+    assert new_session.get_adapter(server)._pool_maxsize == 4
+
+
+def test_gzip(server):
+    response = http.get_session().get(server)
+    assert "gzip" in response.text
+
+
+def test_retry(server):
+    response = http.get_session().get(f"{server}/flaky")
+    assert response.status_code == 200
+
+
+def test_no_retry(server):
+    http.configure(max_retries=0)
+    response = http.get_session().get(f"{server}/flaky")
+    assert response.status_code == 503
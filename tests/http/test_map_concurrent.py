@@ -0,0 +1,26 @@
+"""
+Test cases for the regi0.http.map_concurrent function.
+"""
+import time
+
+from regi0.http import map_concurrent
+
+
+def slow_square(x):
+    time.sleep(0.01 * (5 - x))
+    return x ** 2
+
+
+def test_sequential():
+    assert map_concurrent(slow_square, range(5)) == [0, 1, 4, 9, 16]
+
+
+def test_concurrent():
+    assert map_concurrent(slow_square, range(5), max_workers=5) == [0, 1, 4, 9, 16]
+
+
+def test_rate_limit():
+    start = time.monotonic()
+    result = map_concurrent(lambda x: x, range(25), max_workers=3, rate_limit=20)
+    assert result == list(range(25))
+    assert time.monotonic() - start >= 0.2
@@ -0,0 +1,30 @@
+"""
+Test cases for the regi0.http.RateLimiter class.
+"""
+import time
+
+from regi0.http import RateLimiter
+
+
+def test_burst():
+    limiter = RateLimiter(rate=10, capacity=5)
+    start = time.monotonic()
+    for _ in range(5):
+        limiter.acquire()
+    assert time.monotonic() - start < 0.05
+
+
+def test_rate():
+    limiter = RateLimiter(rate=50, capacity=1)
+    start = time.monotonic()
+    for _ in range(6):
+        limiter.acquire()
+    assert time.monotonic() - start >= 0.09
+
+
+def test_unlimited():
+    limiter = RateLimiter()
+    start = time.monotonic()
+    for _ in range(1000):
+        limiter.acquire()
+    assert time.monotonic() - start < 0.05
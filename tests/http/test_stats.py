@@ -0,0 +1,31 @@
+"""
+Test cases for the regi0.http.stats function.
+"""
+from regi0 import http
+
+
+def test_stats(server):
+    session = http.get_session()
+    for _ in range(3):
+        session.get(server)
+    host = server.split("//")[1]
+    stats = http.stats()[host]
+    assert stats["requests"] == 3
+    assert stats["errors"] == 0
+    assert stats["bytes"] == 3 * len("gzip, deflate")
+    assert stats["mean_seconds"] == stats["seconds"] / 3
+
+
+def test_errors(server):
+    http.configure(max_retries=0)
+    session = http.get_session()
+    session.get(f"{server}/flaky")
+    session.get(f"{server}/flaky")
+    host = server.split("//")[1]
+    assert http.stats()[host]["errors"] == 1
+
+
+def test_reset(server):
+    http.get_session().get(server)
+    http.reset_stats()
+    assert http.stats() == {}
@@ -0,0 +1,49 @@
+"""
+Test cases for the regi0.matching.get_pair_scores function.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from regi0.matching import get_pair_scores
+
+
+@pytest.fixture
+def left():
+    return pd.Series(["santander", "norte santander", "choco", np.nan, "choco"])
+
+
+@pytest.fixture
+def right():
+    return pd.Series(["santander", "norte de santander", "choco", "boyaca", "choco"])
+
+
+def test_ratio(left, right):
+    result = get_pair_scores(left, right, scorer="ratio")
+    assert result[0] == 100
+    assert 80 < result[1] < 100
+    assert result[3] == 0
+    assert result[2] == result[4]
+
+
+def test_token_set_ratio(left, right):
+    result = get_pair_scores(left, right, scorer="token_set_ratio")
+    assert result[1] == 100
+
+
+def test_jaro_winkler(left, right):
+    result = get_pair_scores(left, right, scorer="jaro_winkler")
+    assert result[0] == 100
+    assert 90 < result[1] < 100
+
+
+def test_index(left, right):
+    left.index = [10, 11, 12, 13, 14]
+    right.index = [10, 11, 12, 13, 14]
+    result = get_pair_scores(left, right)
+    assert result.index.tolist() == [10, 11, 12, 13, 14]
+
+
+def test_invalid_scorer(left, right):
+    with pytest.raises(ValueError):
+        get_pair_scores(left, right, scorer="foo")
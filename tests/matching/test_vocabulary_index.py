@@ -0,0 +1,80 @@
+"""
+Test cases for the regi0.matching.VocabularyIndex class.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from regi0.matching import VocabularyIndex
+
+
+@pytest.fixture
+def vocabulary():
+    return pd.Series(
+        [
+            "Bogotá, D.C.",
+            "Norte de Santander",
+            "Santander",
+            "Chocó",
+            "CHOCO",
+            "La Guajira",
+            "Putumayo",
+            np.nan,
+        ]
+    )
+
+
+def test_len(vocabulary):
+    assert len(VocabularyIndex(vocabulary)) == 6
+
+
+def test_search(vocabulary):
+    index = VocabularyIndex(vocabulary)
+    result = index.search(["NORTE SANTANDER", "Putumallo"], k=2)
+    assert result.index.tolist() == [0, 0, 1, 1]
+    assert result["candidate"].tolist()[0] == "Norte de Santander"
+    assert result["candidate"].tolist()[2] == "Putumayo"
+    assert result["rank"].tolist() == [1, 2, 1, 2]
+    assert (result["score"].diff().iloc[[1, 3]] <= 0).all()
+
+
+def test_threshold(vocabulary):
+    index = VocabularyIndex(vocabulary)
+    result = index.search("Guajira", k=5, threshold=0.7)
+    assert result["candidate"].tolist() == ["La Guajira"]
+
+
+def test_best_match(vocabulary):
+    index = VocabularyIndex(vocabulary)
+    values = pd.Series(["choco", "Bogota", "zzzz", np.nan], index=[5, 6, 7, 8])
+    result = index.best_match(values, scorer="token_set_ratio", threshold=0.5)
+    expected = pd.DataFrame(
+        {
+            "candidate": ["Chocó", "Bogotá, D.C.", np.nan, np.nan],
+            "score": [1.0, 1.0, np.nan, np.nan],
+        },
+        index=[5, 6, 7, 8],
+    )
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_candidates(vocabulary):
+    index = VocabularyIndex(vocabulary)
+    pruned = index.best_match("Santandr", n_candidates=2)
+    full = index.best_match("Santandr", n_candidates=None)
+    pd.testing.assert_frame_equal(pruned, full)
+
+
+def test_no_preprocess(vocabulary):
+    index = VocabularyIndex(vocabulary, preprocess=False)
+    assert len(index) == 7
+    result = index.best_match("CHOCO", scorer="jaro_winkler")
+    assert result["candidate"].tolist() == ["CHOCO"]
+
+
+def test_rarest_ngrams(vocabulary):
+    index = VocabularyIndex(vocabulary)
+    result = index.best_match(
+        ["Norte Santandr", "Putumallo"], n_candidates=2, n_grams=4
+    )
+    assert result["candidate"].tolist() == ["Norte de Santander", "Putumayo"]
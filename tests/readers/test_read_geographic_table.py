@@ -0,0 +1,37 @@
+"""
+Test cases for the regi0.readers.read_geographic_table function.
+"""
+import geopandas as gpd
+import pandas as pd
+import pytest
+
+from regi0.readers import read_geographic_table
+
+
+@pytest.mark.parametrize("reset_index", [True, False])
+def test_chunks(data_path, reset_index):
+    params = dict(
+        path=data_path.joinpath("csv/birds.csv"),
+        lon_col="decimalLongitude",
+        lat_col="decimalLatitude",
+        crs="epsg:4326",
+        drop_empty_coords=True,
+        reset_index=reset_index,
+    )
+    expected = read_geographic_table(**params)
+    chunks = list(read_geographic_table(**params, chunksize=5))
+    result = pd.concat(chunks)
+
+    assert len(chunks) == 5
+    assert all(isinstance(chunk, gpd.GeoDataFrame) for chunk in chunks)
+    assert all(chunk.crs == expected.crs for chunk in chunks)
+    assert len(result) < 24
+    assert result[["decimalLongitude", "decimalLatitude"]].notna().all().all()
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_chunks_unsupported(tmp_path):
+    path = tmp_path.joinpath("records.xlsx")
+    pd.DataFrame({"lon": [-74.0], "lat": [4.6]}).to_excel(path, index=False)
+    with pytest.raises(ValueError):
+        read_geographic_table(path, "lon", "lat", chunksize=5)
@@ -0,0 +1,25 @@
+"""
+Test cases for the regi0.taxonomic._helpers.build_result function.
+"""
+import numpy as np
+import pandas as pd
+
+from regi0.taxonomic._helpers import build_result
+
+
+def test_records():
+    result = build_result([{"a": 1, "b": "x"}, {}, {"c": "y", "a": 2}])
+    expected = pd.DataFrame(
+        {"a": [1, np.nan, 2], "b": ["x", np.nan, np.nan], "c": [np.nan, np.nan, "y"]}
+    )
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_columns():
+    result = build_result([{"z": 1, "id": 2, "b": 3}], columns=["id", "name"])
+    assert result.columns.tolist() == ["id", "name", "z", "b"]
+
+
+def test_empty():
+    result = build_result([], columns=["id", "name"])
+    assert result.shape == (0, 2)
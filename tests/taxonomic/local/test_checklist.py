@@ -0,0 +1,154 @@
+"""
+Test cases for the regi0.taxonomic.local.Checklist class.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from regi0.taxonomic.local import Checklist, get_checklist_fields, is_in_checklist
+
+
+@pytest.fixture
+def checklist():
+    return pd.DataFrame(
+        {
+            "species": [
+                "Panthera onca",
+                "Puma concolor",
+                "Tremarctos ornatus",
+                "Panthera onca",
+                np.nan,
+            ],
+            "cites": ["I", "II", "I", "III", "III"],
+            "endemic": [False, False, False, True, True],
+        }
+    )
+
+
+@pytest.fixture
+def names():
+    return pd.Series(
+        ["Puma concolor", np.nan, "Homo sapiens", "Panthera onca", "Puma concolor"],
+        index=[3, 4, 5, 6, 7],
+    )
+
+
+def test_get_fields(checklist, names):
+    result = Checklist(checklist, "species").get_fields(
+        names, ["cites", "endemic", "foo"], add_supplied_names=True
+    )
+    expected = pd.DataFrame(
+        {
+            "cites": ["II", np.nan, np.nan, "I", "II"],
+            "endemic": [False, np.nan, np.nan, False, False],
+            "foo": pd.NA,
+            "supplied_name": names.tolist(),
+        }
+    )
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_get_fields_unique(checklist, names):
+    result = Checklist(checklist, "species").get_fields(names, "cites", expand=False)
+    expected = pd.DataFrame({"cites": ["II", np.nan, np.nan, "I"]})
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_contains(checklist, names):
+    result = Checklist(checklist, "species").contains(names)
+    expected = pd.DataFrame(
+        {"in_checklist": pd.array([True, pd.NA, False, True, True], dtype="boolean")},
+        index=[3, 4, 5, 6, 7],
+    )
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_standardize(checklist):
+    names = pd.Series(["PANTHERA ONCA", "puma  concolor", "Homo sapiens"])
+    exact = Checklist(checklist, "species").contains(names)
+    standardized = Checklist(checklist, "species", standardize=True).contains(names)
+    assert exact["in_checklist"].tolist() == [False, False, False]
+    assert standardized["in_checklist"].tolist() == [True, True, False]
+
+
+def test_functions(checklist, names):
+    indexed = Checklist(checklist, "species")
+    pd.testing.assert_frame_equal(
+        get_checklist_fields(names, indexed, "species", "cites"),
+        indexed.get_fields(names, "cites"),
+    )
+    pd.testing.assert_frame_equal(
+        is_in_checklist(names, indexed, "species"), indexed.contains(names)
+    )
+
+
+def test_save_load(checklist, names, tmp_path):
+    path = tmp_path.joinpath("checklist.pkl")
+    Checklist(checklist, "species", standardize=True).save(path)
+    loaded = Checklist.load(path)
+    assert len(loaded) == 3
+    assert loaded.contains(["PUMA CONCOLOR"])["in_checklist"].tolist() == [True]
+
+
+@pytest.fixture
+def other():
+    return pd.DataFrame(
+        {
+            "species": ["Puma concolor", "Ara macao", "Tremarctos ornatus"],
+            "cites": ["I", "I", np.nan],
+        }
+    )
+
+
+def test_merge_keep_first(checklist, other):
+    merged = Checklist.merge(
+        [checklist, other], "species", fields="cites", sources=["a", "b"]
+    )
+    result = merged.get_fields(
+        ["Puma concolor", "Ara macao", "Tremarctos ornatus", "Homo sapiens"],
+        "cites",
+        add_source=True,
+    )
+    expected = pd.DataFrame(
+        {"cites": ["II", "I", "I", np.nan], "source": ["a", "b", "a", np.nan]}
+    )
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_merge_keep_last(checklist, other):
+    merged = Checklist.merge(
+        [checklist, other], "species", fields="cites", keep_first=False
+    )
+    result = merged.get_fields(
+        ["Puma concolor", "Tremarctos ornatus"], "cites", add_source=True
+    )
+    expected = pd.DataFrame({"cites": ["I", "I"], "source": ["1", "0"]})
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_source_unavailable(checklist):
+    with pytest.raises(ValueError):
+        Checklist(checklist, "species").contains(["Puma concolor"], add_source=True)
+
+
+def test_get_fields_fuzzy(checklist):
+    names = pd.Series(["Puma concolor", "Panthera onka", "Tremarctos ornatvs", "Homo"])
+    result = Checklist(checklist, "species").get_fields(names, "cites", fuzzy=True)
+    assert result["cites"].tolist()[:3] == ["II", "I", "I"]
+    assert result["matched_name"].tolist()[:3] == [
+        "Puma concolor",
+        "Panthera onca",
+        "Tremarctos ornatus",
+    ]
+    assert result["match_score"].iloc[0] == 1.0
+    assert (result["match_score"].iloc[1:3] < 1.0).all()
+    assert result.iloc[3].isna().all()
+
+
+def test_get_checklist_fields_fuzzy(checklist):
+    indexed = Checklist(checklist, "species")
+    names = ["Panthera onka", "Pumma concolor"]
+    result = get_checklist_fields(names, checklist, "species", "cites", fuzzy=True)
+    expected = indexed.get_fields(names, "cites", fuzzy=True)
+    pd.testing.assert_frame_equal(result, expected)
+    assert indexed._vocabulary_index is not None
@@ -0,0 +1,61 @@
+"""
+Test cases for the regi0.taxonomic.local.get_checklist_fields_multiple function.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from regi0.taxonomic.local import get_checklist_fields_multiple
+
+
+@pytest.fixture
+def filenames(tmp_path):
+    first = pd.DataFrame(
+        {
+            "species": ["Panthera onca", "Puma concolor", "Ara macao"],
+            "cites": ["I", np.nan, "I"],
+        }
+    )
+    second = pd.DataFrame(
+        {"species": ["Puma concolor", "Ara macao"], "cites": ["II", "III"]}
+    )
+    first.to_csv(tmp_path.joinpath("first.csv"), index=False)
+    second.to_csv(tmp_path.joinpath("second.csv"), index=False)
+    return [tmp_path.joinpath("first.csv"), tmp_path.joinpath("second.csv")]
+
+
+@pytest.fixture
+def names():
+    return pd.Series(["Puma concolor", "Ara macao", "Homo sapiens", "Ara macao"])
+
+
+def test_keep_first(filenames, names):
+    result = get_checklist_fields_multiple(
+        names, filenames, "species", "cites", add_source=True
+    )
+    expected = pd.DataFrame(
+        {
+            "cites": ["II", "I", np.nan, "I"],
+            "source": ["second", "first", np.nan, "first"],
+        }
+    )
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_keep_last(filenames, names):
+    result = get_checklist_fields_multiple(
+        names,
+        filenames,
+        "species",
+        "cites",
+        add_supplied_names=True,
+        expand=False,
+        keep_first=False,
+    )
+    expected = pd.DataFrame(
+        {
+            "cites": ["II", "III", np.nan],
+            "supplied_name": ["Puma concolor", "Ara macao", "Homo sapiens"],
+        }
+    )
+    pd.testing.assert_frame_equal(result, expected)
@@ -0,0 +1,38 @@
+"""
+Test cases for the regi0.taxonomic.local.is_in_checklist_multiple function.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from regi0.taxonomic.local import is_in_checklist_multiple
+
+
+@pytest.fixture
+def filenames(tmp_path):
+    first = pd.DataFrame({"species": ["Panthera onca", "Puma concolor"]})
+    second = pd.DataFrame({"species": ["Puma concolor", "Ara macao"]})
+    first.to_csv(tmp_path.joinpath("first.csv"), index=False)
+    second.to_csv(tmp_path.joinpath("second.csv"), index=False)
+    return [tmp_path.joinpath("first.csv"), tmp_path.joinpath("second.csv")]
+
+
+def test_keep_first(filenames):
+    names = pd.Series(["Puma concolor", "Ara macao", "Homo sapiens"])
+    result = is_in_checklist_multiple(names, filenames, "species", add_source=True)
+    expected = pd.DataFrame(
+        {
+            "in_checklist": [True, True, False],
+            "source": ["first", "second", np.nan],
+        }
+    )
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_missing_names(filenames):
+    names = pd.Series(["Puma concolor", None, "Homo sapiens"])
+    result = is_in_checklist_multiple(names, filenames, "species", keep_first=False)
+    expected = pd.DataFrame(
+        {"in_checklist": pd.Series([True, pd.NA, False], dtype=object)}
+    )
+    pd.testing.assert_frame_equal(result, expected)
@@ -1,6 +1,7 @@
 """
 Test cases for the regi0.taxonomic.parsing.clean_names function.
 """
+import numpy as np
 import pandas as pd
 
 from regi0.taxonomic.parsing import get_canonical_name
@@ -62,3 +63,14 @@ def test_qualifiers():
         ]
     )
     pd.testing.assert_series_equal(get_canonical_name(names), expected)
+
+
+def test_repeated_names():
+    names = pd.Series(
+        ["Nucula sp.", np.nan, "Panthera onca (Linnaeus, 1758)", "Nucula sp."],
+        index=[10, 11, 12, 13],
+    )
+    expected = pd.Series(
+        ["Nucula", "", "Panthera onca", "Nucula"], index=[10, 11, 12, 13]
+    )
+    pd.testing.assert_series_equal(get_canonical_name(names), expected)
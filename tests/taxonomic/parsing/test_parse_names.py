@@ -0,0 +1,93 @@
+"""
+Test cases for the regi0.taxonomic.parsing.parse_names function.
+"""
+import numpy as np
+import pandas as pd
+
+from regi0.taxonomic.parsing import parse_names
+
+
+def test_authorship():
+    names = pd.Series(
+        [
+            "Caluromys lanatus (Olfers, 1818)",
+            "Estola vulgaris Galileo & Martins, 1999",
+            "Puma concolor L.",
+            "Panthera onca",
+        ]
+    )
+    result = parse_names(names)
+    expected = pd.DataFrame(
+        {
+            "genus": ["Caluromys", "Estola", "Puma", "Panthera"],
+            "specific_epithet": ["lanatus", "vulgaris", "concolor", "onca"],
+            "authorship": [
+                "(Olfers, 1818)",
+                "Galileo & Martins, 1999",
+                "L.",
+                np.nan,
+            ],
+            "year": pd.array([1818, 1999, pd.NA, pd.NA], dtype="Int64"),
+        }
+    )
+    pd.testing.assert_frame_equal(result[expected.columns], expected)
+
+
+def test_infraspecific():
+    names = pd.Series(
+        [
+            "Quercus robur subsp. pedunculiflora (K.Koch) Menitsky",
+            "Poa annua var. reptans Hausskn.",
+            "Panthera leo persica (Meyer, 1826)",
+        ]
+    )
+    result = parse_names(names)
+    expected = pd.DataFrame(
+        {
+            "infraspecific_rank": ["subsp.", "var.", np.nan],
+            "infraspecific_epithet": ["pedunculiflora", "reptans", "persica"],
+            "authorship": ["(K.Koch) Menitsky", "Hausskn.", "(Meyer, 1826)"],
+            "canonical_name": [
+                "Quercus robur subsp. pedunculiflora",
+                "Poa annua var. reptans",
+                "Panthera leo persica",
+            ],
+        }
+    )
+    pd.testing.assert_frame_equal(result[expected.columns], expected)
+
+
+def test_qualifiers():
+    names = pd.Series(
+        [
+            "Caenolestes aff. convelatus Anthony, 1924",
+            "Petrolisthes sp. nov. aff. rufescens",
+            "Unio spp.",
+            "Agenus? album",
+            "Aus bus ssp. nov.",
+        ]
+    )
+    result = parse_names(names)
+    expected = pd.DataFrame(
+        {
+            "qualifiers": ["aff.", "sp. nov.|aff.", "spp.", "?", "ssp. nov."],
+            "canonical_name": [
+                "Caenolestes convelatus",
+                "Petrolisthes rufescens",
+                "Unio",
+                "Agenus album",
+                "Aus bus",
+            ],
+        }
+    )
+    pd.testing.assert_frame_equal(result[expected.columns], expected)
+
+
+def test_missing_and_repeated():
+    names = pd.Series(
+        ["HOMO SAPIENS", np.nan, "Homo sapiens", "HOMO SAPIENS"], index=[5, 6, 7, 8]
+    )
+    result = parse_names(names)
+    assert result.index.tolist() == [5, 6, 7, 8]
+    assert result["canonical_name"].tolist()[::2] == ["Homo sapiens"] * 2
+    assert result.loc[6].isna().all()
@@ -0,0 +1,32 @@
+"""
+Configuration file for the regi0.taxonomic.web.aio module tests.
+"""
+import contextlib
+
+import pytest
+
+web = pytest.importorskip("aiohttp.web")
+
+
+@contextlib.asynccontextmanager
+async def _serve(routes):
+    """
+    Serves an aiohttp application with some routes on a random local
+    port and yields its base URL.
+    """
+    app = web.Application()
+    app.add_routes(routes)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = runner.addresses[0][1]
+    try:
+        yield f"http://127.0.0.1:{port}/"
+    finally:
+        await runner.cleanup()
+
+
+@pytest.fixture()
+def serve():
+    return _serve
@@ -0,0 +1,39 @@
+"""
+Test cases for the regi0.taxonomic.web.aio.get_distributions function.
+"""
+import asyncio
+
+import pytest
+
+from regi0.taxonomic.web import aio, speciesplus
+
+web = pytest.importorskip("aiohttp.web")
+
+
+async def distributions(request):
+    if request.match_info["id"] == "1":
+        return web.json_response(None, status=500)
+    return web.json_response(
+        [
+            {
+                "id": 1,
+                "iso_code2": "CO",
+                "name": "Colombia",
+                "type": "COUNTRY",
+                "tags": [],
+                "references": [],
+            }
+        ]
+    )
+
+
+def test_unknown_id(monkeypatch, serve):
+    async def main():
+        routes = [web.get("/taxon_concepts/{id}/distributions", distributions)]
+        async with serve(routes) as url:
+            monkeypatch.setattr(speciesplus, "API_URL", url)
+            return await aio.get_distributions([1, 2], "token", expand=False)
+
+    result = asyncio.run(main())
+    assert result["iso_code2"].tolist()[1] == "CO"
+    assert result.loc[0].isna().all()
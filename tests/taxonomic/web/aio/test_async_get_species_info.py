@@ -0,0 +1,50 @@
+"""
+Test cases for the regi0.taxonomic.web.aio.get_species_info function.
+"""
+import asyncio
+
+import pytest
+
+from regi0.taxonomic.web import aio, iucn
+
+web = pytest.importorskip("aiohttp.web")
+
+
+async def species(request):
+    name = request.match_info["name"]
+    if request.query.get("token") != "token":
+        return web.json_response({"message": "Token not valid!"})
+    if name == "Unknown":
+        return web.json_response({"name": name, "result": []})
+    await asyncio.sleep(0.01 * len(name))
+    return web.json_response(
+        {"name": name, "result": [{"scientific_name": name, "category": "LC"}]}
+    )
+
+
+def run(monkeypatch, serve, names, token="token"):
+    async def main():
+        async with serve([web.get("/species/{name}", species)]) as url:
+            monkeypatch.setattr(iucn, "API_URL", url)
+            return await aio.get_species_info(names, token, add_supplied_names=True)
+
+    return asyncio.run(main())
+
+
+def test_success(monkeypatch, serve):
+    names = ["Panthera onca", "Ara", None, "Unknown", "Ara"]
+    result = run(monkeypatch, serve, names)
+    assert result["scientific_name"].tolist()[:2] == ["Panthera onca", "Ara"]
+    assert result["scientific_name"].isna().tolist() == [
+        False,
+        False,
+        True,
+        True,
+        False,
+    ]
+    assert result["category"].tolist()[-1] == "LC"
+
+
+def test_unauthorized(monkeypatch, serve):
+    with pytest.raises(Exception):
+        run(monkeypatch, serve, ["Panthera onca"], token="other")
@@ -0,0 +1,115 @@
+"""
+Test cases for the regi0.taxonomic.web.aio.get_taxon_concept function.
+"""
+import asyncio
+import threading
+
+import pytest
+
+
+from regi0.taxonomic.web import aio, cache, speciesplus
+
+web = pytest.importorskip("aiohttp.web")
+
+
+async def taxon_concepts(request):
+    name = request.query["name"]
+    if name == "Unknown":
+        return web.json_response({"taxon_concepts": []})
+    return web.json_response(
+        {
+            "taxon_concepts": [
+                {
+                    "id": 1,
+                    "author_year": "(Linnaeus, 1758)",
+                    "updated_at": "2020-01-01",
+                    "cites_listing": "II",
+                    "common_names": [],
+                    "synonyms": [],
+                },
+                {
+                    "id": 2,
+                    "author_year": "(Linnaeus, 1758)",
+                    "updated_at": "2021-01-01",
+                    "cites_listing": "I",
+                    "common_names": [{"name": "Jaguar"}, {"name": "Tigre"}],
+                    "synonyms": [{"full_name": "Felis onca", "rank": "SPECIES"}],
+                    "higher_taxa": {"kingdom": "Animalia", "family": "Felidae"},
+                },
+            ]
+        }
+    )
+
+
+def test_success(monkeypatch, serve):
+    async def main():
+        async with serve([web.get("/taxon_concepts", taxon_concepts)]) as url:
+            monkeypatch.setattr(speciesplus, "API_URL", url)
+            return await aio.get_taxon_concept(
+                ["Panthera onca", "Unknown"], "token", expand=False
+            )
+
+    result = asyncio.run(main())
+    assert result.columns.tolist() == [
+        "id",
+        "author_year",
+        "cites_listing",
+        "common_names",
+        "synonyms",
+        "kingdom",
+        "family",
+    ]
+    assert result.loc[0, "id"] == 2
+    assert result.loc[0, "common_names"] == "Jaguar|Tigre"
+    assert result.loc[0, "synonyms"] == "Felis onca"
+    assert result.loc[1].isna().all()
+
+
+async def server_error(request):
+    return web.json_response(None, status=500)
+
+
+def test_server_error(monkeypatch, serve):
+    aiohttp = pytest.importorskip("aiohttp")
+
+    async def main():
+        async with serve([web.get("/taxon_concepts", server_error)]) as url:
+            monkeypatch.setattr(speciesplus, "API_URL", url)
+            return await aio.get_taxon_concept(["Panthera onca"], "token")
+
+    with pytest.raises(aiohttp.ClientResponseError):
+        asyncio.run(main())
+
+
+class ThreadRecordingCache:
+    def __init__(self):
+        self.values = {}
+        self.threads = set()
+
+    def get(self, key):
+        self.threads.add(threading.get_ident())
+        return self.values.get(key)
+
+    def set(self, key, value):
+        self.threads.add(threading.get_ident())
+        self.values[key] = value
+
+
+def test_cache_off_loop(monkeypatch, serve):
+    web_cache = ThreadRecordingCache()
+
+    async def main():
+        async with serve([web.get("/taxon_concepts", taxon_concepts)]) as url:
+            monkeypatch.setattr(speciesplus, "API_URL", url)
+            first = await aio.get_taxon_concept(["Panthera onca"], "token")
+            second = await aio.get_taxon_concept(["Panthera onca"], "token")
+            return first, second
+
+    cache.enable(web_cache)
+    try:
+        first, second = asyncio.run(main())
+    finally:
+        cache.disable()
+    assert len(web_cache.values) == 1
+    assert threading.get_ident() not in web_cache.threads
+    assert first.equals(second)
@@ -0,0 +1,104 @@
+"""
+Test cases for the regi0.taxonomic.web.aio.resolve function.
+"""
+import asyncio
+
+import pandas as pd
+import pytest
+
+from regi0.taxonomic.web import aio, cache, gnr
+
+web = pytest.importorskip("aiohttp.web")
+
+
+async def echo(request):
+    names = (await request.json())["data"].split("\n")
+    data = [
+        {"supplied_name_string": name, "results": [{"canonical_form": name}]}
+        if name != "Unknown"
+        else {"supplied_name_string": name, "is_known_name": False}
+        for name in names
+    ]
+    await asyncio.sleep(0.01 * len(names))
+    return web.json_response({"data": data})
+
+
+async def error(request):
+    return web.Response(status=503)
+
+
+def test_success(monkeypatch, serve):
+    async def main():
+        async with serve([web.post("/", echo)]) as url:
+            monkeypatch.setattr(gnr, "API_URL", url)
+            return await aio.resolve(
+                ["Panthera onca", None, "Unknown", "Panthera onca", "Tapirus"],
+                best_match_only=True,
+                batch_size=2,
+            )
+
+    result = asyncio.run(main())
+    expected = pd.DataFrame(
+        {
+            "canonical_form": ["Panthera onca", None, None, "Panthera onca", "Tapirus"],
+            "supplied_name_string": [
+                "Panthera onca",
+                None,
+                "Unknown",
+                "Panthera onca",
+                "Tapirus",
+            ],
+        }
+    )
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_bad_request(monkeypatch, serve):
+    async def main():
+        async with serve([web.post("/", error)]) as url:
+            monkeypatch.setattr(gnr, "API_URL", url)
+            return await aio.resolve(["Panthera onca"], backoff_factor=0)
+
+    with pytest.raises(Exception):
+        asyncio.run(main())
+
+
+def test_retry(monkeypatch, serve):
+    n_requests = 0
+
+    async def flaky(request):
+        nonlocal n_requests
+        n_requests += 1
+        if n_requests <= 2:
+            return web.Response(status=503)
+        return await echo(request)
+
+    async def main():
+        async with serve([web.post("/", flaky)]) as url:
+            monkeypatch.setattr(gnr, "API_URL", url)
+            return await aio.resolve(["Panthera onca"], backoff_factor=0)
+
+    result = asyncio.run(main())
+    assert n_requests == 3
+    assert result["canonical_form"].tolist() == ["Panthera onca"]
+
+
+def test_cache_with_context(monkeypatch, serve, tmp_path):
+    batches = []
+
+    async def recorder(request):
+        batches.append((await request.json())["data"].split("\n"))
+        return await echo(request)
+
+    async def main():
+        async with serve([web.post("/", recorder)]) as url:
+            monkeypatch.setattr(gnr, "API_URL", url)
+            await aio.resolve(["Panthera onca", "Tapirus"], with_context=True)
+            await aio.resolve(["Panthera onca", "Unknown"], with_context=True)
+
+    cache.enable(cache.SQLiteCache(tmp_path.joinpath("web.sqlite")))
+    try:
+        asyncio.run(main())
+    finally:
+        cache.disable()
+    assert batches == [["Panthera onca", "Tapirus"], ["Panthera onca", "Unknown"]]
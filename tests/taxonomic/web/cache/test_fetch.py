@@ -0,0 +1,46 @@
+"""
+Test cases for the regi0.taxonomic.web.cache.fetch function.
+"""
+import pytest
+
+from regi0.taxonomic.web import cache
+
+
+@pytest.fixture()
+def web_cache(tmp_path):
+    web_cache = cache.SQLiteCache(tmp_path.joinpath("web.sqlite"))
+    cache.enable(web_cache)
+    yield web_cache
+    cache.disable()
+
+
+def test_disabled():
+    calls = []
+    for _ in range(2):
+        cache.fetch("endpoint", "Panthera onca", None, lambda: calls.append(1) or 1)
+    assert len(calls) == 2
+
+
+def test_enabled(web_cache):
+    calls = []
+    for query in ["Panthera onca", " Panthera  onca"]:
+        result = cache.fetch(
+            "endpoint", query, {"a": 1}, lambda: calls.append(1) or {"id": 1}
+        )
+        assert result == {"id": 1}
+    assert len(calls) == 1
+    assert web_cache.stats()["hits"] == 1
+
+
+def test_params(web_cache):
+    calls = []
+    for params in [{"language": "EN"}, {"language": "ES"}]:
+        cache.fetch("endpoint", "Panthera onca", params, lambda: calls.append(1) or 1)
+    assert len(calls) == 2
+
+
+def test_offline(web_cache):
+    cache.enable(web_cache, offline=True)
+    with pytest.warns(UserWarning):
+        result = cache.fetch("endpoint", "Panthera onca", None, lambda: 1 / 0)
+    assert result is None
@@ -0,0 +1,71 @@
+"""
+Test cases for the regi0.taxonomic.web.cache.SQLiteCache class.
+"""
+import time
+
+from regi0.taxonomic.web.cache import SQLiteCache
+
+
+def test_hit(tmp_path):
+    cache = SQLiteCache(tmp_path.joinpath("web.sqlite"))
+    cache.set("key", {"result": [1, 2]})
+    assert cache.get("key") == {"result": [1, 2]}
+    assert cache.get("other") is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_persistent(tmp_path):
+    SQLiteCache(tmp_path.joinpath("web.sqlite")).set("key", [1])
+    cache = SQLiteCache(tmp_path.joinpath("web.sqlite"))
+    assert cache.get("key") == [1]
+
+
+def test_ttl(tmp_path, monkeypatch):
+    cache = SQLiteCache(tmp_path.joinpath("web.sqlite"), ttl=60)
+    cache.set("key", [1])
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now + 120)
+    assert cache.get("key") is None
+    assert len(cache) == 0
+
+
+def test_max_bytes(tmp_path):
+    cache = SQLiteCache(tmp_path.joinpath("web.sqlite"), max_bytes=15)
+    cache.set("first", "abcd")
+    cache.set("second", "efgh")
+    cache.set("third", "ijkl")
+    assert cache.get("first") is None
+    assert cache.get("third") == "ijkl"
+    assert cache.stats()["evictions"] == 1
+    assert cache.stats()["nbytes"] <= 15
+
+
+def test_clear(tmp_path):
+    cache = SQLiteCache(tmp_path.joinpath("web.sqlite"))
+    cache.set("key", [1])
+    cache.get("key")
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.stats()["hits"] == 0
+
+
+def test_running_nbytes(tmp_path):
+    cache = SQLiteCache(tmp_path.joinpath("web.sqlite"), max_bytes=15)
+    statements = []
+    cache._connection.set_trace_callback(statements.append)
+    cache.set("first", "abcd")
+    cache.set("first", "ab")
+    cache.set("second", "efgh")
+    assert not [statement for statement in statements if "SUM" in statement]
+    cache.set("third", "ijkl")
+    assert cache.get("first") is None
+    assert cache.stats()["nbytes"] == 12
+
+
+def test_running_nbytes_persistent(tmp_path):
+    SQLiteCache(tmp_path.joinpath("web.sqlite")).set("first", "abcd")
+    cache = SQLiteCache(tmp_path.joinpath("web.sqlite"), max_bytes=11)
+    cache.set("second", "efgh")
+    assert cache.get("first") is None
+    assert cache.stats()["evictions"] == 1
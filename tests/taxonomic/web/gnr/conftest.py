@@ -1,6 +1,8 @@
 """
 Configuration file for the regi0.taxonomic.web.gnr module tests.
 """
+import time
+
 import pytest
 import requests
 
@@ -112,16 +114,81 @@ class BadRequest(requests.Response):
         self.status_code = 503
 
 
+class EchoResponse(requests.Response):
+    def __init__(self, names):
+        super().__init__()
+        self.status_code = 200
+        self.names = names
+
+    def json(self, **kwargs):
+        return {
+            "data": [
+                {
+                    "supplied_name_string": name,
+                    "is_known_name": True,
+                    "results": [{"canonical_form": name}],
+                }
+                for name in self.names
+            ]
+        }
+
+
+class Recorder:
+    """
+    Records the names sent in each request and fails the first
+    `n_failures` requests with a 503 status code. The last `n_missing`
+    names of each request are left out of its response.
+    """
+
+    def __init__(self, n_failures=0, n_missing=0):
+        self.n_failures = n_failures
+        self.n_missing = n_missing
+        self.batches = []
+
+    def __call__(self, *args, **kwargs):
+        if self.n_failures:
+            self.n_failures -= 1
+            return BadRequest()
+        names = kwargs["json"]["data"].split("\n")
+        self.batches.append(names)
+        return EchoResponse(names[: len(names) - self.n_missing])
+
+
 @pytest.fixture()
 def success(monkeypatch):
-    monkeypatch.setattr(requests, "post", lambda *args, **kwargs: SuccessResponse())
+    monkeypatch.setattr(
+        requests.Session, "post", lambda *args, **kwargs: SuccessResponse()
+    )
 
 
 @pytest.fixture()
 def no_result(monkeypatch):
-    monkeypatch.setattr(requests, "post", lambda *args, **kwargs: NoResult())
+    monkeypatch.setattr(requests.Session, "post", lambda *args, **kwargs: NoResult())
 
 
 @pytest.fixture()
 def bad_request(monkeypatch):
-    monkeypatch.setattr(requests, "post", lambda *args, **kwargs: BadRequest())
+    monkeypatch.setattr(requests.Session, "post", lambda *args, **kwargs: BadRequest())
+    monkeypatch.setattr(time, "sleep", lambda seconds: None)
+
+
+@pytest.fixture()
+def recorder(monkeypatch):
+    recorder = Recorder()
+    monkeypatch.setattr(requests.Session, "post", recorder)
+    return recorder
+
+
+@pytest.fixture()
+def short(monkeypatch):
+    recorder = Recorder(n_missing=1)
+    monkeypatch.setattr(requests.Session, "post", recorder)
+    return recorder
+
+
+@pytest.fixture()
+def flaky(monkeypatch):
+    recorder = Recorder(n_failures=2)
+    monkeypatch.setattr(requests.Session, "post", recorder)
+    monkeypatch.setattr(time, "sleep", lambda seconds: None)
+    return recorder
@@ -4,6 +4,7 @@ Test cases for the regi0.taxonomic.web.gnr.resolve function.
 import pandas as pd
 import pytest
 
+from regi0.taxonomic.web import cache
 from regi0.taxonomic.web.gnr import resolve
 
 
@@ -66,3 +67,94 @@ def test_bad_request(bad_request):
         resolve(
             ["Panthera onca", "Tremarctos ornatus"], data_source_ids=["1"], expand=False
         )
+
+
+def test_batches(recorder):
+    names = [f"Species {i}" for i in range(25)]
+    result = resolve(names, batch_size=10, max_workers=3, expand=False)
+    assert sorted(len(batch) for batch in recorder.batches) == [5, 10, 10]
+    assert result["supplied_name_string"].tolist() == names
+    assert result["canonical_form"].tolist() == names
+
+
+def test_retry(flaky):
+    result = resolve(["Panthera onca"], expand=False)
+    assert result["canonical_form"].tolist() == ["Panthera onca"]
+    assert len(flaky.batches) == 1
+
+
+def test_max_retries(flaky):
+    with pytest.raises(Exception):
+        resolve(["Panthera onca"], max_retries=1, expand=False)
+
+
+def test_cache(recorder, tmp_path):
+    cache.enable(cache.SQLiteCache(tmp_path.joinpath("web.sqlite")))
+    try:
+        first = resolve(["Panthera onca", "Tremarctos ornatus"], expand=False)
+        second = resolve(["Tremarctos ornatus", "Puma concolor"], expand=False)
+    finally:
+        cache.disable()
+    assert recorder.batches == [
+        ["Panthera onca", "Tremarctos ornatus"],
+        ["Puma concolor"],
+    ]
+    assert first["canonical_form"].tolist() == ["Panthera onca", "Tremarctos ornatus"]
+    assert second["canonical_form"].tolist() == ["Tremarctos ornatus", "Puma concolor"]
+
+
+def test_offline(recorder, tmp_path):
+    cache.enable(cache.SQLiteCache(tmp_path.joinpath("web.sqlite")), offline=True)
+    try:
+        with pytest.warns(UserWarning):
+            result = resolve(["Panthera onca"], expand=False)
+    finally:
+        cache.disable()
+    assert recorder.batches == []
+    expected = pd.DataFrame({"supplied_name_string": ["Panthera onca"]})
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_short_response(short, tmp_path):
+    cache.enable(cache.SQLiteCache(tmp_path.joinpath("web.sqlite")))
+    try:
+        result = resolve(["Panthera onca", "Tremarctos ornatus"], expand=False)
+    finally:
+        cache.disable()
+    assert result["supplied_name_string"].tolist() == [
+        "Panthera onca",
+        "Tremarctos ornatus",
+    ]
+    assert result["canonical_form"].tolist()[0] == "Panthera onca"
+    assert pd.isna(result["canonical_form"].tolist()[1])
+
+
+def test_cache_with_context(recorder, tmp_path):
+    cache.enable(cache.SQLiteCache(tmp_path.joinpath("web.sqlite")))
+    try:
+        resolve(["Panthera onca", "Tremarctos ornatus"], with_context=True)
+        resolve(["Panthera onca", "Puma concolor"], with_context=True)
+    finally:
+        cache.disable()
+    assert recorder.batches == [
+        ["Panthera onca", "Tremarctos ornatus"],
+        ["Panthera onca", "Puma concolor"],
+    ]
+
+
+def test_offline_with_context(recorder, tmp_path):
+    path = tmp_path.joinpath("web.sqlite")
+    cache.enable(cache.SQLiteCache(path))
+    try:
+        resolve(["Panthera onca"], with_context=True)
+    finally:
+        cache.disable()
+    cache.enable(cache.SQLiteCache(path), offline=True)
+    try:
+        with pytest.warns(UserWarning):
+            result = resolve(["Panthera onca"], with_context=True, expand=False)
+    finally:
+        cache.disable()
+    assert recorder.batches == [["Panthera onca"]]
+    expected = pd.DataFrame({"supplied_name_string": ["Panthera onca"]})
+    pd.testing.assert_frame_equal(result, expected)
@@ -25,9 +25,9 @@ class Unauthorized(requests.Response):
 
 @pytest.fixture()
 def no_result(monkeypatch):
-    monkeypatch.setattr(requests, "get", lambda *args, **kwargs: NoResult())
+    monkeypatch.setattr(requests.Session, "get", lambda *args, **kwargs: NoResult())
 
 
 @pytest.fixture()
 def unauthorized(monkeypatch):
-    monkeypatch.setattr(requests, "get", lambda *args, **kwargs: Unauthorized())
+    monkeypatch.setattr(requests.Session, "get", lambda *args, **kwargs: Unauthorized())
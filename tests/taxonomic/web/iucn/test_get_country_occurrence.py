@@ -101,7 +101,7 @@ class SuccessResponse(requests.Response):
 
 @pytest.fixture()
 def success(monkeypatch):
-    monkeypatch.setattr(requests, "get", lambda *args, **kwargs: SuccessResponse())
+    monkeypatch.setattr(requests.Session, "get", lambda *args, **kwargs: SuccessResponse())
 
 
 def test_success(success):
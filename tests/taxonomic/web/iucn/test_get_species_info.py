@@ -1,10 +1,13 @@
 """
 Test cases for the regi0.taxonomic.web.iucn.get_species_info function.
 """
+import time
+
 import pandas as pd
 import pytest
 import requests
 
+from regi0.taxonomic.web import cache
 from regi0.taxonomic.web.iucn import get_species_info
 
 
@@ -55,7 +58,9 @@ class SuccessResponse(requests.Response):
 
 @pytest.fixture()
 def success(monkeypatch):
-    monkeypatch.setattr(requests, "get", lambda *args, **kwargs: SuccessResponse())
+    monkeypatch.setattr(
+        requests.Session, "get", lambda *args, **kwargs: SuccessResponse()
+    )
 
 
 def test_success(success):
@@ -113,3 +118,41 @@ def test_no_result(no_result):
 def test_unauthorized(unauthorized):
     with pytest.raises(Exception):
         get_species_info("Alouatta seniculus", token="551f4z6", expand=False)
+
+
+class NameResponse(requests.Response):
+    def __init__(self, name):
+        super().__init__()
+        self.status_code = 200
+        self.name = name
+
+    def json(self, **kwargs):
+        return {"name": self.name, "result": [{"scientific_name": self.name}]}
+
+
+def test_concurrent(monkeypatch):
+    def get(self, url, **kwargs):
+        name = url.rsplit("/", 1)[-1]
+        time.sleep(0.01 * len(name))
+        return NameResponse(name)
+
+    monkeypatch.setattr(requests.Session, "get", get)
+    names = ["Panthera onca", "Ara", "Alouatta seniculus", "Ara", "Tapirus"]
+    result = get_species_info(names, "token", max_workers=4)
+    assert result["scientific_name"].tolist() == names
+
+
+def test_cached_not_rate_limited(monkeypatch, tmp_path):
+    monkeypatch.setattr(
+        requests.Session, "get", lambda self, url, **kwargs: NameResponse("Ara")
+    )
+    names = [f"Species {i}" for i in range(20)]
+    cache.enable(cache.SQLiteCache(tmp_path.joinpath("web.sqlite")))
+    try:
+        get_species_info(names, "token", rate_limit=None)
+        start = time.perf_counter()
+        get_species_info(names, "token", rate_limit=1)
+        elapsed = time.perf_counter() - start
+    finally:
+        cache.disable()
+    assert elapsed < 1
@@ -12,4 +12,4 @@ class Unauthorized(requests.Response):
 
 @pytest.fixture()
 def unauthorized(monkeypatch):
-    monkeypatch.setattr(requests, "get", lambda *args, **kwargs: Unauthorized())
+    monkeypatch.setattr(requests.Session, "get", lambda *args, **kwargs: Unauthorized())
@@ -107,12 +107,12 @@ class NoResult(requests.Response):
 
 @pytest.fixture()
 def success(monkeypatch):
-    monkeypatch.setattr(requests, "get", lambda *args, **kwargs: SuccessResponse())
+    monkeypatch.setattr(requests.Session, "get", lambda *args, **kwargs: SuccessResponse())
 
 
 @pytest.fixture()
 def no_result(monkeypatch):
-    monkeypatch.setattr(requests, "get", lambda *args, **kwargs: NoResult())
+    monkeypatch.setattr(requests.Session, "get", lambda *args, **kwargs: NoResult())
 
 
 def test_success(success):
@@ -0,0 +1,165 @@
+"""
+Test cases for the regi0.taxonomic.web.speciesplus.get_full_records function.
+"""
+import collections
+
+import numpy as np
+import pandas as pd
+import pytest
+import requests
+
+from regi0.taxonomic.web.speciesplus import get_full_records
+
+
+class JSONResponse(requests.Response):
+    def __init__(self, content, status_code=200):
+        super().__init__()
+        self.status_code = status_code
+        self.content_ = content
+
+    def json(self, **kwargs):
+        return self.content_
+
+
+TAXON_CONCEPTS = {
+    "Tremarctos ornatus": 9567,
+    "Ursus ornatus": 9567,
+    "Panthera onca": 8716,
+}
+
+
+class Router:
+    """
+    Answers taxon concepts, distributions and references requests and
+    records the requests sent to each URL.
+    """
+
+    def __init__(self):
+        self.calls = collections.Counter()
+        self.urls = []
+
+    def __call__(self, url, params=None, **kwargs):
+        self.calls[url] += 1
+        self.urls.append(url)
+        if url.endswith("taxon_concepts"):
+            _id = TAXON_CONCEPTS.get(params["name"])
+            if _id is None:
+                return JSONResponse({"taxon_concepts": []})
+            return JSONResponse(
+                {
+                    "taxon_concepts": [
+                        {
+                            "id": _id,
+                            "author_year": "(Cuvier, 1825)",
+                            "updated_at": "2021-01-01T00:00:00.000Z",
+                            "cites_listing": "I",
+                            "common_names": [{"name": f"Name {_id}"}],
+                            "synonyms": [],
+                        }
+                    ]
+                }
+            )
+        _id = int(url.split("/")[-2])
+        if _id == 8716:
+            return JSONResponse(None, status_code=500)
+        if url.endswith("distributions"):
+            return JSONResponse(
+                [
+                    {
+                        "id": 1,
+                        "iso_code2": "CO",
+                        "name": "Colombia",
+                        "tags": [],
+                        "type": "COUNTRY",
+                        "references": [],
+                    }
+                ]
+            )
+        return JSONResponse(
+            [{"id": 2, "citation": "Cuvier, 1825.", "is_standard": True}]
+        )
+
+
+@pytest.fixture()
+def router(monkeypatch):
+    router = Router()
+    monkeypatch.setattr(requests.Session, "get", router)
+    return router
+
+
+def test_success(router):
+    names = pd.Series(
+        ["Tremarctos ornatus", "Ursus ornatus", np.nan, "Tremarctos ornatus"]
+    )
+    result = get_full_records(names, token="bsgkp2kagTzJdQuywXnefAbc")
+    expected = pd.DataFrame(
+        {
+            "id": [9567, 9567, np.nan, 9567],
+            "author_year": [
+                "(Cuvier, 1825)",
+                "(Cuvier, 1825)",
+                np.nan,
+                "(Cuvier, 1825)",
+            ],
+            "cites_listing": ["I", "I", np.nan, "I"],
+            "common_names": ["Name 9567", "Name 9567", np.nan, "Name 9567"],
+            "synonyms": ["", "", np.nan, ""],
+            "distribution_id": ["1", "1", np.nan, "1"],
+            "distribution_iso_code2": ["CO", "CO", np.nan, "CO"],
+            "distribution_name": ["Colombia", "Colombia", np.nan, "Colombia"],
+            "distribution_type": ["COUNTRY", "COUNTRY", np.nan, "COUNTRY"],
+            "reference_id": ["2", "2", np.nan, "2"],
+            "reference_citation": [
+                "Cuvier, 1825.",
+                "Cuvier, 1825.",
+                np.nan,
+                "Cuvier, 1825.",
+            ],
+            "reference_is_standard": ["True", "True", np.nan, "True"],
+        }
+    )
+    pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+
+
+def test_deduplicated_ids(router):
+    get_full_records(
+        ["Tremarctos ornatus", "Ursus ornatus"], token="bsgkp2kagTzJdQuywXnefAbc"
+    )
+    calls = {url.split("/")[-1]: count for url, count in router.calls.items()}
+    assert calls == {"taxon_concepts": 2, "distributions": 1, "references": 1}
+
+
+def test_pipelined(router):
+    get_full_records(
+        ["Tremarctos ornatus", "Panthera onca", "Unknown"],
+        token="bsgkp2kagTzJdQuywXnefAbc",
+        max_workers=1,
+    )
+    resources = [url.split("/")[-1] for url in router.urls]
+    assert resources == [
+        "taxon_concepts",
+        "distributions",
+        "references",
+        "taxon_concepts",
+        "distributions",
+        "references",
+        "taxon_concepts",
+    ]
+
+
+def test_no_result(router):
+    result = get_full_records(
+        ["Ceroxylon sasaimae", "Panthera onca"],
+        token="bsgkp2kagTzJdQuywXnefAbc",
+        add_supplied_names=True,
+        expand=False,
+    )
+    assert result["id"].tolist()[1] == 8716
+    assert np.isnan(result["id"].tolist()[0])
+    assert result["supplied_name"].tolist() == ["Ceroxylon sasaimae", "Panthera onca"]
+    assert not result.columns.str.startswith("distribution_").any()
+
+
+def test_unauthorized(unauthorized):
+    with pytest.raises(requests.HTTPError):
+        get_full_records("Tremarctos ornatus", token="csgkp2kagTzJdQuywXnefAbz")
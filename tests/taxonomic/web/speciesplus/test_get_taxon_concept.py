@@ -167,12 +167,14 @@ class NoResult(requests.Response):
 
 @pytest.fixture()
 def success(monkeypatch):
-    monkeypatch.setattr(requests, "get", lambda *args, **kwargs: SuccessResponse())
+    monkeypatch.setattr(
+        requests.Session, "get", lambda *args, **kwargs: SuccessResponse()
+    )
 
 
 @pytest.fixture()
 def no_result(monkeypatch):
-    monkeypatch.setattr(requests, "get", lambda *args, **kwargs: NoResult())
+    monkeypatch.setattr(requests.Session, "get", lambda *args, **kwargs: NoResult())
 
 
 def test_success(success):
@@ -191,17 +193,30 @@ def test_success(success):
             "synonyms": [
                 "Herpailurus yaguarondi|Felis yaguarondi|Herpailurus yagouaroundi|Puma yagouaroundi"
             ],
-            "class": ["Mammalia"],
-            "family": ["Felidae"],
             "kingdom": ["Animalia"],
-            "order": ["Carnivora"],
             "phylum": ["Chordata"],
+            "class": ["Mammalia"],
+            "order": ["Carnivora"],
+            "family": ["Felidae"],
             "supplied_name": ["Herpailurus yagouaroundi"],
         }
     )
     pd.testing.assert_frame_equal(result, expected, check_dtype=False)
 
 
+def test_rank_order(success):
+    result = get_taxon_concept(
+        "Herpailurus yagouaroundi", token="bsgkp2kagTzJdQuywXnefAbc", expand=False
+    )
+    assert result.columns.tolist()[-5:] == [
+        "kingdom",
+        "phylum",
+        "class",
+        "order",
+        "family",
+    ]
+
+
 def test_no_result(no_result):
     result = get_taxon_concept(
         "Ceroxylon sasaimae", token="bsgkp2kagTzJdQuywXnefAbc", expand=False
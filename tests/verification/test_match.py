@@ -96,3 +96,15 @@ def test_fuzzy_preprocess(left, right):
         [False, True, True, True, True, False, True, False, True, True, np.nan, np.nan]
     )
     pd.testing.assert_series_equal(result, expected, check_dtype=False)
+
+
+def test_fuzzy_repeated_pairs(left, right):
+    repeated_left = pd.concat([left] * 3, ignore_index=True)
+    repeated_right = pd.concat([right] * 3, ignore_index=True)
+    repeated_left.index = repeated_left.index + 100
+    repeated_right.index = repeated_right.index + 100
+    result = match(repeated_left, repeated_right, preprocess=True, fuzzy=True)
+    expected = match(left, right, preprocess=True, fuzzy=True)
+    expected = pd.concat([expected] * 3, ignore_index=True)
+    expected.index = expected.index + 100
+    pd.testing.assert_series_equal(result, expected)
@@ -48,3 +48,19 @@ def test_drop(df, countries):
     df = verify(df, "admin0", countries, "correct_country", drop=True)
     expected = pd.Series(["Tremarctos ornatus", "Panthera onca"])
     pd.testing.assert_series_equal(df["species"], expected, check_names=False)
+
+
+def test_vocabulary_suggestions(df, countries):
+    df["admin0"] = ["Colombia", "Mexico", "Venezuala"]
+    df = verify(
+        df,
+        "admin0",
+        countries,
+        "correct_country",
+        add_suggested=True,
+        suggested_name="suggested_country",
+        vocabulary=["Canada", "Colombia", "Mexico", "Venezuela"],
+        drop=False,
+    )
+    expected = pd.Series([pd.NA, pd.NA, "Venezuela"])
+    pd.testing.assert_series_equal(df["suggested_country"], expected, check_names=False)